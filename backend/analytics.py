@@ -0,0 +1,77 @@
+"""
+Phase 25: Analytics read replica
+Dashboard aggregations (stats, word accuracy, trend) can run against a
+read-only snapshot of spelling.db instead of the live file, so heavy
+reporting never competes with practice writes.
+
+The snapshot is copied with SQLite's online backup API a few pages at a
+time (writers only wait for one small step, not the whole copy) into a
+temp file that atomically replaces the previous snapshot.
+
+Configuration (environment):
+    ANALYTICS_MODE=1                      enable snapshot reads
+    ANALYTICS_REFRESH_MINUTES=10          how often the app refreshes it
+    ANALYTICS_MAX_STALENESS_MINUTES=30    older snapshots are ignored
+    ANALYTICS_SNAPSHOT_PATH=...           default: data/spelling.analytics.db
+
+Usage:
+    python analytics.py refresh
+"""
+
+import os
+import sqlite3
+import time
+
+import database
+
+ANALYTICS_REFRESH_MINUTES = float(os.getenv('ANALYTICS_REFRESH_MINUTES', '10'))
+
+# Pages copied per backup step; the source is only locked during a step
+BACKUP_PAGES_PER_STEP = 256
+
+
+def refresh_snapshot(pages_per_step: int = BACKUP_PAGES_PER_STEP) -> str:
+    """
+    Copy the primary database into the analytics snapshot
+
+    Returns: snapshot path
+    """
+    snapshot_path = database.analytics_snapshot_path()
+    tmp_path = f"{snapshot_path}.{os.getpid()}.tmp"
+    started = time.time()
+
+    source = sqlite3.connect(database.DB_PATH)
+    target = sqlite3.connect(tmp_path)
+    try:
+        source.backup(target, pages=pages_per_step)
+    finally:
+        target.close()
+        source.close()
+
+    # The snapshot's mtime is when its copy started (used for staleness)
+    os.utime(tmp_path, (started, started))
+    os.replace(tmp_path, snapshot_path)
+    return snapshot_path
+
+
+def refresh_if_due(max_age_minutes: float = ANALYTICS_REFRESH_MINUTES) -> bool:
+    """Refresh the snapshot if it is missing or older than max_age_minutes"""
+    age = database.analytics_snapshot_age()
+    if age is not None and age < max_age_minutes * 60:
+        return False
+    refresh_snapshot()
+    return True
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Analytics snapshot tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("refresh", help="Copy spelling.db into the analytics snapshot now")
+    args = parser.parse_args()
+
+    if args.command == "refresh":
+        begun = time.perf_counter()
+        path = refresh_snapshot()
+        print(f"✓ Snapshot written to {path} in {time.perf_counter() - begun:.2f}s")
@@ -0,0 +1,208 @@
+"""
+Phase 20: Precompressed, fingerprinted static assets
+Build-free asset pipeline: at startup every file in frontend/ is read once,
+content-hashed and compressed (gzip, plus brotli when installed). HTML pages
+are rewritten to reference fingerprinted URLs such as /static/app.3f2a1b9c0d12.js,
+which are served with immutable cache headers; HTML itself is revalidated
+via ETag so a deploy is picked up on the next page load.
+
+Phase 28: Compressed bodies are also written to a cache directory keyed by
+content hash, so a restart reuses them instead of re-running brotli at
+quality 11 (most of the app's startup time) on every cold start.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+
+from fastapi import Request
+from fastapi.responses import Response
+
+try:
+    import brotli
+except ImportError:  # brotli is optional - gzip is always available
+    brotli = None
+
+STATIC_PREFIX = '/static/'
+
+# Fingerprinted URLs never change content, so caches may keep them for a year
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+
+# Compressing tiny files costs more in headers than it saves
+MIN_COMPRESS_BYTES = 512
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+
+STATIC_REF_PATTERN = re.compile(r'((?:src|href)=["\'])/static/([^"\'?#]+)(["\'])')
+
+
+def _compress(content: bytes, coding: str, digest: str, cache_dir: str = None) -> bytes:
+    """Compress content, reusing a copy cached under its content hash if there is one"""
+    cache_path = os.path.join(cache_dir, f"{digest}.{coding}") if cache_dir else None
+    if cache_path:
+        try:
+            with open(cache_path, 'rb') as f:
+                return f.read()
+        except OSError:
+            pass
+
+    if coding == 'br':
+        body = brotli.compress(content, quality=11)
+    else:
+        body = gzip.compress(content, compresslevel=9, mtime=0)
+
+    if cache_path:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass  # a read-only cache dir just means compressing again next time
+    return body
+
+
+class Asset:
+    """One static file with its precomputed encodings"""
+
+    def __init__(self, name: str, content: bytes, media_type: str, cache_dir: str = None):
+        self.name = name
+        self.media_type = media_type
+        digest = hashlib.sha256(content).hexdigest()
+        self.fingerprint = digest[:12]
+        self.etag = f'W/"{self.fingerprint}"'
+        base, ext = os.path.splitext(name)
+        self.fingerprinted_name = f"{base}.{self.fingerprint}{ext}"
+        self.encodings = {'identity': content}
+
+        if len(content) >= MIN_COMPRESS_BYTES and media_type.startswith(COMPRESSIBLE_TYPES):
+            codings = ('gzip', 'br') if brotli is not None else ('gzip',)
+            for coding in codings:
+                body = _compress(content, coding, digest, cache_dir)
+                if len(body) < len(content):
+                    self.encodings[coding] = body
+
+
+def _accepted_encodings(accept_encoding: str):
+    """Parse Accept-Encoding into the set of codings with q > 0"""
+    accepted = set()
+    for part in (accept_encoding or '').split(','):
+        if not part.strip():
+            continue
+        coding, _, params = part.strip().partition(';')
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if q > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class AssetRegistry:
+    """All frontend assets, loaded once and served from memory"""
+
+    def __init__(self, directory: str, cache_dir: str = None):
+        self.directory = directory
+        self.cache_dir = cache_dir
+        self._assets = {}        # name -> Asset
+        self._fingerprinted = {}  # fingerprinted name -> Asset
+        self._lock = threading.Lock()
+        self.loaded = False
+
+    def load(self):
+        """Read, fingerprint and compress every file (HTML last, so refs can be rewritten)"""
+        with self._lock:
+            if self.loaded:
+                return
+            names = []
+            for root, _, files in os.walk(self.directory):
+                for filename in files:
+                    names.append(os.path.relpath(os.path.join(root, filename), self.directory).replace(os.sep, '/'))
+
+            # Non-HTML first: HTML rewriting needs their fingerprints
+            for name in sorted(names, key=lambda n: n.endswith('.html')):
+                with open(os.path.join(self.directory, name), 'rb') as f:
+                    content = f.read()
+                media_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+                if name.endswith('.html'):
+                    content = self._rewrite_html(content.decode('utf-8')).encode('utf-8')
+                    media_type = 'text/html; charset=utf-8'
+                elif media_type.startswith('text/') or media_type == 'application/javascript':
+                    media_type = f"{media_type}; charset=utf-8"
+
+                asset = Asset(name, content, media_type, self.cache_dir)
+                self._assets[name] = asset
+                self._fingerprinted[asset.fingerprinted_name] = asset
+
+            self.loaded = True
+
+    def _rewrite_html(self, html: str) -> str:
+        def replace(match):
+            asset = self._assets.get(match.group(2))
+            if not asset:
+                return match.group(0)
+            return f"{match.group(1)}{STATIC_PREFIX}{asset.fingerprinted_name}{match.group(3)}"
+        return STATIC_REF_PATTERN.sub(replace, html)
+
+    def url_for(self, name: str) -> str:
+        """Fingerprinted /static/ URL for an asset name"""
+        self.load()
+        asset = self._assets.get(name)
+        return f"{STATIC_PREFIX}{asset.fingerprinted_name if asset else name}"
+
+    def lookup(self, path: str):
+        """
+        Find an asset by plain or fingerprinted name
+        Returns (asset, immutable) or (None, False)
+        """
+        self.load()
+        if path in self._fingerprinted:
+            return self._fingerprinted[path], True
+        return self._assets.get(path), False
+
+    def response(self, request: Request, path: str) -> Response:
+        """Serve an asset with the best encoding the client accepts"""
+        asset, immutable = self.lookup(path)
+        if asset is None:
+            return Response(status_code=404)
+
+        headers = {
+            'ETag': asset.etag,
+            'Cache-Control': IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL,
+            'Vary': 'Accept-Encoding',
+        }
+
+        if_none_match = request.headers.get('if-none-match', '')
+        if asset.etag in [t.strip() for t in if_none_match.split(',')]:
+            return Response(status_code=304, headers=headers)
+
+        accepted = _accepted_encodings(request.headers.get('accept-encoding'))
+        for coding in ('br', 'gzip'):
+            if coding in asset.encodings and coding in accepted:
+                headers['Content-Encoding'] = coding
+                body = asset.encodings[coding]
+                break
+        else:
+            body = asset.encodings['identity']
+
+        if request.method == 'HEAD':
+            headers['Content-Length'] = str(len(body))
+            return Response(status_code=200, headers=headers, media_type=asset.media_type)
+        return Response(content=body, headers=headers, media_type=asset.media_type)
+
+    def stats(self):
+        """Total bytes per encoding, for checking the pipeline"""
+        self.load()
+        totals = {}
+        for asset in self._assets.values():
+            for coding, body in asset.encodings.items():
+                totals[coding] = totals.get(coding, 0) + len(body)
+        return {'assets': len(self._assets), 'bytes': totals}
@@ -1,12 +1,14 @@
 """
 Authentication utilities for Phase 12
 JWT token generation and verification
+
+Phase 28: jose (and the cryptography backend it loads) is imported on
+first use instead of at startup - it is a large share of the import time
 """
 
 from datetime import datetime, timedelta
 from typing import Optional
 import os
-from jose import JWTError, jwt
 
 # Get JWT secret from environment or use default for development
 SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'dev-secret-key-change-in-production')
@@ -32,6 +34,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.utcnow() + timedelta(hours=ACCESS_TOKEN_EXPIRE_HOURS)
     
     to_encode.update({"exp": expire})
+    from jose import jwt
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -45,6 +48,8 @@ def verify_token(token: str) -> Optional[dict]:
     Returns:
         Decoded token payload if valid, None if invalid
     """
+    from jose import JWTError, jwt
+    
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         return payload
@@ -0,0 +1,267 @@
+"""
+Phase 35: Hot path microbenchmarks with stored baselines
+Times the functions every practice request goes through, on seeded
+throwaway databases of several sizes, and compares the numbers with a
+saved baseline so a performance change can be shown (or a regression
+caught) one function at a time.
+
+Each benchmark is calibrated to run in loops of at least MIN_SAMPLE_SECONDS,
+sampled several times, and reported as the median (plus min and stdev)
+microseconds per call. Baselines are JSON files in benchmarks/; they
+are only comparable on the same machine, so save one before a change
+and compare after it.
+
+Usage:
+    python benchmark_hotpaths.py --save before
+    (make the change)
+    python benchmark_hotpaths.py --compare before
+    python benchmark_hotpaths.py --sizes small --only words_for_child --compare before --fail-on-regression
+"""
+
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+import database
+from benchmark_json import seed
+from session import WordSession
+
+# name -> (words, practices)
+SIZES = {
+    'small': (200, 5_000),
+    'medium': (2_000, 50_000),
+    'large': (10_000, 250_000),
+}
+DEFAULT_SIZES = ('small', 'medium')
+
+MIN_SAMPLE_SECONDS = 0.05
+SAMPLES = 5
+# A median this much slower (or faster) than the baseline is reported as a change
+DEFAULT_THRESHOLD = 0.10
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks')
+
+
+def _word_cycle(ctx):
+    """Next seeded word id on every call"""
+    ids = ctx['word_ids']
+    state = {'i': 0}
+
+    def next_id():
+        state['i'] += 1
+        return ids[state['i'] % len(ids)]
+    return next_id
+
+
+def _session_next_word(ctx):
+    session = WordSession.from_state({
+        'num_words': None, 'child_id': ctx['child_id'], 'available_words': list(ctx['word_ids']),
+        'last_word_id': None, 'mastered_words': [], 'initial_word_count': len(ctx['word_ids']),
+    })
+    return session.get_next_word_id
+
+
+def _update_on_success(ctx):
+    next_id = _word_cycle(ctx)
+    return lambda: database.update_word_on_success_for_child(next_id(), ctx['child_id'])
+
+
+def _save_practice(ctx):
+    next_id = _word_cycle(ctx)
+    return lambda: database.save_practice(next_id(), ctx['child_id'], 'guess', True, None)
+
+
+# (name, setup(ctx) -> zero-argument callable); reads first, writes last so
+# the writes don't change what the reads see
+DATABASE_BENCHMARKS = [
+    ('get_words_for_child', lambda ctx: lambda: database.get_words_for_child(ctx['child_id'])),
+    ('get_practice_stats', lambda ctx: database.get_practice_stats),
+    ('get_word_accuracy', lambda ctx: database.get_word_accuracy),
+    ('WordSession.get_next_word_id', _session_next_word),
+    ('update_word_on_success_for_child', _update_on_success),
+    ('save_practice', _save_practice),
+]
+
+# Don't depend on the dataset - run once
+STANDALONE_BENCHMARKS = [
+    ('hash_password', lambda: lambda: database.hash_password('correct horse')),
+    ('verify_password', lambda: lambda hashed=database.hash_password('correct horse'):
+        database.verify_password('correct horse', hashed)),
+]
+
+
+def measure(fn, samples: int = SAMPLES, min_time: float = MIN_SAMPLE_SECONDS):
+    """
+    Median/min/stdev microseconds per call of fn
+
+    The loop count is doubled until one sample takes min_time, then
+    samples samples of that many calls are timed.
+    """
+    fn()  # warm caches and pooled connections
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or loops >= 1 << 20:
+            break
+        loops *= 2
+
+    per_call = [elapsed / loops]
+    for _ in range(samples - 1):
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        per_call.append((time.perf_counter() - started) / loops)
+    return {
+        'median_us': round(statistics.median(per_call) * 1e6, 2),
+        'min_us': round(min(per_call) * 1e6, 2),
+        'stdev_us': round(statistics.stdev(per_call) * 1e6, 2) if len(per_call) > 1 else 0.0,
+        'loops': loops,
+        'samples': len(per_call),
+    }
+
+
+def _selected(name: str, only) -> bool:
+    return not only or any(pattern in name for pattern in only)
+
+
+def run_suite(sizes=DEFAULT_SIZES, only=None, samples: int = SAMPLES, min_time: float = MIN_SAMPLE_SECONDS,
+              size_table=None):
+    """
+    Run the benchmarks on a fresh seeded database per size
+
+    sizes: names from size_table (default SIZES); only: substrings of benchmark names to run
+    Returns: {'meta': {...}, 'results': {'name[size]': measure() output}}
+    """
+    size_table = size_table or SIZES
+    results = {}
+    original_path = database.DB_PATH
+    workdir = tempfile.mkdtemp(prefix='bench_hotpaths_')
+    try:
+        for size in sizes:
+            if not any(_selected(name, only) for name, _ in DATABASE_BENCHMARKS):
+                break
+            num_words, num_practices = size_table[size]
+            database.DB_PATH = os.path.join(workdir, f'{size}.db')
+            database.init_db()
+            seed(num_words, num_practices)
+            child_id = database.get_user_children(database.get_user_by_email('bench0@example.com')['id'])[0]['id']
+            word_ids = [w['id'] for w in database.get_all_words()]
+            random.Random(0).shuffle(word_ids)
+            ctx = {'child_id': child_id, 'word_ids': word_ids}
+
+            for name, setup in DATABASE_BENCHMARKS:
+                if _selected(name, only):
+                    random.seed(0)
+                    results[f'{name}[{size}]'] = measure(setup(ctx), samples, min_time)
+            database.close_pool()
+
+        for name, setup in STANDALONE_BENCHMARKS:
+            if _selected(name, only):
+                results[name] = measure(setup(), samples, min_time)
+    finally:
+        database.close_pool()
+        database.DB_PATH = original_path
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'machine': f"{platform.machine()} {platform.system()}, {os.cpu_count()} cores",
+            'sizes': {size: size_table[size] for size in sizes},
+        },
+        'results': results,
+    }
+
+
+def _baseline_path(name: str) -> str:
+    return name if name.endswith('.json') else os.path.join(BASELINE_DIR, f'{name}.json')
+
+
+def save_baseline(report, name: str) -> str:
+    path = _baseline_path(name)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+    return path
+
+
+def load_baseline(name: str):
+    with open(_baseline_path(name)) as f:
+        return json.load(f)
+
+
+def compare(baseline, current, threshold: float = DEFAULT_THRESHOLD):
+    """
+    Benchmark-by-benchmark comparison of the current run's medians with a baseline
+
+    Returns: list of {'benchmark', 'baseline_us', 'current_us', 'ratio', 'status'}
+    where status is 'faster', 'slower', 'same' or 'new' (not in the baseline)
+    """
+    rows = []
+    for key, result in current['results'].items():
+        base = baseline['results'].get(key, {}).get('median_us')
+        now = result['median_us']
+        if base is None:
+            rows.append({'benchmark': key, 'baseline_us': None, 'current_us': now, 'ratio': None, 'status': 'new'})
+            continue
+        ratio = now / base if base else float('inf')
+        status = 'slower' if ratio > 1 + threshold else 'faster' if ratio < 1 - threshold else 'same'
+        rows.append({'benchmark': key, 'baseline_us': base, 'current_us': now,
+                     'ratio': round(ratio, 3), 'status': status})
+    return rows
+
+
+def print_results(report):
+    print(f"{'benchmark':<46}{'median µs':>12}{'min µs':>12}{'stdev µs':>11}{'loops':>9}")
+    for key, r in report['results'].items():
+        print(f"{key:<46}{r['median_us']:>12}{r['min_us']:>12}{r['stdev_us']:>11}{r['loops']:>9}")
+
+
+def print_comparison(rows, baseline_meta):
+    print(f"Compared with baseline from {baseline_meta['created']} ({baseline_meta['machine']})")
+    print(f"{'benchmark':<46}{'before µs':>12}{'after µs':>12}{'change':>9}  status")
+    for row in rows:
+        change = f"{(row['ratio'] - 1) * 100:+.1f}%" if row['ratio'] is not None else '-'
+        print(f"{row['benchmark']:<46}{row['baseline_us'] or '-':>12}{row['current_us']:>12}"
+              f"{change:>9}  {row['status']}")
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Microbenchmark the practice hot paths")
+    parser.add_argument("--sizes", nargs='+', choices=list(SIZES), default=list(DEFAULT_SIZES))
+    parser.add_argument("--only", nargs='+', help="run benchmarks whose name contains one of these")
+    parser.add_argument("--samples", type=int, default=SAMPLES)
+    parser.add_argument("--min-time", type=float, default=MIN_SAMPLE_SECONDS, help="seconds per sample")
+    parser.add_argument("--save", metavar="NAME", help="save the results as benchmarks/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="compare with benchmarks/NAME.json (or a path)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative change reported as slower/faster (default 0.10)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit 1 if anything got slower")
+    args = parser.parse_args()
+
+    report = run_suite(args.sizes, args.only, args.samples, args.min_time)
+    print_results(report)
+    if args.save:
+        print(f"Saved baseline to {save_baseline(report, args.save)}")
+    if args.compare:
+        baseline = load_baseline(args.compare)
+        rows = compare(baseline, report, args.threshold)
+        print()
+        print_comparison(rows, baseline['meta'])
+        if args.fail_on_regression and any(row['status'] == 'slower' for row in rows):
+            sys.exit(1)
@@ -0,0 +1,187 @@
+"""
+Phase 21: JSON serialization benchmark
+Seeds a throwaway database and compares, for each list / dashboard endpoint,
+the original response path (sqlite3.Row -> dict(row) -> jsonable_encoder ->
+json.dumps) against the fast path (fetch_dicts -> render_json).
+
+Usage:
+    python benchmark_json.py
+    python benchmark_json.py --words 5000 --practices 100000 --repeat 50
+"""
+
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+
+import database
+from fast_json import render_json, orjson
+
+
+def seed(num_words: int, num_practices: int, seed_value: int = 0):
+    """Fill the current database with synthetic words and practices"""
+    rng = random.Random(seed_value)
+    user_id = database.create_user(f"bench{seed_value}@example.com", "password")
+    child_ids = [database.create_child(user_id, name) for name in ("Ada", "Ben")]
+    conn = database.get_db()
+    cursor = conn.cursor()
+    today = date.today()
+
+    cursor.executemany(
+        "INSERT OR IGNORE INTO words (word, category, successful_days, next_review) VALUES (?, ?, ?, ?)",
+        [(f"word{i}", f"category{i % 12}", rng.randint(0, 5), today.isoformat()) for i in range(num_words)]
+    )
+    cursor.execute("SELECT id FROM words")
+    word_ids = [r[0] for r in cursor.fetchall()]
+
+    now = datetime.now()
+    cursor.executemany(
+        "INSERT INTO practices (word_id, child_id, spelled_word, is_correct, drawing_filename, practiced_date) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        [(rng.choice(word_ids), rng.choice(child_ids), "guess", rng.random() < 0.6,
+          f"{i}.png" if i % 3 == 0 else None,
+          (now - timedelta(minutes=rng.randint(0, 60 * 24 * 14))).isoformat(sep=' '))
+         for i in range(num_practices)]
+    )
+    conn.commit()
+    conn.close()
+
+
+def _legacy_fetch(query: str, params=()):
+    """Original fetch: sqlite3.Row objects copied with dict(row)"""
+    conn = database.get_db()
+    cursor = conn.cursor()
+    cursor.execute(query, params)
+    rows = [dict(r) for r in cursor.fetchall()]
+    conn.close()
+    return rows
+
+
+def _legacy_page(query: str, sort_column: str, descending: bool, limit: int = database.DEFAULT_PAGE_SIZE):
+    """First keyset page (Phase 22) fetched the original way, with the same next_cursor"""
+    direction = 'DESC' if descending else 'ASC'
+    rows = _legacy_fetch(f"{query} ORDER BY {sort_column} {direction}, id {direction} LIMIT ?", (limit + 1,))
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = database.encode_page_cursor(rows[-1][sort_column], rows[-1]['id'])
+    return rows, next_cursor
+
+
+def _words_response(page):
+    """Body of a paged word list endpoint from (words, next_cursor)"""
+    words, next_cursor = page
+    return {"words": words, "next_cursor": next_cursor}
+
+
+def _legacy_render(data) -> bytes:
+    """Original rendering: jsonable_encoder + json.dumps (FastAPI's JSONResponse)"""
+    return json.dumps(jsonable_encoder(data), ensure_ascii=False, allow_nan=False,
+                      indent=None, separators=(',', ':')).encode('utf-8')
+
+
+ENDPOINTS = [
+    # (name, legacy builder or None if the query path is unchanged, fast builder)
+    ('/api/words',
+     lambda: {"words": _legacy_fetch("SELECT id, word, category FROM words")},
+     lambda: {"words": database.get_all_words()}),
+    # Phase 22: first page with ?limit=
+    ('/api/words?limit=100',
+     lambda: _words_response(_legacy_page(
+        "SELECT id, word, category, created_date FROM words", 'created_date', False)),
+     lambda: _words_response(database.get_words_page())),
+    ('/api/admin/words',
+     lambda: {"words": _legacy_fetch("""
+        SELECT id, word, category, successful_days, last_practiced, next_review, created_date
+        FROM words ORDER BY created_date DESC""")},
+     lambda: {"words": database.get_all_words_admin()}),
+    ('/api/admin/words?limit=100',
+     lambda: _words_response(_legacy_page("""
+        SELECT id, word, category, successful_days, last_practiced, next_review, created_date
+        FROM words""", 'created_date', True)),
+     lambda: _words_response(database.get_admin_words_page())),
+    ('/api/dashboard/stats', None, database.get_practice_stats),
+    ('/api/dashboard/word-accuracy', None, lambda: {"words": database.get_word_accuracy()}),
+    ('/api/dashboard/trend', None, lambda: {"trend": database.get_practice_trend(14)}),
+    ('/api/dashboard/drawings', None, lambda: {"drawings": database.get_recent_drawings(200)}),
+]
+
+
+def _time_per_call(fn, repeat: int) -> float:
+    """Best-of-3 mean seconds per call"""
+    best = float('inf')
+    for _ in range(3):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        best = min(best, (time.perf_counter() - started) / repeat)
+    return best
+
+
+def run_benchmark(num_words: int = 2000, num_practices: int = 50000, repeat: int = 20):
+    """
+    Benchmark every endpoint in ENDPOINTS against a fresh seeded database
+
+    Returns:
+        list of {'endpoint', 'bytes', 'legacy_fetch_us', 'fast_fetch_us',
+                 'legacy_render_us', 'fast_render_us', 'saved_us'}
+    """
+    original_path = database.DB_PATH
+    workdir = tempfile.mkdtemp(prefix='bench_json_')
+    database.DB_PATH = os.path.join(workdir, 'bench.db')
+    try:
+        database.init_db()
+        seed(num_words, num_practices)
+
+        results = []
+        for name, legacy_build, fast_build in ENDPOINTS:
+            fast_data = fast_build()
+            fast_fetch = _time_per_call(fast_build, repeat)
+            if legacy_build is None:
+                legacy_data, legacy_fetch = fast_data, fast_fetch
+            else:
+                legacy_data = legacy_build()
+                legacy_fetch = _time_per_call(legacy_build, repeat)
+            assert json.loads(_legacy_render(legacy_data)) == json.loads(render_json(fast_data)), name
+
+            legacy_render = _time_per_call(lambda: _legacy_render(legacy_data), repeat)
+            fast_render = _time_per_call(lambda: render_json(fast_data), repeat)
+
+            results.append({
+                'endpoint': name,
+                'bytes': len(render_json(fast_data)),
+                'legacy_fetch_us': round(legacy_fetch * 1e6, 1),
+                'fast_fetch_us': round(fast_fetch * 1e6, 1),
+                'legacy_render_us': round(legacy_render * 1e6, 1),
+                'fast_render_us': round(fast_render * 1e6, 1),
+                'saved_us': round((legacy_fetch + legacy_render - fast_fetch - fast_render) * 1e6, 1),
+            })
+        return results
+    finally:
+        database.DB_PATH = original_path
+        for filename in os.listdir(workdir):
+            os.remove(os.path.join(workdir, filename))
+        os.rmdir(workdir)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark JSON response paths")
+    parser.add_argument("--words", type=int, default=2000)
+    parser.add_argument("--practices", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"Serializer: {'orjson ' + orjson.__version__ if orjson else 'json (orjson not installed)'}, "
+          f"sqlite {sqlite3.sqlite_version}")
+    print(f"{'endpoint':<30}{'bytes':>9}{'fetch old':>11}{'fetch new':>11}"
+          f"{'render old':>12}{'render new':>12}{'saved/req':>11}  (µs)")
+    for r in run_benchmark(args.words, args.practices, args.repeat):
+        print(f"{r['endpoint']:<30}{r['bytes']:>9}{r['legacy_fetch_us']:>11}{r['fast_fetch_us']:>11}"
+              f"{r['legacy_render_us']:>12}{r['fast_render_us']:>12}{r['saved_us']:>11}")
@@ -0,0 +1,108 @@
+"""
+Phase 28: Startup time benchmark
+Measures a cold start the way Fly's auto-start sees it: a fresh Python
+process imports main, runs the app lifespan (schema check, asset loading)
+and answers its first request.
+
+Each run is a new interpreter against the same throwaway database, so the
+first run includes creating it and later runs show a normal restart.
+test_startup.py enforces the budgets below.
+
+Usage:
+    python benchmark_startup.py
+    python benchmark_startup.py --runs 10
+"""
+
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# Budgets (seconds) for a restart against an existing database
+IMPORT_BUDGET_SECONDS = 1.5
+LIFESPAN_BUDGET_SECONDS = 0.5
+FIRST_REQUEST_BUDGET_SECONDS = 0.5
+
+# Modules that must not be imported until a request needs them
+DEFERRED_MODULES = ('PIL', 'jose', 'numpy', 'pyarrow')
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+loaded_early = [m for m in {deferred!r} if m in sys.modules]
+
+from fastapi.testclient import TestClient
+client = TestClient(main.app)
+lifespan_started = time.perf_counter()
+client.__enter__()
+lifespan_done = time.perf_counter()
+status = client.get('/api/health').status_code
+first_request_done = time.perf_counter()
+client.__exit__(None, None, None)
+
+print(json.dumps({{
+    'import_seconds': imported - started,
+    'lifespan_seconds': lifespan_done - lifespan_started,
+    'first_request_seconds': first_request_done - lifespan_done,
+    'status': status,
+    'loaded_early': loaded_early,
+}}))
+"""
+
+
+def measure_once(db_path: str) -> dict:
+    """Start the app in a fresh interpreter and return its timings"""
+    result = subprocess.run(
+        [sys.executable, '-c', _PROBE.format(deferred=DEFERRED_MODULES)],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=dict(os.environ, DATABASE_PATH=db_path),
+        capture_output=True, text=True, timeout=120,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Startup probe failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run_benchmark(runs: int = 5):
+    """
+    Cold-start the app runs + 1 times (the first creates the database)
+
+    Returns: {'first_boot': timings, 'restarts': [timings...], 'median': {...}}
+    """
+    workdir = tempfile.mkdtemp(prefix='bench_startup_')
+    db_path = os.path.join(workdir, 'bench.db')
+    try:
+        first_boot = measure_once(db_path)
+        restarts = [measure_once(db_path) for _ in range(runs)]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    keys = ('import_seconds', 'lifespan_seconds', 'first_request_seconds')
+    median = {k: statistics.median(r[k] for r in restarts) for k in keys}
+    return {'first_boot': first_boot, 'restarts': restarts, 'median': median}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Measure cold-start time of the app")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    report = run_benchmark(args.runs)
+    budgets = {
+        'import_seconds': IMPORT_BUDGET_SECONDS,
+        'lifespan_seconds': LIFESPAN_BUDGET_SECONDS,
+        'first_request_seconds': FIRST_REQUEST_BUDGET_SECONDS,
+    }
+    print(f"{'phase':<24}{'first boot':>12}{'restart':>12}{'budget':>10}  (ms, restart = median of {args.runs})")
+    for key, budget in budgets.items():
+        print(f"{key.replace('_seconds', ''):<24}{report['first_boot'][key] * 1000:>12.1f}"
+              f"{report['median'][key] * 1000:>12.1f}{budget * 1000:>10.0f}")
+    early = report['first_boot']['loaded_early']
+    print(f"Deferred modules loaded at import: {', '.join(early) if early else 'none'}")
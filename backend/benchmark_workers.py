@@ -0,0 +1,185 @@
+"""
+Phase 27: Worker scaling benchmark
+Starts the app on a seeded throwaway database with 1, 2, 4, ... worker
+processes and measures read throughput at each size, to show how requests
+per second scale with CPU cores.
+
+The server runs under gunicorn with uvicorn workers (as in production)
+when gunicorn is installed, otherwise under `uvicorn --workers N`. Load
+comes from separate client processes with keep-alive connections, so the
+client side isn't limited to one core either.
+
+Usage:
+    python benchmark_workers.py
+    python benchmark_workers.py --workers 1 2 4 8 --clients 32 --duration 10
+"""
+
+import http.client
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import database
+from benchmark_json import seed
+
+# Request mix each client cycles through (all read endpoints, no auth)
+BENCH_PATHS = [
+    '/api/health',
+    '/api/words?limit=100',
+    '/api/dashboard/stats',
+    '/api/dashboard/word-accuracy',
+]
+
+STARTUP_TIMEOUT_SECONDS = 30
+
+
+def _server_command(workers: int, port: int):
+    """gunicorn + uvicorn workers if available, else uvicorn's own process manager"""
+    if shutil.which('gunicorn'):
+        return ['gunicorn', '-c', 'gunicorn.conf.py', '--workers', str(workers),
+                '--bind', f'127.0.0.1:{port}', '--access-logfile', '/dev/null', 'main:app']
+    return [sys.executable, '-m', 'uvicorn', 'main:app', '--host', '127.0.0.1',
+            '--port', str(port), '--workers', str(workers), '--no-access-log']
+
+
+def _wait_until_ready(port: int, server):
+    deadline = time.monotonic() + STARTUP_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with code {server.returncode}")
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', '/api/health')
+            if conn.getresponse().status == 200:
+                conn.close()
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("Server did not start in time")
+
+
+def _client(port: int, duration: float, results):
+    """Send requests over one keep-alive connection until duration is up"""
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    latencies = []
+    errors = 0
+    deadline = time.monotonic() + duration
+    i = 0
+    while time.monotonic() < deadline:
+        path = BENCH_PATHS[i % len(BENCH_PATHS)]
+        i += 1
+        started = time.perf_counter()
+        try:
+            conn.request('GET', path)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - started)
+    conn.close()
+    results.put((latencies, errors))
+
+
+def measure(workers: int, port: int, env: dict, clients: int, duration: float):
+    """
+    Run the server with a worker count and load it from client processes
+
+    Returns: {'workers', 'requests', 'errors', 'rps', 'p50_ms', 'p99_ms'}
+    """
+    server = subprocess.Popen(
+        _server_command(workers, port), env=dict(env, WEB_CONCURRENCY=str(workers)),
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_until_ready(port, server)
+
+        # Warm every worker's caches before measuring
+        context = multiprocessing.get_context('spawn')
+        warmup = context.Queue()
+        warm = [context.Process(target=_client, args=(port, 1.0, warmup)) for _ in range(clients)]
+        for p in warm:
+            p.start()
+        for _ in warm:
+            warmup.get()
+        for p in warm:
+            p.join()
+
+        queue = context.Queue()
+        procs = [context.Process(target=_client, args=(port, duration, queue)) for _ in range(clients)]
+        for p in procs:
+            p.start()
+        latencies, errors = [], 0
+        for _ in procs:
+            client_latencies, client_errors = queue.get()
+            latencies.extend(client_latencies)
+            errors += client_errors
+        for p in procs:
+            p.join()
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    latencies.sort()
+
+    def percentile(q):
+        return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 2) if latencies else None
+
+    return {
+        'workers': workers,
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': round(len(latencies) / duration, 1),
+        'p50_ms': percentile(0.50),
+        'p99_ms': percentile(0.99),
+    }
+
+
+def run_benchmark(worker_counts=(1, 2, 4), clients: int = 16, duration: float = 5.0,
+                  port: int = 8765, num_words: int = 500, num_practices: int = 20000):
+    """Seed a throwaway database and measure throughput for each worker count"""
+    workdir = tempfile.mkdtemp(prefix='bench_workers_')
+    db_path = os.path.join(workdir, 'bench.db')
+    original_path = database.DB_PATH
+    database.DB_PATH = db_path
+    try:
+        database.init_db()
+        seed(num_words, num_practices)
+    finally:
+        database.DB_PATH = original_path
+
+    env = dict(os.environ, DATABASE_PATH=db_path, PORT=str(port))
+    try:
+        return [measure(workers, port, env, clients, duration) for workers in worker_counts]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Measure throughput vs. worker processes")
+    parser.add_argument("--workers", type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    print(f"CPU cores: {os.cpu_count()}, server: {'gunicorn' if shutil.which('gunicorn') else 'uvicorn'}, "
+          f"{args.clients} clients, {args.duration:.0f}s per run")
+    print(f"{'workers':>8}{'req/s':>10}{'speedup':>9}{'p50 ms':>9}{'p99 ms':>9}{'errors':>8}")
+    baseline = None
+    for r in run_benchmark(args.workers, args.clients, args.duration, args.port):
+        baseline = baseline or r['rps']
+        print(f"{r['workers']:>8}{r['rps']:>10}{r['rps'] / baseline:>8.2f}x"
+              f"{r['p50_ms']:>9}{r['p99_ms']:>9}{r['errors']:>8}")
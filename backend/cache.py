@@ -0,0 +1,118 @@
+"""
+Phase 19: HTTP response caching with ETags
+ETags are derived from the per-table change counters in database.py, so a
+client polling an unchanged endpoint gets a 304 after one small query,
+and rendered JSON bodies are kept in a bounded in-memory LRU cache.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from database import get_table_versions
+from fast_json import render_json
+
+# Max rendered responses kept in memory
+RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', '256'))
+
+
+class ResponseCache:
+    """Bounded LRU map of ETag -> rendered response body"""
+
+    def __init__(self, maxsize: int = RESPONSE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, etag: str):
+        with self._lock:
+            body = self._entries.get(etag)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(etag)
+            self.hits += 1
+            return body
+
+    def set(self, etag: str, body: bytes):
+        with self._lock:
+            self._entries[etag] = body
+            self._entries.move_to_end(etag)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+response_cache = ResponseCache()
+
+
+def make_etag(request: Request, versions: dict, scope: str = '') -> str:
+    """
+    Build an ETag for a request from the table versions it depends on
+    Today's date is included because several queries filter on 'today'
+    (local date for due words, UTC date for SQLite's DATE('now'))
+    """
+    key = '|'.join([
+        request.url.path,
+        request.url.query,
+        scope,
+        json.dumps(versions, sort_keys=True),
+        date.today().isoformat(),
+        datetime.utcnow().date().isoformat(),
+    ])
+    return '"' + hashlib.sha1(key.encode()).hexdigest()[:24] + '"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    candidates = [t.strip() for t in if_none_match.split(',')]
+    # Weak comparison, as required for If-None-Match
+    return etag in candidates or f"W/{etag}" in candidates
+
+
+def cached_json_response(request: Request, tables, build, scope: str = '') -> Response:
+    """
+    Serve build() as JSON with an ETag tied to the given tables
+
+    Args:
+        request: incoming request (for If-None-Match and the cache key)
+        tables: table names whose changes alter the response
+        build: zero-argument callable returning the response data
+        scope: extra cache key part for per-user responses
+
+    Returns:
+        304 if the client's copy is current, otherwise the (possibly cached) JSON body
+    """
+    etag = make_etag(request, get_table_versions(tables), scope)
+    headers = {
+        'ETag': etag,
+        # Always revalidate - the ETag makes that a cheap 304
+        'Cache-Control': 'private, no-cache' if scope else 'no-cache',
+    }
+
+    if _etag_matches(request.headers.get('if-none-match'), etag):
+        return Response(status_code=304, headers=headers)
+
+    body = response_cache.get(etag)
+    if body is None:
+        body = render_json(build())
+        response_cache.set(etag, body)
+
+    return Response(content=body, media_type='application/json', headers=headers)
@@ -0,0 +1,333 @@
+"""
+Phase 24: Columnar analytics export
+Writes practices, words and child_progress for the whole user base as
+Parquet or Arrow IPC files (when pyarrow is installed) or NumPy .npz files,
+so word-difficulty analysis doesn't have to query the live spelling.db.
+
+- Rows are read in keyset chunks over a read-only connection; each chunk
+  becomes one Parquet row group / Arrow record batch, so memory stays at
+  one chunk no matter how many practices there are.
+- word and category are dictionary-encoded: the dictionaries come from the
+  words table (loaded once), and each row stores a small integer code.
+  Nullable integer columns use -1 in .npz files and nulls in Arrow/Parquet.
+
+Loading:
+    pyarrow.parquet.read_table('practices.parquet')   # or pandas.read_parquet
+    np.load('practices.npz')  # columns + word_dictionary / category_dictionary
+
+Usage:
+    python columnar_export.py exports/
+    python columnar_export.py exports/ --format npz --datasets practices
+"""
+
+import os
+import shutil
+import tempfile
+import zipfile
+
+import numpy as np
+
+from database import get_readonly_db
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional - .npz output needs only NumPy
+    pa = None
+    pq = None
+
+# Rows per query / row group
+COLUMNAR_CHUNK_ROWS = 100000
+
+COLUMNAR_FORMATS = ('parquet', 'arrow', 'npz')
+
+# Dataset -> keyset query (takes last_id, limit) and its column types.
+# A 'word_id' column also gets dictionary-encoded 'word' and 'category' columns.
+COLUMNAR_DATASETS = {
+    'practices': {
+        'query': """
+            SELECT p.id, p.word_id, p.child_id, c.user_id, p.is_correct, p.practiced_date
+            FROM practices p
+            LEFT JOIN children c ON c.id = p.child_id
+            WHERE p.id > ?
+            ORDER BY p.id
+            LIMIT ?
+        """,
+        'columns': [
+            ('id', 'int64'), ('word_id', 'int64'), ('child_id', 'int64'),
+            ('user_id', 'nullable_int64'), ('is_correct', 'bool'),
+            ('practiced_date', 'datetime64[us]'),
+        ],
+    },
+    'child_progress': {
+        'query': """
+            SELECT id, child_id, word_id, successful_days, last_practiced, next_review
+            FROM child_progress
+            WHERE id > ?
+            ORDER BY id
+            LIMIT ?
+        """,
+        'columns': [
+            ('id', 'int64'), ('child_id', 'int64'), ('word_id', 'int64'),
+            ('successful_days', 'nullable_int64'),
+            ('last_practiced', 'datetime64[D]'), ('next_review', 'datetime64[D]'),
+        ],
+    },
+    'words': {
+        'query': """
+            SELECT id, id AS word_id, user_id, created_date
+            FROM words
+            WHERE id > ?
+            ORDER BY id
+            LIMIT ?
+        """,
+        'columns': [
+            ('id', 'int64'), ('word_id', 'int64'),
+            ('user_id', 'nullable_int64'), ('created_date', 'datetime64[us]'),
+        ],
+    },
+}
+
+
+class WordDictionary:
+    """word_id -> dictionary codes for the word and category columns"""
+
+    def __init__(self, conn):
+        rows = conn.execute("SELECT id, word, category FROM words ORDER BY id").fetchall()
+        self.words, self.categories = [], []
+        word_codes, category_codes = {}, {}
+        # Phase 26: shard word ids start at (shard + 1) << 40, so codes are looked
+        # up in the sorted ids with searchsorted rather than indexed by id
+        self.ids = np.array([row[0] for row in rows], dtype=np.int64)
+        self.word_code_by_index = np.empty(len(rows), dtype=np.int32)
+        self.category_code_by_index = np.empty(len(rows), dtype=np.int32)
+
+        for i, (_, word, category) in enumerate(rows):
+            if word not in word_codes:
+                word_codes[word] = len(self.words)
+                self.words.append(word)
+            if category not in category_codes:
+                category_codes[category] = len(self.categories)
+                self.categories.append(category)
+            self.word_code_by_index[i] = word_codes[word]
+            self.category_code_by_index[i] = category_codes[category]
+
+    def codes(self, word_ids):
+        """(word_codes, category_codes) for an array of word ids; -1 if unknown"""
+        word_ids = np.asarray(word_ids, dtype=np.int64)
+        if not len(self.ids):
+            unknown = np.full(len(word_ids), -1, dtype=np.int32)
+            return unknown, unknown.copy()
+        index = np.minimum(np.searchsorted(self.ids, word_ids), len(self.ids) - 1)
+        known = self.ids[index] == word_ids
+        word_codes = np.where(known, self.word_code_by_index[index], -1).astype(np.int32)
+        category_codes = np.where(known, self.category_code_by_index[index], -1).astype(np.int32)
+        return word_codes, category_codes
+
+
+def _to_array(values, kind: str):
+    """Convert one column of SQLite values to a NumPy array"""
+    if kind == 'nullable_int64':
+        return np.array([-1 if v is None else v for v in values], dtype=np.int64)
+    if kind == 'bool':
+        return np.array(values, dtype=np.int8).astype(bool)
+    return np.array(values, dtype=kind)
+
+
+def iter_column_chunks(dataset: str, dictionary: WordDictionary = None,
+                       chunk_rows: int = COLUMNAR_CHUNK_ROWS):
+    """
+    Yield {column: ndarray} chunks for a dataset in id order
+    Adds 'word' and 'category' code columns (int32, -1 = unknown)
+    """
+    spec = COLUMNAR_DATASETS[dataset]
+    last_id = 0
+    while True:
+        conn = get_readonly_db(all_shards=True)
+        try:
+            if dictionary is None:
+                dictionary = WordDictionary(conn)
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute(spec['query'], (last_id, chunk_rows))
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+
+        if not rows:
+            return
+
+        columns = {}
+        for (name, kind), values in zip(spec['columns'], zip(*rows)):
+            columns[name] = _to_array(values, kind)
+        columns['word'], columns['category'] = dictionary.codes(columns['word_id'])
+        yield columns
+
+        if len(rows) < chunk_rows:
+            return
+        last_id = rows[-1][0]
+
+
+def _arrow_batch(columns: dict, dictionary: WordDictionary, spec: dict):
+    """Turn one chunk into a pyarrow RecordBatch with dictionary columns"""
+    arrays, names = [], []
+    for name, kind in spec['columns']:
+        values = columns[name]
+        if kind == 'nullable_int64':
+            arrays.append(pa.array(values, mask=values < 0))
+        elif kind.startswith('datetime64'):
+            arrays.append(pa.array(values, mask=np.isnat(values)))
+        else:
+            arrays.append(pa.array(values))
+        names.append(name)
+
+    for name, values in (('word', dictionary.words), ('category', dictionary.categories)):
+        codes = columns[name]
+        indices = pa.array(codes, mask=codes < 0, type=pa.int32())
+        arrays.append(pa.DictionaryArray.from_arrays(indices, pa.array(values, type=pa.string())))
+        names.append(name)
+
+    return pa.RecordBatch.from_arrays(arrays, names=names)
+
+
+def _write_arrow(path: str, fmt: str, dataset: str, dictionary: WordDictionary, chunk_rows: int) -> int:
+    """Write a dataset as Parquet (one row group per chunk) or Arrow IPC"""
+    spec = COLUMNAR_DATASETS[dataset]
+    writer = None
+    rows = 0
+    try:
+        for columns in iter_column_chunks(dataset, dictionary, chunk_rows):
+            batch = _arrow_batch(columns, dictionary, spec)
+            if writer is None:
+                if fmt == 'parquet':
+                    writer = pq.ParquetWriter(path, batch.schema, compression='zstd', use_dictionary=True)
+                else:
+                    writer = pa.ipc.new_file(path, batch.schema)
+            if fmt == 'parquet':
+                writer.write_table(pa.Table.from_batches([batch]))
+            else:
+                writer.write_batch(batch)
+            rows += batch.num_rows
+
+        if writer is None:
+            # No rows: still write a file with the right schema
+            empty = {name: _to_array([], kind) for name, kind in spec['columns']}
+            empty['word'] = empty['category'] = np.array([], dtype=np.int32)
+            batch = _arrow_batch(empty, dictionary, spec)
+            if fmt == 'parquet':
+                pq.write_table(pa.Table.from_batches([batch]), path)
+            else:
+                with pa.ipc.new_file(path, batch.schema) as empty_writer:
+                    empty_writer.write_batch(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def _write_npz(path: str, dataset: str, dictionary: WordDictionary, chunk_rows: int) -> int:
+    """
+    Write a dataset as an uncompressed .npz without holding it in memory
+    Each column is appended to a temp file chunk by chunk, then copied into
+    the archive behind a .npy header once the final row count is known.
+    """
+    spec = COLUMNAR_DATASETS[dataset]
+    dtypes = {name: _to_array([], kind).dtype for name, kind in spec['columns']}
+    dtypes['word'] = dtypes['category'] = np.dtype(np.int32)
+
+    workdir = tempfile.mkdtemp(prefix='columnar_', dir=os.path.dirname(os.path.abspath(path)))
+    rows = 0
+    try:
+        parts = {name: open(os.path.join(workdir, name), 'wb') for name in dtypes}
+        try:
+            for columns in iter_column_chunks(dataset, dictionary, chunk_rows):
+                for name, values in columns.items():
+                    parts[name].write(np.ascontiguousarray(values, dtype=dtypes[name]).tobytes())
+                rows += len(columns['id'])
+        finally:
+            for part in parts.values():
+                part.close()
+
+        with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+            for name, dtype in dtypes.items():
+                with archive.open(f"{name}.npy", 'w', force_zip64=True) as member:
+                    np.lib.format.write_array_header_2_0(
+                        member, {'descr': np.lib.format.dtype_to_descr(dtype),
+                                 'fortran_order': False, 'shape': (rows,)}
+                    )
+                    with open(os.path.join(workdir, name), 'rb') as part:
+                        shutil.copyfileobj(part, member, 1024 * 1024)
+            for name, values in (('word_dictionary', dictionary.words),
+                                 ('category_dictionary', dictionary.categories)):
+                with archive.open(f"{name}.npy", 'w', force_zip64=True) as member:
+                    np.lib.format.write_array(member, np.array(values, dtype=str))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return rows
+
+
+def default_format() -> str:
+    """Parquet when pyarrow is installed, otherwise .npz"""
+    return 'parquet' if pa is not None else 'npz'
+
+
+def export_columnar(output_dir: str, datasets=None, fmt: str = None,
+                    chunk_rows: int = COLUMNAR_CHUNK_ROWS):
+    """
+    Export datasets to columnar files in output_dir
+
+    Args:
+        output_dir: directory for <dataset>.parquet / .arrow / .npz files
+        datasets: names from COLUMNAR_DATASETS (default: all)
+        fmt: 'parquet', 'arrow' or 'npz' (default: parquet if pyarrow is installed)
+        chunk_rows: rows per query / row group
+
+    Returns:
+        dict: {dataset: {'path': file written, 'rows': rows exported}}
+    """
+    fmt = fmt or default_format()
+    if fmt not in COLUMNAR_FORMATS:
+        raise ValueError(f"Unknown columnar format '{fmt}'. Choose from: {', '.join(COLUMNAR_FORMATS)}")
+    if fmt != 'npz' and pa is None:
+        raise ValueError(f"Format '{fmt}' needs pyarrow (pip install pyarrow); use 'npz' instead")
+
+    datasets = list(datasets or COLUMNAR_DATASETS)
+    unknown = [d for d in datasets if d not in COLUMNAR_DATASETS]
+    if unknown:
+        raise ValueError(f"Unknown dataset(s): {', '.join(unknown)}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    conn = get_readonly_db(all_shards=True)
+    try:
+        dictionary = WordDictionary(conn)
+    finally:
+        conn.close()
+
+    results = {}
+    for dataset in datasets:
+        path = os.path.join(output_dir, f"{dataset}.{fmt}")
+        if fmt == 'npz':
+            rows = _write_npz(path, dataset, dictionary, chunk_rows)
+        else:
+            rows = _write_arrow(path, fmt, dataset, dictionary, chunk_rows)
+        results[dataset] = {'path': path, 'rows': rows}
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Export practice data to columnar files")
+    parser.add_argument("output_dir")
+    parser.add_argument("--format", choices=COLUMNAR_FORMATS, default=None,
+                        help="Default: parquet if pyarrow is installed, else npz")
+    parser.add_argument("--datasets", nargs='+', choices=sorted(COLUMNAR_DATASETS), default=None)
+    parser.add_argument("--chunk-rows", type=int, default=COLUMNAR_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    exported = export_columnar(args.output_dir, args.datasets, args.format, args.chunk_rows)
+    for name, info in exported.items():
+        print(f"✓ {name}: {info['rows']} rows -> {info['path']}")
+    print(f"Done in {time.perf_counter() - started:.2f}s")
@@ -0,0 +1,25 @@
+"""
+Shared pytest fixtures
+
+Phase 31: query_counter counts the SQL statements run while a test uses it
+
+    def test_children_list_is_one_query(client, query_counter):
+        client.get('/api/children', headers=auth)
+        assert query_counter.count == 1
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import profiler
+
+
+@pytest.fixture
+def query_counter():
+    """profiler.QueryCapture of every statement executed during the test (reset() between requests)"""
+    with profiler.capture() as captured:
+        yield captured
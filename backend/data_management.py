@@ -5,13 +5,12 @@ Phase 7: Data management and performance utilities
 import os
 import sqlite3
 from datetime import datetime, timedelta
-from PIL import Image
 import io
 
 IS_DOCKER = os.path.exists('/.dockerenv') or os.getenv('FLY_APP_NAME')
 BASE_DIR = '/app' if IS_DOCKER else os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DB_PATH = os.path.join(BASE_DIR, 'data', 'spelling.db')
-DRAWINGS_DIR = os.path.join(BASE_DIR, 'data', 'drawings')
+DB_PATH = os.getenv('DATABASE_PATH') or os.path.join(BASE_DIR, 'data', 'spelling.db')
+DRAWINGS_DIR = os.getenv('DRAWINGS_DIR') or os.path.join(BASE_DIR, 'data', 'drawings')
 
 
 def compress_drawing(filename):
@@ -19,6 +18,9 @@ def compress_drawing(filename):
     Compress a drawing image from PNG to JPEG to reduce file size
     Returns new filename if successful, None otherwise
     """
+    # Pillow is only needed here; importing it lazily keeps startup fast
+    from PIL import Image
+    
     try:
         png_path = os.path.join(DRAWINGS_DIR, filename)
         
@@ -138,8 +140,14 @@ def create_backup(backup_dir="../data/backups"):
         backup_filename = f"spelling_backup_{timestamp}.db"
         backup_path = os.path.join(backup_dir, backup_filename)
         
-        import shutil
-        shutil.copy2(DB_PATH, backup_path)
+        # Online backup: in WAL mode recent commits may still be in the -wal file
+        source = sqlite3.connect(DB_PATH)
+        target = sqlite3.connect(backup_path)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
         
         return backup_filename
     except Exception as e:
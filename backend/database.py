@@ -10,126 +10,373 @@ from datetime import datetime, timedelta, date
 import os
 import hashlib
 import secrets
+import base64
+import json
+import threading
+from urllib.request import pathname2url
+from scheduler import get_scheduler
+import profiler
+from profiler import ProfiledCursor
+import queries
+import sharding
+import misspellings
 
 IS_DOCKER = os.path.exists('/.dockerenv') or os.getenv('FLY_APP_NAME')
 BASE_DIR = '/app' if IS_DOCKER else os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DB_PATH = os.path.join(BASE_DIR, 'data', 'spelling.db')
+DB_PATH = os.getenv('DATABASE_PATH') or os.path.join(BASE_DIR, 'data', 'spelling.db')
 os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
 
-def get_db():
-    """Get database connection"""
-    conn = sqlite3.connect(DB_PATH)
+# Tables whose changes invalidate cached API responses (Phase 19)
+VERSIONED_TABLES = ('words', 'practices', 'child_progress', 'children')
+
+# Analytics snapshot (Phase 25): dashboard aggregations read a periodic
+# copy of the database instead of the file practice writes go to
+ANALYTICS_MODE = os.getenv('ANALYTICS_MODE', '0') == '1'
+ANALYTICS_SNAPSHOT_PATH = os.getenv('ANALYTICS_SNAPSHOT_PATH')
+ANALYTICS_MAX_STALENESS_MINUTES = float(os.getenv('ANALYTICS_MAX_STALENESS_MINUTES', '30'))
+
+# Keyset pagination page sizes (Phase 22)
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# Idle connections kept per database file (Phase 30)
+POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '8'))
+
+# Phase 27: worker processes share the database files. In WAL mode readers
+# never block the writer (or each other); a writer waiting for another
+# worker's write lock retries for up to DB_BUSY_TIMEOUT seconds.
+JOURNAL_MODE = 'wal'
+BUSY_TIMEOUT_SECONDS = float(os.getenv('DB_BUSY_TIMEOUT', '30'))
+
+class PooledConnection(sqlite3.Connection):
+    """
+    Phase 30: A connection that goes back to its file's pool on close()
+    Reusing it keeps SQLite's cache of already-parsed statements (sized by
+    queries.STATEMENT_CACHE_SIZE) instead of throwing it away per call.
+    Phase 31: Every execute goes through profiler.ProfiledCursor
+    """
+    
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+    
+    @profiler.wrapper
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+    
+    @profiler.wrapper
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+    
+    def close(self):
+        if self._pool_key is None:
+            return super().close()
+        pool_key, self._pool_key = self._pool_key, None
+        try:
+            # Hand it over clean: no open transaction, default row factory
+            if self.in_transaction:
+                self.rollback()
+            self.row_factory = sqlite3.Row
+            reusable = True
+        except sqlite3.Error:
+            reusable = False
+        with _pool_lock:
+            _pool_counts['in_use'] -= 1
+            idle = _pool.setdefault(pool_key[0], [])
+            if reusable and len(idle) < POOL_SIZE:
+                idle.append((pool_key, self))
+                return
+        super().close()
+
+# path -> [((path, file identity), connection)], most recently used last
+_pool = {}
+_pool_lock = threading.Lock()
+# Phase 32: checked-out connections, and how checkouts were served
+_pool_counts = {'in_use': 0, 'opened': 0, 'reused': 0}
+
+def _file_identity(path: str):
+    """(device, inode) of a database file, so a deleted and re-created file isn't mistaken for the old one"""
+    try:
+        st = os.stat(path)
+        return (st.st_dev, st.st_ino)
+    except OSError:
+        return None
+
+def connect_db(path: str):
+    """
+    Open a connection to one database file
+    Phase 30: Reuses an idle pooled connection to the same file when there
+    is one; close() returns it to the pool
+    """
+    identity = _file_identity(path)
+    with _pool_lock:
+        idle = _pool.get(path)
+        while idle:
+            pool_key, conn = idle.pop()
+            if identity is not None and pool_key[1] == identity:
+                conn._pool_key = pool_key
+                _pool_counts['in_use'] += 1
+                _pool_counts['reused'] += 1
+                return conn
+            # The file was replaced (tests, restores) - this connection reads the old one
+            sqlite3.Connection.close(conn)
+    
+    conn = sqlite3.connect(path, factory=PooledConnection, check_same_thread=False,
+                           timeout=BUSY_TIMEOUT_SECONDS, cached_statements=queries.STATEMENT_CACHE_SIZE)
     conn.row_factory = sqlite3.Row
+    conn._pool_key = (path, identity or _file_identity(path))
+    with _pool_lock:
+        _pool_counts['in_use'] += 1
+        _pool_counts['opened'] += 1
     return conn
 
-def init_db():
-    """Initialize database with tables"""
-    # Ensure database directory exists
-    db_dir = os.path.dirname(os.path.abspath(DB_PATH))
-    os.makedirs(db_dir, exist_ok=True)
+def close_pool():
+    """Phase 30: Close every idle pooled connection"""
+    with _pool_lock:
+        idle = [conn for conns in _pool.values() for _, conn in conns]
+        _pool.clear()
+    for conn in idle:
+        sqlite3.Connection.close(conn)
+
+def pool_stats():
+    """
+    Phase 32: Connection pool state for /metrics
+    in_use: checked out and not closed yet; idle: waiting in the pool;
+    opened / reused: checkouts served by a new or a pooled connection
+    """
+    with _pool_lock:
+        idle = sum(len(conns) for conns in _pool.values())
+        return dict(_pool_counts, idle=idle, max_idle_per_file=POOL_SIZE)
+
+def _forget_pool_after_fork():
+    # A forked worker must not share the parent's SQLite handles
+    global _pool, _pool_lock, _pool_counts
+    _pool = {}
+    _pool_lock = threading.Lock()
+    _pool_counts = {'in_use': 0, 'opened': 0, 'reused': 0}
+
+os.register_at_fork(after_in_child=_forget_pool_after_fork)
+
+def get_db(user_id: int = None, row_id: int = None):
+    """
+    Get database connection
     
-    conn = get_db()
-    cursor = conn.cursor()
+    Phase 26: In sharding mode this is the router - it returns the shard
+    holding a family's data, found by user_id or by the id of one of the
+    family's rows (child, practice or custom word). With neither, or when
+    sharding is off, it returns the main database (the catalog).
+    """
+    if sharding.SHARD_COUNT:
+        shard = sharding.shard_for_id(row_id) if row_id is not None else _shard_for_user(user_id)
+        if shard is not None:
+            return connect_db(sharding.shard_path(DB_PATH, shard))
+    return connect_db(DB_PATH)
+
+# (catalog path, shard count, user_id) -> shard index; assignments never change
+_user_shard_cache = {}
+
+def _shard_for_user(user_id: int):
+    """Phase 26: Shard a user's family lives on (None = catalog)"""
+    if user_id is None:
+        return None
+    key = (DB_PATH, sharding.SHARD_COUNT, user_id)
+    if key not in _user_shard_cache:
+        conn = connect_db(DB_PATH)
+        row = queries.execute(conn, 'user_shards.for_user', (user_id,)).fetchone()
+        conn.close()
+        if row is None:
+            # Unknown or pre-sharding user - don't cache, it may be created later
+            return None
+        _user_shard_cache[key] = row[0]
+    return _user_shard_cache[key]
+
+def all_db_paths():
+    """Phase 26: The catalog plus every shard file (just DB_PATH when unsharded)"""
+    return [DB_PATH] + [sharding.shard_path(DB_PATH, i) for i in range(sharding.SHARD_COUNT)]
+
+def _readonly_uri(path: str) -> str:
+    return f"file:{pathname2url(os.path.abspath(path))}?mode=ro"
+
+def get_readonly_db(user_id: int = None, all_shards: bool = False):
+    """
+    Get a read-only database connection (Phase 23)
+    Used by long-running readers such as exports; it can never take a write lock
     
-    # Users table - Phase 12: Parent/teacher accounts
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            email TEXT NOT NULL UNIQUE,
-            password_hash TEXT NOT NULL,
-            created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    
-    # Children table - Phase 12: Child profiles linked to users
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS children (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            name TEXT NOT NULL,
-            age INTEGER,
-            created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users(id)
-        )
-    """)
-    
-    # Words table - Phase 4: Added successful_days, last_practiced, next_review
-    # Phase 5: Added reference_image
-    # Phase 12: Added user_id for family custom words (NULL = core/global)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS words (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            word TEXT NOT NULL,
-            category TEXT NOT NULL,
-            successful_days INTEGER DEFAULT 0,
-            last_practiced DATE,
-            next_review DATE,
-            reference_image TEXT,
-            user_id INTEGER,
-            created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users(id),
-            UNIQUE(word, user_id)
-        )
-    """)
-    
-    # Practices table - Phase 12: Added child_id to tie practices to specific child
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS practices (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            word_id INTEGER NOT NULL,
-            child_id INTEGER NOT NULL,
-            spelled_word TEXT NOT NULL,
-            is_correct BOOLEAN NOT NULL,
-            drawing_filename TEXT,
-            practiced_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (word_id) REFERENCES words(id),
-            FOREIGN KEY (child_id) REFERENCES children(id)
-        )
-    """)
-    
-    # Child Progress table - Phase 13: Per-child word progress tracking
-    # Tracks successful_days per child to fix multi-child isolation bug
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS child_progress (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            child_id INTEGER NOT NULL,
-            word_id INTEGER NOT NULL,
-            successful_days INTEGER DEFAULT 0,
-            last_practiced DATE,
-            next_review DATE,
-            created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (child_id) REFERENCES children(id),
-            FOREIGN KEY (word_id) REFERENCES words(id),
-            UNIQUE(child_id, word_id)
-        )
-    """)
-    
-    # Insert test words if empty - Phase 4: Initialize with next_review = today
-    # Phase 12: Core words have user_id = NULL
-    cursor.execute("SELECT COUNT(*) FROM words")
-    if cursor.fetchone()[0] == 0:
-        today = date.today().isoformat()
-        test_words = [
-            ("bee", "insects", 0, None, today, None),
-            ("spider", "insects", 0, None, today, None),
-            ("butterfly", "insects", 0, None, today, None)
-        ]
-        cursor.executemany(
-            "INSERT INTO words (word, category, successful_days, last_practiced, next_review, user_id) VALUES (?, ?, ?, ?, ?, ?)",
-            test_words
-        )
+    Phase 26: user_id routes to that family's shard. all_shards=True gives a
+    catalog connection with every shard attached, where words, children,
+    practices and child_progress are temp views over all of them, so
+    queries across families read the same as on an unsharded database.
+    """
+    if sharding.SHARD_COUNT and user_id is not None:
+        shard = _shard_for_user(user_id)
+        path = sharding.shard_path(DB_PATH, shard) if shard is not None else DB_PATH
+    else:
+        path = DB_PATH
+    conn = sqlite3.connect(_readonly_uri(path), uri=True, timeout=BUSY_TIMEOUT_SECONDS)
+    conn.row_factory = sqlite3.Row
     
-    conn.commit()
-    conn.close()
+    if all_shards and sharding.SHARD_COUNT:
+        shards = [f"shard{i}" for i in range(sharding.SHARD_COUNT)]
+        for i, alias in enumerate(shards):
+            conn.execute(f"ATTACH DATABASE ? AS {alias}", (_readonly_uri(sharding.shard_path(DB_PATH, i)),))
+        for table in ('words', 'children', 'practices', 'child_progress'):
+            # Shards hold copies of the core words; count them once, from the catalog
+            shard_filter = " WHERE user_id IS NOT NULL" if table == 'words' else ""
+            union = " UNION ALL ".join(
+                [f"SELECT * FROM main.{table}"] +
+                [f"SELECT * FROM {alias}.{table}{shard_filter}" for alias in shards]
+            )
+            conn.execute(f"CREATE TEMP VIEW {table} AS {union}")
+    return conn
+
+def get_global_db():
+    """
+    Phase 26: Connection for reads across every family
+    The plain database when unsharded, otherwise a read-only union of the
+    catalog and all shards (see get_readonly_db)
+    """
+    if sharding.SHARD_COUNT:
+        return get_readonly_db(all_shards=True)
+    return get_db()
+
+def analytics_snapshot_path():
+    """Path of the analytics snapshot (default: next to DB_PATH)"""
+    return ANALYTICS_SNAPSHOT_PATH or os.path.splitext(DB_PATH)[0] + '.analytics.db'
+
+def analytics_snapshot_age():
+    """Seconds since the analytics snapshot was taken, or None if there is none"""
+    try:
+        return max(0.0, datetime.now().timestamp() - os.path.getmtime(analytics_snapshot_path()))
+    except OSError:
+        return None
+
+def analytics_snapshot_stamp():
+    """
+    Identifies the snapshot dashboard queries currently read ('' = primary)
+    Part of the dashboard ETags, so a refreshed snapshot changes them
+    """
+    if not ANALYTICS_MODE or sharding.SHARD_COUNT:
+        # The snapshot copies only the catalog, so sharded dashboards read live
+        return ''
+    age = analytics_snapshot_age()
+    if age is None or age > ANALYTICS_MAX_STALENESS_MINUTES * 60:
+        return ''
+    return f"snapshot:{os.path.getmtime(analytics_snapshot_path()):.0f}"
+
+def get_analytics_db():
+    """
+    Phase 25: Connection for dashboard aggregations
+    In analytics mode this is a read-only connection to the snapshot;
+    falls back to the primary database if the snapshot is missing or
+    older than ANALYTICS_MAX_STALENESS_MINUTES
+    """
+    if analytics_snapshot_stamp():
+        path = os.path.abspath(analytics_snapshot_path())
+        try:
+            conn = sqlite3.connect(f"file:{pathname2url(path)}?mode=ro", uri=True)
+            conn.row_factory = sqlite3.Row
+            return conn
+        except sqlite3.OperationalError:
+            pass
+    return get_global_db()
+
+def fetch_dicts(cursor):
+    """
+    Fetch the remaining rows of the last query as plain dicts
+    Phase 21: builds each dict straight from the row tuple instead of
+    creating a sqlite3.Row and then copying it with dict(row)
+    """
+    cursor.row_factory = None
+    columns = [d[0] for d in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+def init_db():
+    """
+    Initialize database with tables
+    Phase 26: In sharding mode also creates every shard and copies the
+    core words into new ones
+    Phase 29: The schema lives in migrations/ and is applied by migrate.py;
+    a file that is already current costs one PRAGMA user_version read
+    
+    Phase 30: Drops pooled connections first, in case a file was replaced
+    Phase 27: Puts every file in WAL mode (see JOURNAL_MODE)
+    
+    Returns: number of migrations applied, over all files
+    """
+    import migrate  # migrate imports this module
+    
+    sharding.validate_shard_count()
+    close_pool()
+    # A re-created catalog may hand out the same user ids again
+    _user_shard_cache.clear()
+    
+    applied = migrate.migrate_database(DB_PATH)
+    shard_applied = 0
+    for index in range(sharding.SHARD_COUNT):
+        shard_applied += migrate.migrate_database(sharding.shard_path(DB_PATH, index), shard_index=index)
+    if shard_applied:
+        sync_core_words()
+    for path in all_db_paths():
+        set_journal_mode(path)
+    return applied + shard_applied
+
+def set_journal_mode(path: str, mode: str = JOURNAL_MODE):
+    """
+    Phase 27: Switch a database file to mode (WAL by default)
+    The mode is stored in the file, so this only writes the first time
+    """
+    conn = connect_db(path)
+    try:
+        if conn.execute("PRAGMA journal_mode").fetchone()[0] != mode:
+            conn.execute(f"PRAGMA journal_mode = {mode}")
+    finally:
+        conn.close()
+
+def _run_on_shards(write):
+    """Phase 26: Run write(cursor) in its own transaction on every shard"""
+    for index in range(sharding.SHARD_COUNT):
+        conn = connect_db(sharding.shard_path(DB_PATH, index))
+        try:
+            write(conn.cursor())
+            conn.commit()
+        finally:
+            conn.close()
+
+def sync_core_words(word_ids=None):
+    """
+    Phase 26: Copy core words from the catalog into every shard
+    word_ids limits the copy to those words (including deleting ones that
+    are gone); None re-syncs them all. A no-op when sharding is off.
+    """
+    # Phase 30: the ids travel as one JSON parameter so the statements stay fixed
+    id_list = None
+    if word_ids is not None:
+        word_ids = list(word_ids)
+        if not word_ids:
+            return
+        id_list = json.dumps(word_ids)
+    
+    def copy(cursor):
+        cursor.execute("ATTACH DATABASE ? AS catalog", (DB_PATH,))
+        try:
+            queries.execute(cursor, 'shard_words.copy_core', (id_list,))
+            queries.execute(cursor, 'shard_words.delete_removed_core', (id_list,))
+            bump_table_versions(cursor, 'words')
+            cursor.connection.commit()
+        finally:
+            # Pooled connections must come back without the catalog attached
+            cursor.connection.rollback()
+            cursor.execute("DETACH DATABASE catalog")
+    
+    _run_on_shards(copy)
 
 def get_all_words():
     """Get all words from database"""
-    conn = get_db()
+    conn = get_global_db()
     cursor = conn.cursor()
-    cursor.execute("SELECT id, word, category FROM words")
-    words = cursor.fetchall()
+    queries.execute(cursor, 'words.all')
+    words = fetch_dicts(cursor)
     conn.close()
-    return [dict(word) for word in words]
+    return words
 
 def get_word_for_practice(practiced_today=None):
     """
@@ -150,13 +397,7 @@ def get_word_for_practice(practiced_today=None):
     
     # Get words ready for review (where next_review <= today)
     # Exclude already practiced words in this session
-    cursor.execute("""
-        SELECT id, word, category, successful_days
-        FROM words
-        WHERE next_review <= ?
-        ORDER BY RANDOM()
-        LIMIT 1
-    """, (today,))
+    queries.execute(cursor, 'words.due_random', (today,))
     
     word = cursor.fetchone()
     conn.close()
@@ -164,37 +405,120 @@ def get_word_for_practice(practiced_today=None):
 
 def get_word_by_id(word_id: int):
     """Get word by ID"""
-    conn = get_db()
+    conn = get_db(row_id=word_id)
     cursor = conn.cursor()
-    cursor.execute("SELECT word, category FROM words WHERE id = ?", (word_id,))
+    queries.execute(cursor, 'words.by_id', (word_id,))
     word = cursor.fetchone()
     conn.close()
     return word
 
 def save_practice(word_id: int, child_id: int, spelled_word: str, is_correct: bool, drawing_filename: str):
     """Save practice record"""
-    conn = get_db()
+    conn = get_db(row_id=child_id)
     cursor = conn.cursor()
-    cursor.execute("""
-        INSERT INTO practices (word_id, child_id, spelled_word, is_correct, drawing_filename)
-        VALUES (?, ?, ?, ?, ?)
-    """, (word_id, child_id, spelled_word, is_correct, drawing_filename))
+    queries.execute(cursor, 'practices.insert',
+                    (word_id, child_id, spelled_word, is_correct, drawing_filename))
+    # Phase 38: count the misspelling in the same transaction
+    misspellings.record_practice(cursor, word_id, child_id, spelled_word)
+    bump_table_versions(cursor, 'practices')
     conn.commit()
     conn.close()
 
 def get_practices_for_word(word_id: int):
     """Get all practices for a word"""
-    conn = get_db()
+    conn = get_global_db()
     cursor = conn.cursor()
-    cursor.execute("""
-        SELECT id, spelled_word, is_correct, drawing_filename, practiced_date
-        FROM practices
-        WHERE word_id = ?
-        ORDER BY practiced_date DESC
-    """, (word_id,))
-    practices = cursor.fetchall()
+    queries.execute(cursor, 'practices.for_word', (word_id,))
+    practices = fetch_dicts(cursor)
     conn.close()
-    return [dict(p) for p in practices]
+    return practices
+
+def encode_page_cursor(sort_value, row_id: int) -> str:
+    """Opaque cursor for the last row of a page"""
+    raw = json.dumps([sort_value, row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+def decode_page_cursor(page_cursor: str):
+    """
+    Decode a cursor from encode_page_cursor into (sort_value, id)
+    Raises ValueError if the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(page_cursor + '=' * (-len(page_cursor) % 4))
+        sort_value, row_id = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid page cursor") from e
+    if not isinstance(row_id, int):
+        raise ValueError("Invalid page cursor")
+    return sort_value, row_id
+
+def _fetch_page(name: str, query: str, where: str, params: tuple, sort_column: str,
+                descending: bool, limit: int, after):
+    """
+    Phase 22: Fetch one keyset page ordered by (sort_column, id)
+    Seeks past the (sort_value, id) cursor with a row-value comparison, so
+    every page is an index range scan no matter how deep it is.
+    Phase 30: Only two SQL texts per page query (first page / later pages),
+    both cached per connection and timed under name
+
+    Returns: (rows, next_cursor) - next_cursor is None on the last page
+    """
+    conditions = [where] if where else []
+    params = list(params)
+    if after is not None:
+        conditions.append(f"({sort_column}, id) {'<' if descending else '>'} (?, ?)")
+        params.extend(after)
+    direction = 'DESC' if descending else 'ASC'
+    where_sql = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+
+    conn = get_global_db()
+    cursor = conn.cursor()
+    # One extra row tells us whether another page exists
+    queries.execute_sql(
+        cursor, name,
+        f"{query} {where_sql} ORDER BY {sort_column} {direction}, id {direction} LIMIT ?",
+        (*params, limit + 1)
+    )
+    rows = fetch_dicts(cursor)
+    conn.close()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_page_cursor(rows[-1][sort_column], rows[-1]['id'])
+    return rows, next_cursor
+
+def get_words_page(limit: int = DEFAULT_PAGE_SIZE, after=None):
+    """
+    Phase 22: One page of get_all_words, oldest first
+    after: decoded cursor from the previous page
+    Returns: (words, next_cursor)
+    """
+    return _fetch_page(
+        'words.page', "SELECT id, word, category, created_date FROM words",
+        None, (), 'created_date', False, limit, after
+    )
+
+def get_admin_words_page(limit: int = DEFAULT_PAGE_SIZE, after=None):
+    """
+    Phase 22: One page of get_all_words_admin, newest first
+    Returns: (words, next_cursor)
+    """
+    return _fetch_page(
+        'words.admin_page', """SELECT id, word, category, successful_days, last_practiced, next_review, created_date
+           FROM words""",
+        None, (), 'created_date', True, limit, after
+    )
+
+def get_practices_page(word_id: int, limit: int = DEFAULT_PAGE_SIZE, after=None):
+    """
+    Phase 22: One page of get_practices_for_word, newest first
+    Returns: (practices, next_cursor)
+    """
+    return _fetch_page(
+        'practices.page', "SELECT id, child_id, spelled_word, is_correct, drawing_filename, practiced_date FROM practices",
+        "word_id = ?", (word_id,), 'practiced_date', True, limit, after
+    )
 
 def update_word_on_success(word_id: int):
     """
@@ -206,12 +530,12 @@ def update_word_on_success(word_id: int):
     
     Returns: True if successful_days was incremented, False if already practiced today
     """
-    conn = get_db()
+    conn = get_db(row_id=word_id)
     cursor = conn.cursor()
     today = date.today().isoformat()
     
     # Get current word data
-    cursor.execute("SELECT successful_days, last_practiced FROM words WHERE id = ?", (word_id,))
+    queries.execute(cursor, 'words.progress', (word_id,))
     row = cursor.fetchone()
     
     if not row:
@@ -228,23 +552,13 @@ def update_word_on_success(word_id: int):
     # Increment successful_days
     new_successful_days = current_successful_days + 1
     
-    # Calculate next_review based on successful_days
-    if new_successful_days == 1:
-        # After first success → review in 2 days
-        next_review = (date.today() + timedelta(days=2)).isoformat()
-    elif new_successful_days >= 2:
-        # After 2+ successes → review in 3 days
-        next_review = (date.today() + timedelta(days=3)).isoformat()
-    else:
-        next_review = (date.today() + timedelta(days=1)).isoformat()
+    # Calculate next_review based on successful_days (Phase 17: scheduler.py)
+    next_review = get_scheduler().next_review(new_successful_days)
     
     # Update word record
-    cursor.execute("""
-        UPDATE words
-        SET successful_days = ?, last_practiced = ?, next_review = ?
-        WHERE id = ?
-    """, (new_successful_days, today, next_review, word_id))
+    queries.execute(cursor, 'words.set_progress', (new_successful_days, today, next_review, word_id))
     
+    bump_table_versions(cursor, 'words')
     conn.commit()
     conn.close()
     return True
@@ -254,20 +568,15 @@ def get_words_for_today():
     Phase 4: Get all words ready for practice today
     Returns words where next_review <= today, sorted by successful_days
     """
-    conn = get_db()
+    conn = get_global_db()
     cursor = conn.cursor()
     today = date.today().isoformat()
     
-    cursor.execute("""
-        SELECT id, word, category, successful_days
-        FROM words
-        WHERE next_review <= ?
-        ORDER BY successful_days ASC, word ASC
-    """, (today,))
+    queries.execute(cursor, 'words.due', (today,))
     
-    words = cursor.fetchall()
+    words = fetch_dicts(cursor)
     conn.close()
-    return [dict(w) for w in words]
+    return words
 
 def add_word(word: str, category: str, reference_image: str = None):
     """
@@ -278,20 +587,21 @@ def add_word(word: str, category: str, reference_image: str = None):
     today = date.today().isoformat()
     
     try:
-        cursor.execute("""
-            INSERT INTO words (word, category, successful_days, next_review)
-            VALUES (?, ?, 0, ?)
-        """, (word.lower(), category, today))
+        queries.execute(cursor, 'words.insert', (word.lower(), category, today, reference_image or None))
         
         word_id = cursor.lastrowid
         
-        if reference_image:
-            cursor.execute("""
-                UPDATE words SET reference_image = ? WHERE id = ?
-            """, (reference_image, word_id))
+        # New word is due today for every child whose queue is already built
+        _add_word_to_due_queues(cursor, word_id, None, today)
         
+        bump_table_versions(cursor, 'words')
         conn.commit()
         conn.close()
+        
+        # Phase 26: core words are copied into every shard's queues too
+        if sharding.SHARD_COUNT:
+            sync_core_words([word_id])
+            _run_on_shards(lambda shard: _add_word_to_due_queues(shard, word_id, None, today))
         return word_id
     except sqlite3.IntegrityError:
         conn.close()
@@ -300,81 +610,86 @@ def add_word(word: str, category: str, reference_image: str = None):
 def update_word(word_id: int, word: str = None, category: str = None, reference_image: str = None):
     """
     Phase 5: Update a word's details
+    Phase 30: One fixed statement; a None field keeps its current value
     """
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    updates = []
-    params = []
-    
-    if word:
-        updates.append("word = ?")
-        params.append(word.lower())
-    if category:
-        updates.append("category = ?")
-        params.append(category)
-    if reference_image is not None:
-        updates.append("reference_image = ?")
-        params.append(reference_image)
-    
-    if not updates:
-        conn.close()
+    word = word.lower() if word else None
+    category = category or None
+    if word is None and category is None and reference_image is None:
         return False
     
-    params.append(word_id)
-    query = f"UPDATE words SET {', '.join(updates)} WHERE id = ?"
-    
-    cursor.execute(query, params)
+    conn = get_db(row_id=word_id)
+    cursor = conn.cursor()
+    _update_word_rows(cursor, word_id, word, category, reference_image)
+    bump_table_versions(cursor, 'words')
     conn.commit()
     affected = cursor.rowcount
     conn.close()
+    
+    if affected and sharding.shard_for_id(word_id) is None:
+        # Phase 38: shard practices of a core word are re-graded with the shard's copy
+        if word is not None:
+            def rename_in_shard(shard):
+                _update_word_rows(shard, word_id, word, category, reference_image)
+                bump_table_versions(shard, 'words')
+            _run_on_shards(rename_in_shard)
+        sync_core_words([word_id])
     return affected > 0
 
+def _update_word_rows(cursor, word_id: int, word, category, reference_image):
+    """Update a word; a new text re-grades its practices first (Phase 38)"""
+    if word is not None:
+        misspellings.rename_word(cursor, word_id, word)
+    queries.execute(cursor, 'words.update', (word, category, reference_image, word_id))
+
 def delete_word(word_id: int):
     """
     Phase 5: Delete a word and all its practices
     """
-    conn = get_db()
+    conn = get_db(row_id=word_id)
     cursor = conn.cursor()
     
-    cursor.execute("DELETE FROM practices WHERE word_id = ?", (word_id,))
-    cursor.execute("DELETE FROM words WHERE id = ?", (word_id,))
+    _delete_word_rows(cursor, word_id)
     
+    bump_table_versions(cursor, 'words', 'practices')
     conn.commit()
     affected = cursor.rowcount
     conn.close()
+    
+    # Phase 26: a core word also has practices (and a copy) in every shard
+    if affected and sharding.shard_for_id(word_id) is None:
+        def delete_from_shard(shard):
+            _delete_word_rows(shard, word_id)
+            bump_table_versions(shard, 'words', 'practices')
+        _run_on_shards(delete_from_shard)
     return affected > 0
 
+def _delete_word_rows(cursor, word_id: int):
+    """Delete a word and everything referencing it; the words DELETE runs last"""
+    queries.execute(cursor, 'submissions.delete_for_word', (word_id,))
+    misspellings.forget_practices(cursor, 'misspellings.practices_for_word', word_id)
+    queries.execute(cursor, 'practices.delete_for_word', (word_id,))
+    queries.execute(cursor, 'due_queue.delete_for_word', (word_id,))
+    queries.execute(cursor, 'words.delete', (word_id,))
+
 def get_all_words_admin():
     """
     Phase 5: Get all words with full details for admin panel
     """
-    conn = get_db()
+    conn = get_global_db()
     cursor = conn.cursor()
-    cursor.execute("""
-        SELECT id, word, category, successful_days, last_practiced, next_review, created_date
-        FROM words
-        ORDER BY created_date DESC
-    """)
-    words = cursor.fetchall()
+    queries.execute(cursor, 'words.admin_list')
+    words = fetch_dicts(cursor)
     conn.close()
-    return [dict(word) for word in words]
+    return words
 
 def get_practice_stats():
     """
     Phase 6: Get overall practice statistics for dashboard
     """
-    conn = get_db()
+    conn = get_analytics_db()
     cursor = conn.cursor()
     
-    cursor.execute("""
-        SELECT 
-            COUNT(DISTINCT CASE WHEN DATE(practiced_date) = DATE('now') THEN word_id END) as words_today,
-            COUNT(DISTINCT CASE WHEN DATE(practiced_date) >= DATE('now', '-7 days') THEN word_id END) as words_this_week,
-            ROUND(AVG(CASE WHEN is_correct = 1 THEN 100.0 ELSE 0.0 END), 1) as overall_accuracy,
-            COUNT(*) as total_practices
-        FROM practices
-    """)
+    queries.execute(cursor, 'stats.overview')
     
     stats = cursor.fetchone()
     conn.close()
@@ -392,21 +707,10 @@ def get_word_accuracy():
     """
     Phase 6: Get accuracy per word, sorted by worst performing
     """
-    conn = get_db()
+    conn = get_analytics_db()
     cursor = conn.cursor()
     
-    cursor.execute("""
-        SELECT 
-            w.word,
-            w.category,
-            COUNT(*) as total_attempts,
-            SUM(CASE WHEN p.is_correct = 1 THEN 1 ELSE 0 END) as correct_attempts,
-            ROUND(100.0 * SUM(CASE WHEN p.is_correct = 1 THEN 1 ELSE 0 END) / COUNT(*), 1) as accuracy
-        FROM words w
-        JOIN practices p ON w.id = p.word_id
-        GROUP BY w.id, w.word, w.category
-        ORDER BY accuracy ASC, total_attempts DESC
-    """)
+    queries.execute(cursor, 'stats.word_accuracy')
     
     words = cursor.fetchall()
     conn.close()
@@ -423,20 +727,12 @@ def get_practice_trend(days=7):
     """
     Phase 6: Get practice trend over last N days
     Returns daily practice counts for line chart
+    Phase 30: days is bound as a parameter, never formatted into the SQL
     """
-    conn = get_db()
+    conn = get_analytics_db()
     cursor = conn.cursor()
     
-    cursor.execute(f"""
-        SELECT 
-            DATE(practiced_date) as practice_date,
-            COUNT(*) as practice_count,
-            SUM(CASE WHEN is_correct = 1 THEN 1 ELSE 0 END) as correct_count
-        FROM practices
-        WHERE DATE(practiced_date) >= DATE('now', '-{days} days')
-        GROUP BY DATE(practiced_date)
-        ORDER BY practice_date ASC
-    """)
+    queries.execute(cursor, 'stats.practice_trend', (f"-{int(days)} days",))
     
     trend = cursor.fetchall()
     conn.close()
@@ -451,21 +747,10 @@ def get_recent_drawings(limit=10):
     """
     Phase 6: Get recent drawings with metadata for gallery
     """
-    conn = get_db()
+    conn = get_global_db()
     cursor = conn.cursor()
     
-    cursor.execute("""
-        SELECT 
-            p.drawing_filename,
-            w.word,
-            p.is_correct,
-            p.practiced_date
-        FROM practices p
-        JOIN words w ON p.word_id = w.id
-        WHERE p.drawing_filename IS NOT NULL
-        ORDER BY p.practiced_date DESC
-        LIMIT ?
-    """, (limit,))
+    queries.execute(cursor, 'practices.recent_drawings', (limit,))
     
     drawings = cursor.fetchall()
     conn.close()
@@ -486,11 +771,7 @@ def reset_db_to_initial():
     cursor = conn.cursor()
     today = date.today().isoformat()
     
-    # Delete all practices
-    cursor.execute("DELETE FROM practices")
-    
-    # Delete all words
-    cursor.execute("DELETE FROM words")
+    _clear_practices_and_words(cursor)
     
     # Re-insert initial words
     test_words = [
@@ -498,15 +779,37 @@ def reset_db_to_initial():
         ("spider", "insects", 0, None, today, None),
         ("butterfly", "insects", 0, None, today, None)
     ]
-    cursor.executemany(
-        "INSERT INTO words (word, category, successful_days, last_practiced, next_review, user_id) VALUES (?, ?, ?, ?, ?, ?)",
-        test_words
-    )
+    queries.executemany(cursor, 'words.insert_initial', test_words)
     
+    bump_table_versions(cursor, 'words', 'practices')
     conn.commit()
     conn.close()
+    
+    # Phase 26: clear every shard too, then copy the new core words in
+    if sharding.SHARD_COUNT:
+        def reset_shard(shard):
+            _clear_practices_and_words(shard)
+            bump_table_versions(shard, 'words', 'practices')
+        _run_on_shards(reset_shard)
+        sync_core_words()
     return True
 
+def _clear_practices_and_words(cursor):
+    """Delete all practices and words (and what depends on them) on one database"""
+    # Delete all practices (and the sessions queuing the old words)
+    queries.execute(cursor, 'submissions.delete_all')
+    queries.execute(cursor, 'practices.delete_all')
+    queries.execute(cursor, 'misspellings.delete_all')
+    queries.execute(cursor, 'confusions.delete_all')
+    queries.execute(cursor, 'sessions.delete_all')
+    
+    # Words change below, so every child's due queue is rebuilt on next read
+    queries.execute(cursor, 'due_queue.delete_all')
+    queries.execute(cursor, 'due_queue_builds.delete_all')
+    
+    # Delete all words
+    queries.execute(cursor, 'words.delete_all')
+
 # ===== PHASE 12: User & Child Management =====
 
 def hash_password(password: str) -> str:
@@ -531,12 +834,13 @@ def create_user(email: str, password: str) -> int:
     
     try:
         password_hash = hash_password(password)
-        cursor.execute(
-            "INSERT INTO users (email, password_hash) VALUES (?, ?)",
-            (email.lower(), password_hash)
-        )
-        conn.commit()
+        queries.execute(cursor, 'users.insert', (email.lower(), password_hash))
         user_id = cursor.lastrowid
+        
+        # Phase 26: place the new family on a shard
+        if sharding.SHARD_COUNT:
+            queries.execute(cursor, 'user_shards.insert', (user_id, sharding.ring_shard_for_user(user_id)))
+        conn.commit()
         conn.close()
         return user_id
     except sqlite3.IntegrityError:
@@ -547,7 +851,7 @@ def get_user_by_email(email: str):
     """Get user by email"""
     conn = get_db()
     cursor = conn.cursor()
-    cursor.execute("SELECT id, email, password_hash FROM users WHERE email = ?", (email.lower(),))
+    queries.execute(cursor, 'users.by_email', (email.lower(),))
     user = cursor.fetchone()
     conn.close()
     return dict(user) if user else None
@@ -556,19 +860,17 @@ def get_user_by_id(user_id: int):
     """Get user by ID"""
     conn = get_db()
     cursor = conn.cursor()
-    cursor.execute("SELECT id, email, created_date FROM users WHERE id = ?", (user_id,))
+    queries.execute(cursor, 'users.by_id', (user_id,))
     user = cursor.fetchone()
     conn.close()
     return dict(user) if user else None
 
 def create_child(user_id: int, name: str, age: int = None) -> int:
     """Create child profile. Returns child_id."""
-    conn = get_db()
+    conn = get_db(user_id=user_id)
     cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO children (user_id, name, age) VALUES (?, ?, ?)",
-        (user_id, name, age)
-    )
+    queries.execute(cursor, 'children.insert', (user_id, name, age))
+    bump_table_versions(cursor, 'children')
     conn.commit()
     child_id = cursor.lastrowid
     conn.close()
@@ -576,50 +878,32 @@ def create_child(user_id: int, name: str, age: int = None) -> int:
 
 def get_user_children(user_id: int):
     """Get all children for a user"""
-    conn = get_db()
+    conn = get_db(user_id=user_id)
     cursor = conn.cursor()
-    cursor.execute(
-        "SELECT id, user_id, name, age, created_date FROM children WHERE user_id = ? ORDER BY created_date DESC",
-        (user_id,)
-    )
-    children = cursor.fetchall()
+    queries.execute(cursor, 'children.for_user', (user_id,))
+    children = fetch_dicts(cursor)
     conn.close()
-    return [dict(c) for c in children]
+    return children
 
 def get_child_by_id(child_id: int):
     """Get child by ID"""
-    conn = get_db()
+    conn = get_db(row_id=child_id)
     cursor = conn.cursor()
-    cursor.execute(
-        "SELECT id, user_id, name, age, created_date FROM children WHERE id = ?",
-        (child_id,)
-    )
+    queries.execute(cursor, 'children.by_id', (child_id,))
     child = cursor.fetchone()
     conn.close()
     return dict(child) if child else None
 
 def update_child(child_id: int, name: str = None, age: int = None) -> bool:
-    """Update child profile"""
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    updates = []
-    params = []
-    
-    if name:
-        updates.append("name = ?")
-        params.append(name)
-    if age is not None:
-        updates.append("age = ?")
-        params.append(age)
-    
-    if not updates:
-        conn.close()
+    """Update child profile (Phase 30: a None field keeps its current value)"""
+    name = name or None
+    if name is None and age is None:
         return False
     
-    params.append(child_id)
-    query = f"UPDATE children SET {', '.join(updates)} WHERE id = ?"
-    cursor.execute(query, params)
+    conn = get_db(row_id=child_id)
+    cursor = conn.cursor()
+    queries.execute(cursor, 'children.update', (name, age, child_id))
+    bump_table_versions(cursor, 'children')
     conn.commit()
     affected = cursor.rowcount
     conn.close()
@@ -627,13 +911,20 @@ def update_child(child_id: int, name: str = None, age: int = None) -> bool:
 
 def delete_child(child_id: int) -> bool:
     """Delete child and all their practices and progress"""
-    conn = get_db()
+    conn = get_db(row_id=child_id)
     cursor = conn.cursor()
     
-    cursor.execute("DELETE FROM practices WHERE child_id = ?", (child_id,))
-    cursor.execute("DELETE FROM child_progress WHERE child_id = ?", (child_id,))
-    cursor.execute("DELETE FROM children WHERE id = ?", (child_id,))
-    
+    queries.execute(cursor, 'submissions.delete_for_child', (child_id,))
+    misspellings.forget_practices(cursor, 'misspellings.practices_for_child', child_id)
+    queries.execute(cursor, 'practices.delete_for_child', (child_id,))
+    queries.execute(cursor, 'confusions.delete_for_child', (child_id,))
+    queries.execute(cursor, 'child_progress.delete_for_child', (child_id,))
+    queries.execute(cursor, 'due_queue.delete_for_child', (child_id,))
+    queries.execute(cursor, 'due_queue_builds.delete_for_child', (child_id,))
+    queries.execute(cursor, 'sessions.delete_for_child', (child_id,))
+    queries.execute(cursor, 'children.delete', (child_id,))
+    
+    bump_table_versions(cursor, 'children', 'practices', 'child_progress')
     conn.commit()
     affected = cursor.rowcount
     conn.close()
@@ -645,66 +936,140 @@ def get_words_for_child(child_id: int):
     Returns core words (user_id IS NULL) + family's custom words
     Uses child_progress table for per-child successful_days tracking
     Only returns words that need practice (next_review <= today)
+    
+    Phase 16: Reads the child's precomputed due queue for today,
+    building it first if the nightly job hasn't done so yet
     """
-    conn = get_db()
+    conn = get_db(row_id=child_id)
     cursor = conn.cursor()
+    today = date.today().isoformat()
     
+    queries.execute(cursor, 'due_queue_builds.exists', (child_id, today))
+    if not cursor.fetchone():
+        if not _build_due_queue(cursor, child_id, today):
+            conn.close()
+            return []
+        conn.commit()
+    
+    queries.execute(cursor, 'due_queue.words_for_child', (child_id, today))
+    
+    words = fetch_dicts(cursor)
+    conn.close()
+    return words
+
+# ===== PHASE 16: Daily Due Queue =====
+
+def _build_due_queue(cursor, child_id: int, queue_date: str) -> bool:
+    """
+    (Re)build one child's due queue for queue_date on the given cursor
+    Caller owns the transaction
+    
+    Returns: False if the child doesn't exist
+    """
     # Get child's user_id first
-    cursor.execute("SELECT user_id FROM children WHERE id = ?", (child_id,))
+    queries.execute(cursor, 'children.user_id', (child_id,))
     result = cursor.fetchone()
     if not result:
-        conn.close()
-        return []
+        return False
     
     user_id = result[0]
-    today = date.today().isoformat()
     
-    # Get core words + family's custom words with per-child progress
+    queries.execute(cursor, 'due_queue.delete_for_child', (child_id,))
+    queries.execute(cursor, 'due_queue_builds.delete_for_child', (child_id,))
+    
+    # Core words + family's custom words with per-child progress
     # Use child_progress table for successful_days, defaulting to 0 if no entry exists
-    # Only include words where next_review <= today (ready for practice today)
+    # Only include words where next_review <= queue_date (ready for practice that day)
     # For new children (no cp record), cp.next_review IS NULL so they see all words
-    cursor.execute("""
-        SELECT 
-            w.id, 
-            w.word, 
-            w.category, 
-            COALESCE(cp.successful_days, 0) as successful_days,
-            w.user_id,
-            COALESCE(cp.next_review, w.next_review) as next_review
-        FROM words w
-        LEFT JOIN child_progress cp ON w.id = cp.word_id AND cp.child_id = ?
-        WHERE (w.user_id IS NULL OR w.user_id = ?)
-        AND (cp.next_review IS NULL OR cp.next_review <= ?)
-        ORDER BY COALESCE(cp.successful_days, 0) ASC, w.word ASC
-    """, (child_id, user_id, today))
+    queries.execute(cursor, 'due_queue.build', (child_id, queue_date, child_id, user_id, queue_date))
+    queries.execute(cursor, 'due_queue_builds.insert', (child_id, queue_date))
+    return True
+
+def build_due_queues(queue_date: str = None) -> int:
+    """
+    Phase 16: Build every child's due queue for a day (default today)
+    Run by the nightly job just after local midnight; also drops older days
     
-    words = cursor.fetchall()
+    Returns: number of queues built
+    """
+    queue_date = queue_date or date.today().isoformat()
+    built = 0
+    
+    # Phase 26: children live in the catalog and every shard
+    for path in all_db_paths():
+        conn = connect_db(path)
+        cursor = conn.cursor()
+        queries.execute(cursor, 'children.all_ids')
+        child_ids = [r[0] for r in cursor.fetchall()]
+        
+        # One short transaction per child so practice writes aren't blocked for long
+        for child_id in child_ids:
+            _build_due_queue(cursor, child_id, queue_date)
+            conn.commit()
+        
+        queries.execute(cursor, 'due_queue.delete_before', (queue_date,))
+        queries.execute(cursor, 'due_queue_builds.delete_before', (queue_date,))
+        conn.commit()
+        conn.close()
+        built += len(child_ids)
+    return built
+
+def invalidate_due_queues(user_id: int = None):
+    """
+    Phase 16: Force due queues to be rebuilt on next read
+    user_id=None invalidates every child (core words changed),
+    otherwise only that family's children
+    """
+    if user_id is None:
+        for path in all_db_paths():
+            conn = connect_db(path)
+            queries.execute(conn, 'due_queue_builds.delete_all')
+            conn.commit()
+            conn.close()
+        return
+    
+    conn = get_db(user_id=user_id)
+    queries.execute(conn, 'due_queue_builds.delete_for_user', (user_id,))
+    conn.commit()
     conn.close()
-    return [dict(w) for w in words]
+
+def _add_word_to_due_queues(cursor, word_id: int, user_id, next_review: str):
+    """Add a newly created word to the built due queues that should include it"""
+    queries.execute(cursor, 'due_queue.add_word', (word_id, next_review, next_review, user_id, user_id))
 
 def update_word_on_success_for_child(word_id: int, child_id: int):
     """
     Phase 13: Update word progress after successful practice for a child
     Updates child_progress table for per-child tracking
     """
-    conn = get_db()
+    conn = get_db(row_id=child_id)
     cursor = conn.cursor()
-    today = date.today().isoformat()
     
     # Verify child_id owns this word (indirectly via user_id)
-    cursor.execute("""
-        SELECT c.user_id FROM children c WHERE c.id = ?
-    """, (child_id,))
+    queries.execute(cursor, 'children.user_id', (child_id,))
     result = cursor.fetchone()
     if not result:
         conn.close()
         return False
     
+    updated = _record_success_for_child(cursor, word_id, child_id)
+    
+    bump_table_versions(cursor, 'child_progress')
+    conn.commit()
+    conn.close()
+    return updated
+
+def _record_success_for_child(cursor, word_id: int, child_id: int) -> bool:
+    """
+    Increment a child's successful_days for a word on the given cursor
+    Caller owns the transaction (commit/rollback)
+    
+    Returns: True if successful_days was incremented, False if already practiced today
+    """
+    today = date.today().isoformat()
+    
     # Check if child_progress record exists for this child/word
-    cursor.execute("""
-        SELECT successful_days, last_practiced FROM child_progress 
-        WHERE child_id = ? AND word_id = ?
-    """, (child_id, word_id))
+    queries.execute(cursor, 'child_progress.get', (child_id, word_id))
     row = cursor.fetchone()
     
     if row:
@@ -713,7 +1078,6 @@ def update_word_on_success_for_child(word_id: int, child_id: int):
         
         # Only increment if not already practiced today
         if last_practiced == today:
-            conn.close()
             return False
     else:
         # No record yet, create one
@@ -723,29 +1087,177 @@ def update_word_on_success_for_child(word_id: int, child_id: int):
     # Increment successful_days
     new_successful_days = current_successful_days + 1
     
-    # Calculate next_review
-    if new_successful_days == 1:
-        next_review = (date.today() + timedelta(days=2)).isoformat()
-    elif new_successful_days >= 2:
-        next_review = (date.today() + timedelta(days=3)).isoformat()
-    else:
-        next_review = (date.today() + timedelta(days=1)).isoformat()
+    # Calculate next_review (Phase 17: scheduler.py)
+    next_review = get_scheduler().next_review(new_successful_days)
     
     # Insert or update child_progress record
     if row:
         # Update existing record
-        cursor.execute("""
-            UPDATE child_progress
-            SET successful_days = ?, last_practiced = ?, next_review = ?
-            WHERE child_id = ? AND word_id = ?
-        """, (new_successful_days, today, next_review, child_id, word_id))
+        queries.execute(cursor, 'child_progress.update',
+                        (new_successful_days, today, next_review, child_id, word_id))
     else:
         # Insert new record
-        cursor.execute("""
-            INSERT INTO child_progress (child_id, word_id, successful_days, last_practiced, next_review)
-            VALUES (?, ?, ?, ?, ?)
-        """, (child_id, word_id, new_successful_days, today, next_review))
+        queries.execute(cursor, 'child_progress.insert',
+                        (child_id, word_id, new_successful_days, today, next_review))
+    
+    # Word is no longer due for this child - drop it from their built queues
+    queries.execute(cursor, 'due_queue.drop_mastered', (child_id, word_id, next_review))
     
-    conn.commit()
-    conn.close()
     return True
+
+# ===== PHASE 14: Batch Practice Submission =====
+
+def get_child_successful_days(child_id: int, word_id: int) -> int:
+    """Phase 13: Days a child has spelled a word correctly (0 if not practiced yet)"""
+    conn = get_db(row_id=child_id)
+    row = queries.execute(conn, 'child_progress.successful_days', (child_id, word_id)).fetchone()
+    conn.close()
+    return row[0] if row else 0
+
+def get_submitted_practices(user_id: int, idempotency_keys):
+    """
+    Phase 14: Look up idempotency keys a user has already submitted
+    Returns dict of idempotency_key -> practice_id
+    Phase 30: the keys are bound as one JSON list, so any number of them
+    uses the same cached statement
+    """
+    keys = list(idempotency_keys)
+    if not keys:
+        return {}
+    
+    conn = get_db(user_id=user_id)
+    cursor = conn.cursor()
+    queries.execute(cursor, 'submissions.find_many', (user_id, json.dumps(keys)))
+    rows = cursor.fetchall()
+    conn.close()
+    return {r[0]: r[1] for r in rows}
+
+def save_practice_batch(user_id: int, records):
+    """
+    Phase 14: Save many practice records in a single transaction
+    
+    Each record is a dict with idempotency_key, word_id, child_id, spelled_word,
+    is_correct and drawing_filename. Records whose idempotency_key was already
+    submitted by this user are skipped, so a client can safely retry a batch.
+    Correct answers also update child_progress, same as a single practice.
+    
+    Returns: list of dicts {idempotency_key, practice_id, status} in input order,
+    where status is 'applied' or 'duplicate'
+    Raises ValueError (and applies nothing) if a record references a missing word
+    """
+    conn = get_db(user_id=user_id)
+    cursor = conn.cursor()
+    results = []
+    
+    try:
+        # Take the write lock up front so concurrent retries of the same batch serialize
+        cursor.execute("BEGIN IMMEDIATE")
+        
+        for record in records:
+            key = record['idempotency_key']
+            
+            queries.execute(cursor, 'submissions.find', (user_id, key))
+            existing = cursor.fetchone()
+            if existing:
+                results.append({'idempotency_key': key, 'practice_id': existing[0], 'status': 'duplicate'})
+                continue
+            
+            queries.execute(cursor, 'words.exists', (record['word_id'],))
+            if not cursor.fetchone():
+                raise ValueError(f"Word {record['word_id']} not found")
+            
+            queries.execute(cursor, 'practices.insert',
+                            (record['word_id'], record['child_id'], record['spelled_word'],
+                             record['is_correct'], record.get('drawing_filename')))
+            practice_id = cursor.lastrowid
+            misspellings.record_practice(cursor, record['word_id'], record['child_id'], record['spelled_word'])
+            
+            queries.execute(cursor, 'submissions.insert', (user_id, key, practice_id))
+            
+            if record['is_correct']:
+                _record_success_for_child(cursor, record['word_id'], record['child_id'])
+            
+            results.append({'idempotency_key': key, 'practice_id': practice_id, 'status': 'applied'})
+        
+        bump_table_versions(cursor, 'practices', 'child_progress')
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    
+    return results
+
+# ===== PHASE 19: Table Versions (HTTP caching) =====
+
+def bump_table_versions(cursor, *tables):
+    """
+    Phase 19: Mark tables as changed on the given cursor's connection
+    Call inside the write's transaction so the bump commits (or rolls back) with it.
+    Runs on a separate cursor so the caller's rowcount / lastrowid are untouched.
+    """
+    queries.executemany(cursor.connection, 'table_versions.bump', [(table,) for table in tables])
+
+def get_table_versions(tables=VERSIONED_TABLES):
+    """
+    Phase 19: Get current change counters, e.g. {'words': 3, 'practices': 10}
+    Phase 26: summed over the catalog and every shard (counters only grow)
+    """
+    wanted = set(tables)
+    versions = {}
+    for path in all_db_paths():
+        conn = connect_db(path)
+        # Phase 30: the table is a handful of rows - filter here, keep one statement
+        for name, version in queries.execute(conn, 'table_versions.all').fetchall():
+            if name in wanted:
+                versions[name] = versions.get(name, 0) + version
+        conn.close()
+    return versions
+
+# ===== PHASE 27: Practice Session State =====
+
+def update_session_state(child_id: int, change):
+    """
+    Read-modify-write a child's practice session state in one write transaction
+    
+    change(state) gets the saved state dict (None if there is none) and
+    returns the new state, or None to leave it unchanged. BEGIN IMMEDIATE
+    takes the write lock before reading, so concurrent requests from any
+    worker apply one after another instead of overwriting each other.
+    
+    Returns: whatever state was saved (or the unchanged one)
+    """
+    conn = get_db(row_id=child_id)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        row = queries.execute(conn, 'sessions.get', (child_id,)).fetchone()
+        state = json.loads(row[0]) if row else None
+        
+        new_state = change(state)
+        if new_state is not None:
+            queries.execute(conn, 'sessions.save', (child_id, json.dumps(new_state)))
+            state = new_state
+        conn.commit()
+        return state
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+def count_session_states() -> int:
+    """Phase 32: Saved practice sessions over the catalog and every shard"""
+    total = 0
+    for path in all_db_paths():
+        conn = connect_db(path)
+        total += queries.execute(conn, 'sessions.count').fetchone()[0]
+        conn.close()
+    return total
+
+def get_session_state(child_id: int):
+    """Phase 27: A child's saved practice session state (None if there is none)"""
+    conn = get_db(row_id=child_id)
+    row = queries.execute(conn, 'sessions.get', (child_id,)).fetchone()
+    conn.close()
+    return json.loads(row[0]) if row else None
@@ -0,0 +1,322 @@
+"""
+Phase 36: Synthetic dataset generator
+Builds a spelling.db file of realistic size to benchmark and load-test
+against: users, children, core and family custom words, months of
+practice history with misspellings, the matching child_progress rows,
+the misspelling index and (optionally) placeholder drawing files.
+
+Everything is drawn from one seeded NumPy generator, so the same
+arguments give the same database (dates are relative to end_date,
+default today). Rows go in with executemany in one transaction with
+the practices indexes dropped and rebuilt afterwards, which writes
+1M+ practices in seconds.
+
+Every generated user has the same password (hashed once) so any
+account can log in: user<N>@example.com / password. The database is
+unsharded (a catalog with every family on it).
+
+Usage:
+    python datagen.py ../data/perf.db
+    python datagen.py ../data/perf.db --users 5000 --practices-per-child 200 --months 12 --force
+    python datagen.py /tmp/demo.db --users 20 --drawings /tmp/demo_drawings
+"""
+
+import os
+import sqlite3
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+import database
+import migrate
+import misspellings
+from scheduler import get_scheduler
+
+# Rows per executemany call
+BATCH_SIZE = 100_000
+# Misspelled variants prepared per word; wrong answers pick one of them
+MISSPELLINGS_PER_WORD = 4
+# Practices happen between these hours
+DAY_START_HOUR, DAY_END_HOUR = 7, 20
+
+CATEGORIES = ['animals', 'insects', 'food', 'colors', 'family', 'home', 'school',
+              'nature', 'weather', 'body', 'clothes', 'transport', 'sports', 'music']
+CHILD_NAMES = ['Ada', 'Ben', 'Cleo', 'Dev', 'Ella', 'Finn', 'Gus', 'Hana', 'Ivy', 'Jon',
+               'Kai', 'Lena', 'Milo', 'Nia', 'Omar', 'Pia', 'Quinn', 'Rosa', 'Sam', 'Tess']
+_ONSETS = ['b', 'c', 'd', 'f', 'g', 'h', 'l', 'm', 'n', 'p', 'r', 's', 't', 'w',
+           'bl', 'br', 'ch', 'cr', 'fl', 'gr', 'pl', 'sh', 'sn', 'st', 'th', 'tr']
+_VOWELS = ['a', 'e', 'i', 'o', 'u', 'ai', 'ee', 'ie', 'ei', 'oa', 'ou', 'ea']
+_CODAS = ['', '', 'd', 'g', 'k', 'l', 'm', 'n', 'p', 'r', 's', 't', 'ck', 'ng', 'sh', 'tch']
+
+
+def make_words(rng, count: int, taken=()):
+    """count distinct pronounceable words (1-3 syllables) not in taken"""
+    words = []
+    seen = set(taken)
+    while len(words) < count:
+        syllables = rng.integers(1, 4)
+        word = ''.join(
+            _ONSETS[rng.integers(len(_ONSETS))] + _VOWELS[rng.integers(len(_VOWELS))]
+            for _ in range(syllables)
+        ) + _CODAS[rng.integers(len(_CODAS))]
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words
+
+
+def misspell(word: str, rng) -> str:
+    """A typical child's mistake: swapped, dropped, doubled or wrong letter"""
+    if len(word) < 2:
+        return word + word
+    i = int(rng.integers(len(word) - 1))
+    kind = rng.integers(4)
+    if kind == 0 and word[i] != word[i + 1]:
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    if kind <= 1:
+        return word[:i] + word[i + 1:]
+    if kind == 2:
+        return word[:i] + word[i] + word[i:]
+    letter = 'abcdefghijklmnopqrstuvwxyz'[rng.integers(26)]
+    return word[:i] + (letter if letter != word[i] else 'e' if word[i] != 'e' else 'a') + word[i + 1:]
+
+
+def _placeholder_png() -> bytes:
+    """A small white PNG, written with zlib so generating doesn't need Pillow"""
+    import struct
+    import zlib
+
+    width, height = 64, 48
+
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    raw = b''.join(b'\x00' + b'\xff' * width for _ in range(height))
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 0, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(raw, 9)) + chunk(b'IEND', b''))
+
+
+def write_drawings(drawings_dir: str, filenames) -> int:
+    """Placeholder files for every drawing (hard links to one image where possible)"""
+    os.makedirs(drawings_dir, exist_ok=True)
+    template = os.path.join(drawings_dir, '.placeholder.png')
+    png = _placeholder_png()
+    with open(template, 'wb') as f:
+        f.write(png)
+    written = 0
+    for filename in filenames:
+        path = os.path.join(drawings_dir, filename)
+        try:
+            os.link(template, path)
+        except FileExistsError:
+            continue
+        except OSError:
+            with open(path, 'wb') as f:
+                f.write(png)
+        written += 1
+    os.remove(template)
+    return written
+
+
+def _batches(rows, size=BATCH_SIZE):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def generate(path: str, users: int = 1000, children_per_user=(1, 3), core_words: int = 300,
+             custom_words_per_user=(0, 15), practices_per_child: int = 400, months: int = 6,
+             accuracy: float = 0.7, drawing_rate: float = 1.0, drawings_dir: str = None,
+             seed: int = 0, end_date: date = None, password: str = 'password'):
+    """
+    Create a new database at path filled with synthetic data
+
+    children_per_user / custom_words_per_user: inclusive (min, max) per user
+    practices_per_child: mean of a Poisson draw per child, spread over months
+    drawing_rate: share of practices with a drawing; drawings_dir also writes the files
+
+    Returns: {'users', 'children', 'words', 'practices', 'child_progress', 'drawings', 'seconds'}
+    """
+    started = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    end_date = end_date or date.today()
+    days = max(1, months * 30)
+    first_day = end_date - timedelta(days=days - 1)
+    today = end_date.isoformat()
+
+    migrate.migrate_database(path)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("PRAGMA journal_mode = MEMORY")
+    cursor = conn.cursor()
+    if cursor.execute("SELECT COUNT(*) FROM users").fetchone()[0]:
+        conn.close()
+        raise ValueError(f"{path} already has users; generate into a new file")
+
+    # Users, all created before the history starts
+    password_hash = database.hash_password(password)
+    created = f"{first_day.isoformat()} 08:00:00"
+    cursor.executemany(
+        "INSERT INTO users (id, email, password_hash, created_date) VALUES (?, ?, ?, ?)",
+        [(i, f"user{i}@example.com", password_hash, created) for i in range(1, users + 1)]
+    )
+
+    # Children
+    per_user = rng.integers(children_per_user[0], children_per_user[1] + 1, size=users)
+    child_user = np.repeat(np.arange(1, users + 1), per_user)
+    num_children = len(child_user)
+    ages = rng.integers(5, 11, size=num_children)
+    names = rng.integers(len(CHILD_NAMES), size=num_children)
+    cursor.executemany(
+        "INSERT INTO children (id, user_id, name, age, created_date) VALUES (?, ?, ?, ?, ?)",
+        [(i + 1, int(child_user[i]), CHILD_NAMES[names[i]], int(ages[i]), created) for i in range(num_children)]
+    )
+
+    # Words: the seeded core words plus generated core and per-family custom words
+    existing = cursor.execute("SELECT id, word FROM words WHERE user_id IS NULL ORDER BY id").fetchall()
+    next_id = (existing[-1][0] if existing else 0) + 1
+    core_texts = make_words(rng, core_words, taken=[w for _, w in existing])
+    custom_counts = rng.integers(custom_words_per_user[0], custom_words_per_user[1] + 1, size=users)
+    custom_texts = make_words(rng, int(custom_counts.sum()), taken=[w for _, w in existing] + core_texts)
+
+    word_rows = []
+    for text in core_texts:
+        word_rows.append((next_id + len(word_rows), text, CATEGORIES[rng.integers(len(CATEGORIES))], today, None))
+    custom_user = np.repeat(np.arange(1, users + 1), custom_counts)
+    for text, user_id in zip(custom_texts, custom_user.tolist()):
+        word_rows.append((next_id + len(word_rows), text, CATEGORIES[rng.integers(len(CATEGORIES))], today, user_id))
+    cursor.executemany(
+        "INSERT INTO words (id, word, category, successful_days, next_review, user_id, created_date) "
+        f"VALUES (?, ?, ?, 0, ?, ?, '{created}')",
+        word_rows
+    )
+
+    core_ids = np.array([w[0] for w in existing] + [r[0] for r in word_rows[:core_words]], dtype=np.int64)
+    custom_ids = np.array([r[0] for r in word_rows[core_words:]], dtype=np.int64)
+    # Each user's custom words are custom_ids[custom_start[u - 1]:][:custom_counts[u - 1]]
+    custom_start = np.concatenate(([0], np.cumsum(custom_counts)[:-1]))
+    # word id -> (word, misspelling 1, misspelling 2, ...)
+    spelled = {
+        w_id: (text, *(misspell(text, rng) for _ in range(MISSPELLINGS_PER_WORD)))
+        for w_id, text in existing + [(r[0], r[1]) for r in word_rows]
+    }
+
+    # Practices, vectorized: who, which word, when, right or wrong
+    counts = rng.poisson(practices_per_child, size=num_children)
+    practice_child = np.repeat(np.arange(num_children), counts)
+    total = len(practice_child)
+    family_custom = custom_counts[child_user[practice_child] - 1]
+    # Families practice their own words in proportion to how many they added
+    use_custom = rng.random(total) < family_custom / (family_custom + len(core_ids))
+    word_ids = core_ids[rng.integers(len(core_ids), size=total)]
+    custom_pick = custom_start[child_user[practice_child] - 1] + (
+        rng.random(total) * np.maximum(family_custom, 1)).astype(np.int64)
+    word_ids = np.where(use_custom, custom_ids[np.minimum(custom_pick, max(len(custom_ids) - 1, 0))]
+                        if len(custom_ids) else word_ids, word_ids)
+    day = rng.integers(days, size=total)
+    seconds = rng.integers(DAY_START_HOUR * 3600, DAY_END_HOUR * 3600, size=total)
+    correct = rng.random(total) < accuracy
+    variant = rng.integers(MISSPELLINGS_PER_WORD, size=total)
+    has_drawing = rng.random(total) < drawing_rate
+
+    # Rows in time order, built from plain lists (indexing NumPy scalars per row is slow)
+    order = np.lexsort((seconds, day))
+    day_names = [(first_day + timedelta(days=d)).isoformat() for d in range(days)]
+    clock = [f"{s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}" for s in range(DAY_END_HOUR * 3600)]
+    drawing_no = np.cumsum(has_drawing[order]) - 1
+    rows = [
+        (w, c + 1, spelled[w][0 if ok else 1 + v],
+         ok, f"gen-{seed}-{n:09d}.png" if drawn else None, f"{day_names[d]} {clock[t]}")
+        for w, c, ok, v, drawn, n, d, t in zip(
+            word_ids[order].tolist(), practice_child[order].tolist(), correct[order].tolist(),
+            variant[order].tolist(), has_drawing[order].tolist(), drawing_no.tolist(),
+            day[order].tolist(), seconds[order].tolist(),
+        )
+    ]
+    drawing_names = [row[4] for row in rows if row[4]] if drawings_dir else []
+
+    indexes = cursor.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'practices' AND sql IS NOT NULL"
+    ).fetchall()
+    for name, _ in indexes:
+        cursor.execute(f'DROP INDEX "{name}"')
+    for batch in _batches(rows):
+        cursor.executemany(
+            "INSERT INTO practices (word_id, child_id, spelled_word, is_correct, drawing_filename, practiced_date) "
+            "VALUES (?, ?, ?, ?, ?, ?)", batch
+        )
+    for _, sql in indexes:
+        cursor.execute(sql)
+
+    # child_progress: distinct days with a correct answer per (child, word)
+    progress = 0
+    if correct.any():
+        pair = practice_child[correct] * (int(word_ids.max()) + 1) + word_ids[correct]
+        pair_days = np.unique(np.stack([pair, day[correct]], axis=1), axis=0)
+        pairs, first, successful_days = np.unique(pair_days[:, 0], return_index=True, return_counts=True)
+        last_day = pair_days[first + successful_days - 1, 1]
+        last_practiced = np.datetime64(first_day.isoformat(), 'D') + last_day
+        next_review = get_scheduler().next_review_batch(successful_days, last_practiced)
+        width = int(word_ids.max()) + 1
+        progress_rows = zip(
+            (pairs // width + 1).tolist(), (pairs % width).tolist(), successful_days.tolist(),
+            last_practiced.astype(str).tolist(), next_review.astype(str).tolist()
+        )
+        for batch in _batches(list(progress_rows)):
+            cursor.executemany(
+                "INSERT INTO child_progress (child_id, word_id, successful_days, last_practiced, next_review) "
+                "VALUES (?, ?, ?, ?, ?)", batch
+            )
+        progress = len(pairs)
+
+    # Phase 38: the misspelling index is kept on insert, which the bulk load skips
+    misspellings.rebuild(conn)
+
+    database.bump_table_versions(cursor, 'words', 'practices', 'child_progress', 'children')
+    conn.commit()
+    conn.execute("PRAGMA journal_mode = DELETE")
+    conn.close()
+
+    written = write_drawings(drawings_dir, drawing_names) if drawings_dir else 0
+    return {
+        'users': users,
+        'children': num_children,
+        'words': len(existing) + len(word_rows),
+        'practices': total,
+        'child_progress': progress,
+        'drawings': written,
+        'seconds': round(time.perf_counter() - started, 2),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate a synthetic spelling.db")
+    parser.add_argument("path", help="database file to create")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--children-per-user", type=int, nargs=2, default=[1, 3], metavar=("MIN", "MAX"))
+    parser.add_argument("--core-words", type=int, default=300)
+    parser.add_argument("--custom-words", type=int, nargs=2, default=[0, 15], metavar=("MIN", "MAX"),
+                        help="custom words per family")
+    parser.add_argument("--practices-per-child", type=int, default=400, help="mean practices per child")
+    parser.add_argument("--months", type=int, default=6, help="months of history")
+    parser.add_argument("--accuracy", type=float, default=0.7)
+    parser.add_argument("--drawing-rate", type=float, default=1.0)
+    parser.add_argument("--drawings", metavar="DIR", help="also write placeholder drawing files here")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--force", action="store_true", help="replace an existing file")
+    args = parser.parse_args()
+
+    if os.path.exists(args.path):
+        if not args.force:
+            parser.error(f"{args.path} exists (use --force to replace it)")
+        os.remove(args.path)
+
+    result = generate(
+        args.path, args.users, tuple(args.children_per_user), args.core_words, tuple(args.custom_words),
+        args.practices_per_child, args.months, args.accuracy, args.drawing_rate, args.drawings, args.seed,
+    )
+    print(f"Generated {args.path} in {result['seconds']}s: {result['users']} users, {result['children']} children, "
+          f"{result['words']} words, {result['practices']} practices, {result['child_progress']} child_progress rows"
+          + (f", {result['drawings']} drawings" if args.drawings else ""))
@@ -0,0 +1,148 @@
+"""
+Phase 23: Streaming data export
+Streams a family's practices, child_progress and words as NDJSON or CSV.
+
+Rows are read in keyset chunks (WHERE id > last_id ... LIMIT n) over a
+read-only connection. Each chunk's statement is finished before the chunk
+is yielded, so memory stays at one chunk regardless of history size and
+no read transaction stays open while the client downloads. In WAL mode
+readers don't block writers, but a long-lived cursor would pin its
+snapshot for the whole transfer and stop checkpoints from resetting the
+-wal file, which then keeps growing.
+
+Usage:
+    python export.py practices --user-id 3 --format csv > practices.csv
+"""
+
+import csv
+import io
+
+from database import get_readonly_db
+from fast_json import render_json
+
+# Rows per query / per yielded chunk
+EXPORT_CHUNK_ROWS = 1000
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+# Dataset -> keyset query; every query takes (user_id, last_id, limit)
+# and selects the keyset column first as "id"
+EXPORT_QUERIES = {
+    'practices': """
+        SELECT p.id, p.child_id, c.name AS child_name, p.word_id, w.word,
+               p.spelled_word, p.is_correct, p.drawing_filename, p.practiced_date
+        FROM practices p
+        JOIN children c ON c.id = p.child_id
+        JOIN words w ON w.id = p.word_id
+        WHERE c.user_id = ? AND p.id > ?
+        ORDER BY p.id
+        LIMIT ?
+    """,
+    'child_progress': """
+        SELECT cp.id, cp.child_id, c.name AS child_name, cp.word_id, w.word,
+               cp.successful_days, cp.last_practiced, cp.next_review
+        FROM child_progress cp
+        JOIN children c ON c.id = cp.child_id
+        JOIN words w ON w.id = cp.word_id
+        WHERE c.user_id = ? AND cp.id > ?
+        ORDER BY cp.id
+        LIMIT ?
+    """,
+    'words': """
+        SELECT id, word, category, reference_image, created_date
+        FROM words
+        WHERE user_id = ? AND id > ?
+        ORDER BY id
+        LIMIT ?
+    """,
+}
+
+
+def iter_export_rows(dataset: str, user_id: int, chunk_rows: int = EXPORT_CHUNK_ROWS):
+    """
+    Yield (columns, rows) chunks for one dataset, oldest row first
+    Raises ValueError for an unknown dataset
+    """
+    if dataset not in EXPORT_QUERIES:
+        raise ValueError(f"Unknown export '{dataset}'. Choose from: {', '.join(EXPORT_QUERIES)}")
+
+    query = EXPORT_QUERIES[dataset]
+    last_id = 0
+    while True:
+        conn = get_readonly_db(user_id=user_id)
+        try:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute(query, (user_id, last_id, chunk_rows))
+            columns = [d[0] for d in cursor.description]
+            rows = cursor.fetchmany(chunk_rows)
+        finally:
+            # Closing ends the read transaction before the chunk is sent
+            conn.close()
+
+        if not rows:
+            return
+        yield columns, rows
+        if len(rows) < chunk_rows:
+            return
+        last_id = rows[-1][0]
+
+
+def stream_export(dataset: str, user_id: int, fmt: str = 'ndjson',
+                  chunk_rows: int = EXPORT_CHUNK_ROWS):
+    """
+    Yield an export as encoded byte chunks (one per query chunk)
+
+    Args:
+        dataset: 'practices', 'child_progress' or 'words'
+        user_id: family whose data is exported
+        fmt: 'ndjson' or 'csv'
+        chunk_rows: rows per query / per yielded chunk
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}'. Choose from: {', '.join(EXPORT_FORMATS)}")
+
+    header_sent = False
+    for columns, rows in iter_export_rows(dataset, user_id, chunk_rows):
+        if fmt == 'ndjson':
+            yield b''.join(render_json(dict(zip(columns, row))) + b'\n' for row in rows)
+        else:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            if not header_sent:
+                writer.writerow(columns)
+                header_sent = True
+            writer.writerows(rows)
+            yield buffer.getvalue().encode('utf-8')
+
+    # An empty CSV export still gets its header row
+    if fmt == 'csv' and not header_sent:
+        yield (','.join(export_columns(dataset)) + '\r\n').encode('utf-8')
+
+
+def export_columns(dataset: str):
+    """Column names of a dataset, without reading any rows"""
+    conn = get_readonly_db()
+    try:
+        cursor = conn.execute(EXPORT_QUERIES[dataset], (None, 0, 0))
+        return [d[0] for d in cursor.description]
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Export a family's data as NDJSON or CSV")
+    parser.add_argument("dataset", choices=sorted(EXPORT_QUERIES))
+    parser.add_argument("--user-id", type=int, required=True)
+    parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default='ndjson')
+    parser.add_argument("--chunk-rows", type=int, default=EXPORT_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    for chunk in stream_export(args.dataset, args.user_id, args.format, args.chunk_rows):
+        sys.stdout.buffer.write(chunk)
@@ -0,0 +1,38 @@
+"""
+Phase 21: Fast JSON serialization
+API responses are rendered with orjson when it is installed (falling back
+to the standard json module). Responses built with cached_json_response
+or returned as FastJSONResponse serialize plain data directly; a dict
+returned from a route without a response_model is still copied through
+jsonable_encoder by FastAPI first, and only the rendering is faster.
+"""
+
+import json
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson is optional - json works, just slower
+    orjson = None
+
+
+def render_json(content) -> bytes:
+    """
+    Serialize API data to compact UTF-8 JSON
+    Types orjson doesn't know (Pydantic models, Decimal, ...) go through
+    jsonable_encoder, so the output matches FastAPI's default rendering.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=jsonable_encoder, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        jsonable_encoder(content), ensure_ascii=False, separators=(',', ':')
+    ).encode('utf-8')
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with render_json; the app's default response class"""
+
+    def render(self, content) -> bytes:
+        return render_json(content)
@@ -0,0 +1,199 @@
+"""
+Phase 37: Server-side grading
+The client used to decide whether an answer was right and send
+is_correct; now the server grades spelled_word against the word itself.
+
+- normalize(): Unicode NFKC, case-folded, trimmed, inner whitespace
+  collapsed, typographic apostrophes made plain
+- grade(): correct or not, plus the edit distance and each error, typed:
+  substitution ('cat' -> 'cot'), omission ('bee' -> 'be'), insertion
+  ('bee' -> 'beee') and transposition ('field' -> 'feild')
+
+The distance is the optimal string alignment variant of Damerau-Levenshtein
+(an adjacent swap costs 1, as children make them). The common prefix and
+suffix are stripped first, so a typical one-letter mistake only runs the
+dynamic program over a couple of characters, and results are cached per
+(word, answer) pair - grading inline on every practice costs microseconds.
+
+regrade_practices() is the batch mode: it re-grades the stored history
+in id ranges (python grading.py regrade).
+
+Usage:
+    python grading.py check field feild
+    python grading.py regrade --dry-run
+"""
+
+import unicodedata
+from functools import lru_cache
+
+import queries
+
+ERROR_TYPES = ('substitution', 'omission', 'insertion', 'transposition')
+
+# (word, answer) pairs remembered by grade()
+GRADE_CACHE_SIZE = 8192
+
+# Practices read / updated per transaction during a regrade
+REGRADE_CHUNK_SIZE = 50000
+
+_APOSTROPHES = str.maketrans({'‘': "'", '’': "'", 'ʼ': "'", '`': "'"})
+
+
+def normalize(text: str) -> str:
+    """Canonical form answers are compared in"""
+    text = unicodedata.normalize('NFKC', text or '').translate(_APOSTROPHES)
+    return ' '.join(text.casefold().split())
+
+
+def _operations(expected: str, spelled: str):
+    """
+    Edits turning expected into spelled, as (type, position, expected_chars, spelled_chars)
+    position indexes expected (for an insertion: the letter it comes before)
+    """
+    # Only the differing middle needs the dynamic program
+    start = 0
+    limit = min(len(expected), len(spelled))
+    while start < limit and expected[start] == spelled[start]:
+        start += 1
+    end_a, end_b = len(expected), len(spelled)
+    while end_a > start and end_b > start and expected[end_a - 1] == spelled[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = expected[start:end_a], spelled[start:end_b]
+    n, m = len(a), len(b)
+    if not n:
+        return tuple(('insertion', start, '', c) for c in b)
+    if not m:
+        return tuple(('omission', start + i, c, '') for i, c in enumerate(a))
+
+    d = [list(range(m + 1))] + [[i] + [0] * m for i in range(1, n + 1)]
+    for i in range(1, n + 1):
+        ai = a[i - 1]
+        row, prev = d[i], d[i - 1]
+        for j in range(1, m + 1):
+            bj = b[j - 1]
+            cost = prev[j - 1] + (ai != bj)
+            if prev[j] + 1 < cost:
+                cost = prev[j] + 1
+            if row[j - 1] + 1 < cost:
+                cost = row[j - 1] + 1
+            if i > 1 and j > 1 and ai == b[j - 2] and a[i - 2] == bj and ai != bj and d[i - 2][j - 2] + 1 < cost:
+                cost = d[i - 2][j - 2] + 1
+            row[j] = cost
+
+    ops = []
+    i, j = n, m
+    while i or j:
+        if (i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1] and a[i - 1] != b[j - 1]
+                and d[i][j] == d[i - 2][j - 2] + 1):
+            ops.append(('transposition', start + i - 2, a[i - 2:i], b[j - 2:j]))
+            i -= 2
+            j -= 2
+        elif i and j and d[i][j] == d[i - 1][j - 1] + (a[i - 1] != b[j - 1]):
+            if a[i - 1] != b[j - 1]:
+                ops.append(('substitution', start + i - 1, a[i - 1], b[j - 1]))
+            i -= 1
+            j -= 1
+        elif i and d[i][j] == d[i - 1][j] + 1:
+            ops.append(('omission', start + i - 1, a[i - 1], ''))
+            i -= 1
+        else:
+            ops.append(('insertion', start + i, '', b[j - 1]))
+            j -= 1
+    return tuple(reversed(ops))
+
+
+@lru_cache(maxsize=GRADE_CACHE_SIZE)
+def grade_ops(expected: str, spelled: str):
+    """(normalized word, normalized answer, edits as (type, position, expected, spelled) tuples)"""
+    expected, spelled = normalize(expected), normalize(spelled)
+    return expected, spelled, (() if expected == spelled else _operations(expected, spelled))
+
+
+def grade(expected: str, spelled: str):
+    """
+    Grade an answer against the word
+
+    Returns: {'is_correct', 'expected', 'spelled' (both normalized), 'distance',
+              'errors': [{'type', 'position', 'expected', 'spelled'}]}
+    """
+    expected, spelled, ops = grade_ops(expected, spelled)
+    return {
+        'is_correct': not ops,
+        'expected': expected,
+        'spelled': spelled,
+        'distance': len(ops),
+        'errors': [{'type': t, 'position': p, 'expected': e, 'spelled': s} for t, p, e, s in ops],
+    }
+
+
+def is_correct(expected: str, spelled: str) -> bool:
+    """grade()['is_correct'] without building the report"""
+    return not grade_ops(expected, spelled)[2]
+
+
+def regrade_practices(dry_run: bool = False, chunk_size: int = REGRADE_CHUNK_SIZE):
+    """
+    Re-grade every stored practice and fix is_correct where the client got it wrong
+    Each (word, answer) pair is graded once; reads and updates chunk_size
+    practices per transaction (keyset on id). child_progress is left as is -
+    it records the reviews that were scheduled at the time.
+
+    Returns: {'checked', 'changed', 'now_correct', 'now_incorrect', 'errors': {type: count}}
+    """
+    from database import all_db_paths, bump_table_versions, connect_db
+
+    totals = {'checked': 0, 'changed': 0, 'now_correct': 0, 'now_incorrect': 0,
+              'errors': {error_type: 0 for error_type in ERROR_TYPES}}
+
+    # Phase 26: practices are spread over the catalog and every shard
+    for path in all_db_paths():
+        conn = connect_db(path)
+        cursor = conn.cursor()
+        last_id = 0
+        try:
+            while True:
+                rows = queries.execute(cursor, 'practices.grading_page', (last_id, chunk_size)).fetchall()
+                if not rows:
+                    break
+                updates = []
+                for practice_id, stored, spelled, word in rows:
+                    ops = grade_ops(word, spelled)[2]
+                    for op in ops:
+                        totals['errors'][op[0]] += 1
+                    correct = not ops
+                    if bool(stored) != correct:
+                        updates.append((correct, practice_id))
+                        totals['now_correct' if correct else 'now_incorrect'] += 1
+                totals['checked'] += len(rows)
+                totals['changed'] += len(updates)
+                if updates and not dry_run:
+                    queries.executemany(cursor, 'practices.set_correct', updates)
+                    bump_table_versions(cursor, 'practices')
+                    conn.commit()
+                last_id = rows[-1][0]
+        finally:
+            conn.close()
+    return totals
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Grade answers and re-grade practice history")
+    commands = parser.add_subparsers(dest="command", required=True)
+    check = commands.add_parser("check", help="grade one answer")
+    check.add_argument("word")
+    check.add_argument("spelled")
+    regrade = commands.add_parser("regrade", help="re-grade every stored practice")
+    regrade.add_argument("--dry-run", action="store_true", help="count changes without saving them")
+    args = parser.parse_args()
+
+    if args.command == "check":
+        print(json.dumps(grade(args.word, args.spelled), indent=2))
+    else:
+        result = regrade_practices(dry_run=args.dry_run)
+        print(f"{'Would change' if args.dry_run else 'Changed'} {result['changed']} of {result['checked']} "
+              f"practices ({result['now_correct']} now correct, {result['now_incorrect']} now incorrect)")
+        print("Errors: " + ", ".join(f"{t} {n}" for t, n in result['errors'].items()))
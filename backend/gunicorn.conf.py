@@ -0,0 +1,31 @@
+"""
+Phase 27: gunicorn settings
+    gunicorn -c gunicorn.conf.py main:app
+
+WEB_CONCURRENCY sets the number of uvicorn worker processes (default: one
+per CPU core); PORT sets the listen port (default 8000).
+"""
+
+import os
+
+from workers import prepare_database, worker_count
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = worker_count()
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Exports and imports can stream for a while
+timeout = 120
+graceful_timeout = 30
+keepalive = 5
+
+# Restart workers now and then so slow leaks can't build up
+max_requests = 10000
+max_requests_jitter = 1000
+
+accesslog = "-"
+
+
+def on_starting(server):
+    """Migrate once in the master before any worker is forked"""
+    prepare_database()
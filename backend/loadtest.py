@@ -0,0 +1,289 @@
+"""
+Phase 34: End-to-end load test
+Simulates families using the app the way the frontend does and reports
+throughput and latency percentiles per step, so a slowdown in the hot
+paths (session start, next-word, practice uploads, dashboard) shows up
+before it ships.
+
+Each simulated family, in a loop until the run is over:
+register -> login -> create a child -> list children -> start a session
+-> (practice with a PNG drawing -> next-word) until the session is done
+-> dashboard stats, word accuracy and trend.
+
+Families are asyncio tasks sharing one httpx.AsyncClient. By default the
+server is started on a throwaway database and drawings directory (like
+benchmark_workers.py), so it's safe to run in CI; --url points it at a
+server that's already running instead. With --max-p95-ms and/or
+--max-error-rate it exits non-zero when a threshold is broken.
+
+Usage:
+    python loadtest.py
+    python loadtest.py --families 20 --duration 30 --workers 2
+    python loadtest.py --max-p95-ms 250 --max-error-rate 0.01 --json results.json
+    python loadtest.py --url http://127.0.0.1:8000 --duration 10
+"""
+
+import asyncio
+import io
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+import httpx
+
+import database
+from benchmark_workers import _server_command, _wait_until_ready
+
+# Report order of the steps a family goes through
+STEPS = (
+    'register', 'login', 'create_child', 'list_children', 'start_session',
+    'practice', 'next_word', 'dashboard_stats', 'dashboard_word_accuracy', 'dashboard_trend',
+)
+
+# Share of answers a simulated child gets right
+CORRECT_RATE = 0.7
+# Safety net for a session that never completes (e.g. wrong answers requeued forever)
+MAX_WORDS_PER_SESSION = 50
+# Canvas size of the drawing pad on a phone
+DRAWING_SIZE = (360, 240)
+
+
+def make_drawing(rng: random.Random) -> bytes:
+    """A PNG of a few random strokes, like the drawing pad uploads"""
+    # Pillow is only needed to generate drawings
+    from PIL import Image, ImageDraw
+
+    width, height = DRAWING_SIZE
+    image = Image.new('RGB', DRAWING_SIZE, (255, 255, 255))
+    draw = ImageDraw.Draw(image)
+    for _ in range(rng.randint(3, 8)):
+        points = [(rng.randint(0, width), rng.randint(0, height)) for _ in range(rng.randint(4, 12))]
+        draw.line(points, fill=(rng.randint(0, 80),) * 3, width=rng.randint(3, 8), joint='curve')
+    out = io.BytesIO()
+    image.save(out, format='PNG')
+    return out.getvalue()
+
+
+class Results:
+    """Latencies and errors per step"""
+
+    def __init__(self):
+        self.latencies = {step: [] for step in STEPS}
+        self.errors = {step: 0 for step in STEPS}
+        self.error_samples = []
+        self.sessions = 0
+
+    def record(self, step: str, seconds: float, ok: bool, detail: str = None):
+        self.latencies[step].append(seconds)
+        if not ok:
+            self.errors[step] += 1
+            if len(self.error_samples) < 10:
+                self.error_samples.append(f"{step}: {detail}")
+
+    def summary(self, duration: float):
+        """{'requests', 'errors', 'error_rate', 'rps', 'sessions', 'steps': {step: {...}}, ...}"""
+        def percentile(values, q):
+            return round(values[min(len(values) - 1, int(q * len(values)))] * 1000, 2)
+
+        steps = {}
+        all_latencies = []
+        for step in STEPS:
+            values = sorted(self.latencies[step])
+            if not values:
+                continue
+            all_latencies.extend(values)
+            steps[step] = {
+                'requests': len(values),
+                'errors': self.errors[step],
+                'rps': round(len(values) / duration, 1),
+                'p50_ms': percentile(values, 0.50),
+                'p95_ms': percentile(values, 0.95),
+                'p99_ms': percentile(values, 0.99),
+                'max_ms': round(values[-1] * 1000, 2),
+            }
+        all_latencies.sort()
+        requests = len(all_latencies)
+        errors = sum(self.errors.values())
+        return {
+            'duration_s': round(duration, 1),
+            'requests': requests,
+            'errors': errors,
+            'error_rate': round(errors / requests, 4) if requests else 0.0,
+            'rps': round(requests / duration, 1),
+            'sessions': self.sessions,
+            'p50_ms': percentile(all_latencies, 0.50) if requests else None,
+            'p95_ms': percentile(all_latencies, 0.95) if requests else None,
+            'p99_ms': percentile(all_latencies, 0.99) if requests else None,
+            'steps': steps,
+            'error_samples': list(self.error_samples),
+        }
+
+
+async def _call(client, results, step, method, path, expected=(200,), **kwargs):
+    """Send one request and time it; returns the response, or None on a transport error"""
+    started = time.perf_counter()
+    try:
+        response = await client.request(method, path, **kwargs)
+    except httpx.HTTPError as e:
+        results.record(step, time.perf_counter() - started, False, repr(e))
+        return None
+    ok = response.status_code in expected
+    results.record(step, time.perf_counter() - started, ok,
+                   None if ok else f"{method} {path} -> {response.status_code} {response.text[:200]}")
+    return response
+
+
+async def family(client, results, deadline, family_id, num_words, rng):
+    """One simulated family, going through sessions until the deadline"""
+    drawings = [make_drawing(rng) for _ in range(4)]
+    while time.monotonic() < deadline:
+        email = f"load-{family_id}-{uuid.uuid4().hex[:8]}@example.com"
+        credentials = {"email": email, "password": "password"}
+        response = await _call(client, results, 'register', 'POST', '/api/auth/register', json=credentials)
+        if response is None or response.status_code != 200:
+            await asyncio.sleep(0.1)
+            continue
+        response = await _call(client, results, 'login', 'POST', '/api/auth/login', json=credentials)
+        if response is None or response.status_code != 200:
+            continue
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        response = await _call(client, results, 'create_child', 'POST', '/api/children', expected=(201,),
+                               headers=headers, json={"name": f"Child {family_id}", "age": rng.randint(5, 9)})
+        if response is None or response.status_code != 201:
+            continue
+        child_id = response.json()['id']
+        await _call(client, results, 'list_children', 'GET', '/api/children', headers=headers)
+
+        response = await _call(client, results, 'start_session', 'POST', '/api/session/start',
+                               headers=headers, params={"num_words": num_words, "child_id": child_id})
+        word = response.json() if response is not None and response.status_code == 200 else None
+        for _ in range(MAX_WORDS_PER_SESSION):
+            if not word or word.get('completed') or time.monotonic() >= deadline:
+                break
+            correct = rng.random() < CORRECT_RATE
+            await _call(
+                client, results, 'practice', 'POST', '/api/practice', headers=headers,
+                data={"word_id": str(word['id']), "spelled_word": word['word'] if correct else word['word'][::-1],
+                      "is_correct": "true" if correct else "false", "child_id": str(child_id)},
+                files={"drawing": ("drawing.png", rng.choice(drawings), "image/png")},
+            )
+            # 404 is how next-word says the session is complete
+            response = await _call(client, results, 'next_word', 'GET', '/api/next-word', expected=(200, 404),
+                                   headers=headers, params={"child_id": child_id})
+            word = response.json() if response is not None and response.status_code == 200 else None
+        results.sessions += 1
+
+        await _call(client, results, 'dashboard_stats', 'GET', '/api/dashboard/stats')
+        await _call(client, results, 'dashboard_word_accuracy', 'GET', '/api/dashboard/word-accuracy')
+        await _call(client, results, 'dashboard_trend', 'GET', '/api/dashboard/trend', params={"days": 7})
+
+
+async def drive(base_url: str, families: int = 10, duration: float = 10.0, num_words: int = 10, seed: int = 0):
+    """Run families concurrently against a server for duration seconds; returns Results.summary()"""
+    results = Results()
+    limits = httpx.Limits(max_connections=families, max_keepalive_connections=families)
+    async with httpx.AsyncClient(base_url=base_url, timeout=30, limits=limits) as client:
+        started = time.monotonic()
+        deadline = started + duration
+        await asyncio.gather(*(
+            family(client, results, deadline, i, num_words, random.Random(seed * 1000 + i))
+            for i in range(families)
+        ))
+        elapsed = time.monotonic() - started
+    return results.summary(elapsed)
+
+
+def seed_words(count: int):
+    """Add core words to the current database so sessions have enough to practice"""
+    for i in range(count):
+        database.add_word(f"load{i:04d}", f"category{i % 8}")
+
+
+def run_loadtest(families: int = 10, duration: float = 10.0, num_words: int = 10, workers: int = 1,
+                 port: int = 8766, core_words: int = 60, seed: int = 0):
+    """Start the server on a throwaway database and drawings directory and drive load against it"""
+    workdir = tempfile.mkdtemp(prefix='loadtest_')
+    db_path = os.path.join(workdir, 'loadtest.db')
+    original_path = database.DB_PATH
+    database.DB_PATH = db_path
+    try:
+        database.init_db()
+        seed_words(core_words)
+    finally:
+        database.close_pool()
+        database.DB_PATH = original_path
+
+    env = dict(os.environ, DATABASE_PATH=db_path, DRAWINGS_DIR=os.path.join(workdir, 'drawings'),
+               PORT=str(port), WEB_CONCURRENCY=str(workers))
+    server = subprocess.Popen(
+        _server_command(workers, port), env=env,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_until_ready(port, server)
+        return asyncio.run(drive(f"http://127.0.0.1:{port}", families, duration, num_words, seed))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def check_thresholds(summary, max_p95_ms: float = None, max_error_rate: float = None):
+    """Threshold violations (empty when the run passes)"""
+    failures = []
+    if max_error_rate is not None and summary['error_rate'] > max_error_rate:
+        failures.append(f"error rate {summary['error_rate']:.2%} > {max_error_rate:.2%}")
+    if max_p95_ms is not None:
+        for step, s in summary['steps'].items():
+            if s['p95_ms'] > max_p95_ms:
+                failures.append(f"{step} p95 {s['p95_ms']}ms > {max_p95_ms}ms")
+    return failures
+
+
+def print_report(summary):
+    print(f"{summary['requests']} requests in {summary['duration_s']}s: {summary['rps']} req/s, "
+          f"{summary['sessions']} sessions, {summary['errors']} errors")
+    print(f"{'step':<26}{'reqs':>7}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}{'errors':>8}")
+    for step, s in summary['steps'].items():
+        print(f"{step:<26}{s['requests']:>7}{s['rps']:>9}{s['p50_ms']:>9}{s['p95_ms']:>9}"
+              f"{s['p99_ms']:>9}{s['max_ms']:>9}{s['errors']:>8}")
+    for sample in summary['error_samples']:
+        print(f"  error: {sample}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Simulate families practicing and report latency per step")
+    parser.add_argument("--families", type=int, default=10, help="concurrent simulated families")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--words", type=int, default=10, help="words per practice session")
+    parser.add_argument("--workers", type=int, default=1, help="server worker processes")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--url", help="load an already running server instead of starting one")
+    parser.add_argument("--max-p95-ms", type=float, help="fail if any step's p95 is above this")
+    parser.add_argument("--max-error-rate", type=float, help="fail if the error rate is above this (0-1)")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    if args.url:
+        summary = asyncio.run(drive(args.url.rstrip('/'), args.families, args.duration, args.words))
+    else:
+        summary = run_loadtest(args.families, args.duration, args.words, args.workers, args.port)
+    print_report(summary)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+    failures = check_thresholds(summary, args.max_p95_ms, args.max_error_rate)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
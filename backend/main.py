@@ -4,36 +4,88 @@ Phase 1: MVP - Core Canvas & Basic Spelling
 Phase 12: Multi-user and multi-child support
 """
 
-from fastapi import FastAPI, File, UploadFile, HTTPException, Form, Depends, Header, Query
+from fastapi import FastAPI, File, UploadFile, HTTPException, Form, Depends, Header, Query, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse
+from fastapi.responses import StreamingResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from datetime import datetime
+from datetime import datetime, date, timedelta
 import os
 import uuid
-from typing import Optional
+import json
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Optional, List
+from pydantic import ValidationError
 from database import (
-    init_db, get_word_for_practice, save_practice, get_all_words, get_word_by_id,
+    get_word_for_practice, save_practice, get_all_words, get_word_by_id,
     update_word_on_success, get_words_for_today, add_word, update_word, delete_word,
     get_all_words_admin, get_practice_stats, get_word_accuracy, get_practice_trend,
     get_recent_drawings, reset_db_to_initial, create_user, get_user_by_email,
     verify_password, create_child, get_user_children, get_child_by_id, update_child,
     delete_child, get_words_for_child, update_word_on_success_for_child,
-    get_user_by_id
+    get_user_by_id, get_submitted_practices, save_practice_batch, build_due_queues, get_child_successful_days,
+    get_words_page, get_admin_words_page, get_practices_page, decode_page_cursor,
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, analytics_snapshot_stamp
 )
+import database
+
 from data_management import (
     cleanup_old_drawings, get_storage_stats, optimize_database, create_backup
 )
-from session import WordSession
+from session import begin_session, advance_session, record_session_results
+from word_import import import_words, detect_format, open_binary_as_text
+from cache import cached_json_response
+from fast_json import FastJSONResponse
+from export import stream_export, EXPORT_QUERIES, EXPORT_FORMATS
+from analytics import refresh_if_due
+from assets import AssetRegistry
 from auth import create_access_token, verify_token, get_user_id_from_token
 from models import (
     UserRegisterRequest, UserLoginRequest, UserResponse, TokenResponse,
-    ChildCreateRequest, ChildUpdateRequest, ChildResponse, AddWordRequest, PracticeRequest
+    ChildCreateRequest, ChildUpdateRequest, ChildResponse, AddWordRequest, PracticeRequest,
+    BatchPracticeRecord
 )
-from migrate import migrate_to_latest
+from workers import prepare_database, claim_background_jobs
+import profiler
+import metrics
+import grading
+import misspellings
+import stalls
+from profiler import query_stats, slow_queries, reset_query_stats
+
+# ===== PHASE 28: Application lifespan =====
+# Importing this module doesn't touch the database or read the frontend;
+# the schema check, asset loading and background jobs run here once the
+# server starts (with Fly auto-start, cold-start time is user-facing).
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Prepare the database and assets, start background jobs, stop them on shutdown"""
+    # Initialize database and run migrations (under a file lock, so several
+    # worker processes starting at once don't race - see workers.py)
+    prepare_database()
+    os.makedirs(drawings_dir, exist_ok=True)
+    # Fingerprint and compress frontend assets once, before the first request
+    static_assets.load()
+    
+    # Phase 32: every worker measures its own event loop
+    background_jobs = [asyncio.create_task(metrics.monitor_event_loop_lag())]
+    # Phase 33: debug mode - find the code behind event loop stalls
+    if stalls.STALL_DETECTOR_ENABLED:
+        stalls.start()
+    if claim_background_jobs():
+        background_jobs.append(asyncio.create_task(rebuild_due_queues_nightly()))
+        if database.ANALYTICS_MODE:
+            background_jobs.append(asyncio.create_task(refresh_analytics_snapshot_periodically()))
+    
+    yield
+    
+    for job in background_jobs:
+        job.cancel()
+    stalls.stop()
 
-app = FastAPI()
+app = FastAPI(default_response_class=FastJSONResponse, lifespan=lifespan)
 
 # Enable CORS
 app.add_middleware(
@@ -48,13 +100,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize database
-init_db()
-# Run migrations
-migrate_to_latest()
+# Phase 32: request latency / in-flight metrics for /metrics (outermost, so it times everything)
+app.add_middleware(metrics.MetricsMiddleware)
+if stalls.STALL_DETECTOR_ENABLED:
+    app.add_middleware(stalls.StallMiddleware)
+
+# ===== PHASE 16: Nightly due-queue build =====
+
+async def rebuild_due_queues_nightly():
+    """Rebuild every child's due queue shortly after each local midnight"""
+    while True:
+        now = datetime.now()
+        next_midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        await asyncio.sleep((next_midnight - now).total_seconds() + 1)
+        try:
+            built = await asyncio.get_running_loop().run_in_executor(None, build_due_queues)
+            print(f"✓ Rebuilt {built} due queue(s) for {date.today().isoformat()}")
+        except Exception as e:
+            print(f"Due queue rebuild failed: {e}")
 
-# Global session state (per client session)
-current_session = None
+# ===== PHASE 25: Analytics snapshot refresh =====
+
+async def refresh_analytics_snapshot_periodically():
+    """Keep the dashboard's analytics snapshot fresh (ANALYTICS_MODE=1 only)"""
+    while True:
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, refresh_if_due)
+        except Exception as e:
+            print(f"Analytics snapshot refresh failed: {e}")
+        await asyncio.sleep(60)
 
 # Determine if running in Docker/production
 import sys
@@ -64,53 +138,56 @@ BASE_DIR = '/app' if IS_DOCKER else os.path.dirname(os.path.dirname(os.path.absp
 # Serve frontend files
 frontend_dir = os.path.join(BASE_DIR, 'frontend')
 
-# Serve drawings
-drawings_dir = os.path.join(BASE_DIR, 'data', 'drawings')
-os.makedirs(drawings_dir, exist_ok=True)
-app.mount("/drawings", StaticFiles(directory=drawings_dir), name="drawings")
+# Serve drawings (DRAWINGS_DIR lets load tests keep theirs out of data/)
+drawings_dir = os.getenv('DRAWINGS_DIR') or os.path.join(BASE_DIR, 'data', 'drawings')
+app.mount("/drawings", StaticFiles(directory=drawings_dir, check_dir=False), name="drawings")
 
-# Serve static frontend files (CSS, JS, images)
-# This works identically in both local dev and production (Fly.io)
-app.mount("/static", StaticFiles(directory=frontend_dir), name="static")
+# Serve static frontend files (CSS, JS, images) from memory, precompressed
+# and fingerprinted (see assets.py). This works identically in both local
+# dev and production (Fly.io); restart the server to pick up frontend edits.
+# Compressed copies are cached in data/asset_cache between restarts.
+static_assets = AssetRegistry(frontend_dir, cache_dir=os.path.join(BASE_DIR, 'data', 'asset_cache'))
 
-# Serve root and frontend pages
-from fastapi.responses import FileResponse
+@app.api_route("/static/{path:path}", methods=["GET", "HEAD"])
+async def static_file(path: str, request: Request):
+    """Serve a frontend asset (immutable when requested by fingerprinted URL)"""
+    return static_assets.response(request, path)
 
-# Define specific routes for HTML pages  
-@app.get("/")
-async def root():
+# Define specific routes for HTML pages
+@app.api_route("/", methods=["GET", "HEAD"])
+async def root(request: Request):
     """Serve main app page"""
-    return FileResponse(os.path.join(frontend_dir, "index.html"), media_type="text/html")
+    return static_assets.response(request, "index.html")
 
-@app.get("/admin")
-async def admin():
+@app.api_route("/admin", methods=["GET", "HEAD"])
+async def admin(request: Request):
     """Serve admin page"""
-    return FileResponse(os.path.join(frontend_dir, "admin.html"), media_type="text/html")
+    return static_assets.response(request, "admin.html")
 
-@app.get("/dashboard")
-async def dashboard():
+@app.api_route("/dashboard", methods=["GET", "HEAD"])
+async def dashboard(request: Request):
     """Serve dashboard page"""
-    return FileResponse(os.path.join(frontend_dir, "dashboard.html"), media_type="text/html")
+    return static_assets.response(request, "dashboard.html")
 
-@app.get("/login")
-async def login_page():
+@app.api_route("/login", methods=["GET", "HEAD"])
+async def login_page(request: Request):
     """Serve login page"""
-    return FileResponse(os.path.join(frontend_dir, "login.html"), media_type="text/html")
+    return static_assets.response(request, "login.html")
 
-@app.get("/register")
-async def register_page():
+@app.api_route("/register", methods=["GET", "HEAD"])
+async def register_page(request: Request):
     """Serve register page"""
-    return FileResponse(os.path.join(frontend_dir, "register.html"), media_type="text/html")
+    return static_assets.response(request, "register.html")
 
-@app.get("/select-child")
-async def select_child_page():
+@app.api_route("/select-child", methods=["GET", "HEAD"])
+async def select_child_page(request: Request):
     """Serve child selector page"""
-    return FileResponse(os.path.join(frontend_dir, "select-child.html"), media_type="text/html")
+    return static_assets.response(request, "select-child.html")
 
-@app.get("/user-profile")
-async def user_profile_page():
+@app.api_route("/user-profile", methods=["GET", "HEAD"])
+async def user_profile_page(request: Request):
     """Serve user profile page"""
-    return FileResponse(os.path.join(frontend_dir, "user-profile.html"), media_type="text/html")
+    return static_assets.response(request, "user-profile.html")
 
 # Request/Response models
 class WordResponse(BaseModel):
@@ -123,6 +200,9 @@ class PracticeResponse(BaseModel):
     success: bool
     message: str
     drawing_filename: str
+    # Phase 37: the server's grade of the answer
+    is_correct: bool
+    errors: List[dict] = []
 
 # ===== PHASE 12: Auth Dependencies =====
 
@@ -164,6 +244,11 @@ async def health_check():
     """Check if API is running"""
     return {"status": "ok"}
 
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Phase 32: This worker's metrics in the Prometheus text format (see metrics.py)"""
+    return Response(metrics.collect(), media_type=metrics.CONTENT_TYPE)
+
 # ===== PHASE 12: Authentication Endpoints =====
 
 @app.post("/api/auth/register", response_model=UserResponse)
@@ -219,7 +304,7 @@ async def create_child_profile(
 async def list_children(user_id: int = Depends(get_current_user)):
     """Get all children for logged-in user"""
     children = get_user_children(user_id)
-    return JSONResponse(content=children)
+    return FastJSONResponse(content=children)
 
 @app.put("/api/children/{child_id}", response_model=ChildResponse)
 async def update_child_profile(
@@ -255,21 +340,58 @@ async def delete_child_profile(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/children/{child_id}/confusions")
+async def get_child_confusions(
+    child_id: int,
+    limit: int = 10,
+    user_id: int = Depends(get_current_user)
+):
+    """Phase 38: A child's most frequent letter confusions and the full confusion matrices"""
+    await verify_child_ownership(child_id, user_id)
+    return FastJSONResponse(content=misspellings.child_confusions(child_id, limit))
+
+def decode_cursor_param(cursor: Optional[str]):
+    """Phase 22: Decode a ?cursor= query parameter (400 if malformed)"""
+    if not cursor:
+        return None
+    try:
+        return decode_page_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def wants_page(limit: Optional[int], cursor: Optional[str]) -> bool:
+    """Phase 22: Word lists are paged only when the client asks with ?limit= or ?cursor="""
+    return limit is not None or bool(cursor)
+
 @app.get("/api/words")
-async def get_words():
-    """Get all words"""
-    words = get_all_words()
-    return {"words": words}
+async def get_words(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
+):
+    """
+    Get all words
+    Phase 22: ?limit= (and ?cursor=next_cursor for later pages) returns one
+    keyset page instead; without either the whole list comes back as before
+    """
+    after = decode_cursor_param(cursor)
+
+    def build():
+        if not wants_page(limit, cursor):
+            return {"words": get_all_words()}
+        words, next_cursor = get_words_page(limit or DEFAULT_PAGE_SIZE, after)
+        return {"words": words, "next_cursor": next_cursor}
+
+    return cached_json_response(request, ['words'], build)
 
 @app.get("/api/words-for-today")
-async def get_todays_words():
+async def get_todays_words(request: Request):
     """
     Phase 4: Get all words ready for practice today
     Returns words where next_review <= today
     Useful for dashboard/tracking what needs to be practiced
     """
-    words = get_words_for_today()
-    return {"words": words}
+    return cached_json_response(request, ['words'], lambda: {"words": get_words_for_today()})
 
 @app.post("/api/session/start")
 async def start_session(
@@ -288,14 +410,9 @@ async def start_session(
     Returns:
         Session info and first word, or completion status if all words done
     """
-    global current_session
-    
     try:
-        # Create new session with child_id
-        current_session = WordSession(num_words=num_words, child_id=child_id)
-        
-        # Get first word
-        word_id = current_session.get_next_word_id()
+        # Create (and save) a new session for this child, with its first word
+        session, word_id = begin_session(child_id, num_words)
         
         if not word_id:
             # All words completed for today - return completion status instead of error
@@ -315,22 +432,10 @@ async def start_session(
     if not word:
         raise HTTPException(status_code=404, detail="Word not found")
     
-    # Get word record for successful_days from child_progress (per-child tracking)
-    from database import get_db
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT successful_days
-        FROM child_progress
-        WHERE word_id = ? AND child_id = ?
-    """, (word_id, child_id))
-    word_data = cursor.fetchone()
-    conn.close()
+    # successful_days from child_progress (per-child tracking; 0 if not practiced yet)
+    successful_days = get_child_successful_days(child_id, word_id)
     
-    # If no record in child_progress, this child hasn't practiced this word yet
-    successful_days = word_data[0] if word_data else 0
-    
-    stats = current_session.get_session_stats()
+    stats = session.get_session_stats()
     
     return {
         "id": word_id,
@@ -348,15 +453,16 @@ async def next_word(child_id: int = Query(...), user_id: int = Depends(get_curre
     Returns only words where next_review <= today
     Includes successful_days to determine mode (Learning vs Recall)
     """
-    global current_session
-    
     # Verify child belongs to this user
     child = get_child_by_id(child_id)
     if not child or child['user_id'] != user_id:
         raise HTTPException(status_code=403, detail="Unauthorized access to this child")
     
+    # Get next word from this child's saved session queue
+    session, word_id = advance_session(child_id)
+    
     # If no session active, get next available word for this child
-    if not current_session or not current_session.session_started:
+    if session is None:
         words = get_words_for_child(child_id)
         if words:
             # Get first word from the list
@@ -370,9 +476,6 @@ async def next_word(child_id: int = Query(...), user_id: int = Depends(get_curre
             }
         raise HTTPException(status_code=404, detail="No words available")
     
-    # Get next word from session queue
-    word_id = current_session.get_next_word_id()
-    
     if not word_id:
         raise HTTPException(status_code=404, detail="Session complete - all words mastered")
     
@@ -380,22 +483,10 @@ async def next_word(child_id: int = Query(...), user_id: int = Depends(get_curre
     if not word:
         raise HTTPException(status_code=404, detail="Word not found")
     
-    # Get word record for successful_days from child_progress (per-child tracking)
-    from database import get_db
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT successful_days
-        FROM child_progress
-        WHERE word_id = ? AND child_id = ?
-    """, (word_id, child_id))
-    word_data = cursor.fetchone()
-    conn.close()
-    
-    # If no record in child_progress, this child hasn't practiced this word yet
-    successful_days = word_data[0] if word_data else 0
+    # successful_days from child_progress (per-child tracking; 0 if not practiced yet)
+    successful_days = get_child_successful_days(child_id, word_id)
     
-    stats = current_session.get_session_stats()
+    stats = session.get_session_stats()
     
     return {
         "id": word_id,
@@ -410,19 +501,17 @@ async def submit_practice(
     word_id: int = Form(...),
     spelled_word: str = Form(...),
     drawing: UploadFile = File(...),
-    is_correct: str = Form(...),
+    is_correct: Optional[str] = Form(None),
     child_id: int = Form(...),
     user_id: int = Depends(get_current_user)
 ):
     """
     Phase 12: Submit practice - save drawing + spelling (requires authentication)
+    Phase 37: The server grades spelled_word against the word; a client's
+    is_correct is accepted for compatibility but ignored
     """
-    global current_session
-    
     try:
-        # Save drawing file (use absolute path)
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        drawings_dir = os.path.join(base_dir, "data", "drawings")
+        # Save drawing file
         os.makedirs(drawings_dir, exist_ok=True)
         
         filename = f"{uuid.uuid4()}.png"
@@ -431,21 +520,18 @@ async def submit_practice(
         contents = await drawing.read()
         with open(filepath, "wb") as f:
             f.write(contents)
+        metrics.add_drawing_bytes(len(contents))
         
         # Save practice record
         word_data = get_word_by_id(word_id)
         if word_data:
-            # Convert string 'true'/'false' to boolean
-            is_correct_bool = is_correct.lower() == 'true'
+            result = grading.grade(word_data[0], spelled_word)
+            is_correct_bool = result['is_correct']
             
             save_practice(word_id, child_id, spelled_word, is_correct_bool, filename)
             
-            # Update session queue if active
-            if current_session and current_session.session_started:
-                if is_correct_bool:
-                    current_session.mark_word_mastered(word_id)
-                else:
-                    current_session.mark_word_incorrect(word_id)
+            # Update this child's session queue if one is active
+            record_session_results(child_id, [(word_id, is_correct_bool)])
             
             # Update word progress if correct (per-child tracking)
             if is_correct_bool:
@@ -456,7 +542,9 @@ async def submit_practice(
         return PracticeResponse(
             success=True,
             message="Practice saved",
-            drawing_filename=filename
+            drawing_filename=filename,
+            is_correct=is_correct_bool,
+            errors=result['errors']
         )
     
     except Exception as e:
@@ -464,6 +552,131 @@ async def submit_practice(
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+# Max practices accepted in one batch upload
+MAX_PRACTICE_BATCH_SIZE = 100
+
+@app.post("/api/practice/batch")
+async def submit_practice_batch(
+    records: str = Form(...),
+    drawings: List[UploadFile] = File(None),
+    user_id: int = Depends(get_current_user)
+):
+    """
+    Phase 14: Submit many practices in one request (offline / queued clients)
+    
+    Form fields:
+        records: JSON list of {idempotency_key, word_id, child_id, spelled_word,
+                 is_correct, drawing}
+        drawings: PNG uploads; each record's 'drawing' names its upload's filename
+    
+    All records are applied in a single transaction. Records whose idempotency_key
+    was already submitted are reported as 'duplicate' and not saved again, so a
+    client can retry the whole batch after a dropped connection.
+    """
+    # Parse and validate records
+    try:
+        raw_records = json.loads(records)
+        if not isinstance(raw_records, list):
+            raise ValueError("records must be a JSON list")
+        batch = [BatchPracticeRecord(**r) for r in raw_records]
+    except (ValueError, TypeError, ValidationError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid records: {e}")
+    
+    if not batch:
+        raise HTTPException(status_code=400, detail="No records submitted")
+    if len(batch) > MAX_PRACTICE_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch too large: max {MAX_PRACTICE_BATCH_SIZE} records"
+        )
+    
+    # Verify every child belongs to this user and every word exists
+    for child_id in {r.child_id for r in batch}:
+        await verify_child_ownership(child_id, user_id)
+    words = {}
+    for word_id in {r.word_id for r in batch}:
+        word = get_word_by_id(word_id)
+        if not word:
+            raise HTTPException(status_code=404, detail=f"Word {word_id} not found")
+        words[word_id] = word[0]
+    
+    uploads = {d.filename: d for d in (drawings or []) if d and d.filename}
+    for r in batch:
+        if r.drawing and r.drawing not in uploads:
+            raise HTTPException(status_code=400, detail=f"Missing drawing upload '{r.drawing}'")
+    
+    # Skip drawings for records already applied by an earlier attempt
+    already_submitted = get_submitted_practices(user_id, {r.idempotency_key for r in batch})
+    
+    os.makedirs(drawings_dir, exist_ok=True)
+    
+    pending = []
+    written_files = []
+    seen_keys = set()
+    try:
+        for r in batch:
+            record = {
+                'idempotency_key': r.idempotency_key,
+                'word_id': r.word_id,
+                'child_id': r.child_id,
+                'spelled_word': r.spelled_word,
+                # Phase 37: graded here, not taken from the client
+                'is_correct': grading.is_correct(words[r.word_id], r.spelled_word),
+                'drawing_filename': None
+            }
+            
+            if r.drawing and r.idempotency_key not in already_submitted and r.idempotency_key not in seen_keys:
+                filename = f"{uuid.uuid4()}.png"
+                contents = await uploads[r.drawing].read()
+                await uploads[r.drawing].seek(0)
+                with open(os.path.join(drawings_dir, filename), "wb") as f:
+                    f.write(contents)
+                metrics.add_drawing_bytes(len(contents))
+                written_files.append(filename)
+                record['drawing_filename'] = filename
+            
+            seen_keys.add(r.idempotency_key)
+            pending.append(record)
+        
+        results = save_practice_batch(user_id, pending)
+    except Exception as e:
+        # Nothing was committed - drop the drawings written for this attempt
+        for filename in written_files:
+            try:
+                os.remove(os.path.join(drawings_dir, filename))
+            except OSError:
+                pass
+        if isinstance(e, ValueError):
+            raise HTTPException(status_code=400, detail=str(e))
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    # Drawings for in-batch duplicate keys were never used
+    used_files = {rec['drawing_filename'] for rec, res in zip(pending, results) if res['status'] == 'applied'}
+    for filename in written_files:
+        if filename not in used_files:
+            try:
+                os.remove(os.path.join(drawings_dir, filename))
+            except OSError:
+                pass
+    
+    # Update each child's session queue for newly applied practices
+    session_results = {}
+    for rec, res in zip(pending, results):
+        if res['status'] == 'applied':
+            session_results.setdefault(rec['child_id'], []).append((rec['word_id'], rec['is_correct']))
+    for child_id, child_results in session_results.items():
+        record_session_results(child_id, child_results)
+    
+    applied = sum(1 for res in results if res['status'] == 'applied')
+    return {
+        "success": True,
+        "applied": applied,
+        "duplicates": len(results) - applied,
+        "results": results
+    }
+
 @app.post("/api/admin/words")
 async def admin_add_word(
     word: str = Form(...),
@@ -497,6 +710,30 @@ async def admin_add_word(
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/admin/words/import")
+async def admin_import_words(
+    file: UploadFile = File(...),
+    format: str = Form(None),
+    default_category: str = Form(None)
+):
+    """
+    Phase 15: Admin endpoint to bulk import a CSV / JSON word list
+    Returns counts plus a per-row error list for rows that were not imported
+    """
+    fmt = format or detect_format(file.filename)
+    if fmt not in ('csv', 'json', 'jsonl'):
+        raise HTTPException(status_code=400, detail=f"Unsupported format '{fmt}'")
+    
+    try:
+        report = import_words(open_binary_as_text(file.file), fmt, default_category=default_category)
+        return {"success": True, **report}
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=f"Could not read word list: {e}")
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.put("/api/admin/words/{word_id}")
 async def admin_update_word(
     word_id: int,
@@ -549,60 +786,131 @@ async def admin_delete_word(word_id: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/admin/words")
-async def admin_get_words():
-    """Phase 5: Admin endpoint to get all words with details"""
+async def admin_get_words(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
+):
+    """
+    Phase 5: Admin endpoint to get all words with details
+    Phase 22: ?limit= / ?cursor= page newest first; follow next_cursor for more
+    """
+    after = decode_cursor_param(cursor)
+
+    def build():
+        if not wants_page(limit, cursor):
+            return {"words": get_all_words_admin()}
+        words, next_cursor = get_admin_words_page(limit or DEFAULT_PAGE_SIZE, after)
+        return {"words": words, "next_cursor": next_cursor}
+
+    try:
+        return cached_json_response(request, ['words'], build)
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/admin/words/{word_id}/practices")
+async def admin_get_word_practices(
+    word_id: int,
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
+):
+    """Phase 22: Practice history for a word, newest first, one page at a time"""
+    after = decode_cursor_param(cursor)
+
+    def build():
+        practices, next_cursor = get_practices_page(word_id, limit, after)
+        return {"practices": practices, "next_cursor": next_cursor}
+
     try:
-        words = get_all_words_admin()
-        return {"words": words}
+        return cached_json_response(request, ['practices'], build)
     except Exception as e:
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/dashboard/stats")
-async def dashboard_stats():
+async def dashboard_stats(request: Request):
     """Phase 6: Get overall practice statistics"""
     try:
-        stats = get_practice_stats()
-        return stats
+        return cached_json_response(request, ['practices'], get_practice_stats, analytics_snapshot_stamp())
     except Exception as e:
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/dashboard/word-accuracy")
-async def dashboard_word_accuracy():
+async def dashboard_word_accuracy(request: Request):
     """Phase 6: Get accuracy per word"""
     try:
-        words = get_word_accuracy()
-        return {"words": words}
+        return cached_json_response(
+            request, ['words', 'practices'], lambda: {"words": get_word_accuracy()}, analytics_snapshot_stamp()
+        )
     except Exception as e:
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/dashboard/trend")
-async def dashboard_trend(days: int = 7):
+async def dashboard_trend(request: Request, days: int = 7):
     """Phase 6: Get practice trend"""
     try:
-        trend = get_practice_trend(days)
-        return {"trend": trend}
+        return cached_json_response(
+            request, ['practices'], lambda: {"trend": get_practice_trend(days)}, analytics_snapshot_stamp()
+        )
     except Exception as e:
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/dashboard/drawings")
-async def dashboard_drawings(limit: int = 20):
+async def dashboard_drawings(request: Request, limit: int = 20):
     """Phase 6: Get recent drawings"""
     try:
-        drawings = get_recent_drawings(limit)
-        return {"drawings": drawings}
+        return cached_json_response(request, ['words', 'practices'], lambda: {"drawings": get_recent_drawings(limit)})
     except Exception as e:
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/dashboard/misspellings")
+async def dashboard_misspellings(request: Request, limit: int = 20, per_word: int = 5):
+    """Phase 38: Most misspelled words and how they were misspelled (from the misspelling index)"""
+    try:
+        return cached_json_response(
+            request, ['words', 'practices'],
+            lambda: {"words": misspellings.common_misspellings(limit, per_word)}
+        )
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/export/{dataset}")
+async def export_data(
+    dataset: str,
+    format: str = Query('ndjson'),
+    user_id: int = Depends(get_current_user)
+):
+    """
+    Phase 23: Stream the logged-in family's practices, child_progress or words
+    as NDJSON or CSV. Rows are read in small chunks, so memory use is flat
+    and writers are never blocked by a slow download.
+    """
+    if dataset not in EXPORT_QUERIES:
+        raise HTTPException(status_code=404, detail=f"Unknown export '{dataset}'")
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format '{format}'")
+
+    filename = f"{dataset}-{date.today().isoformat()}.{format}"
+    return StreamingResponse(
+        stream_export(dataset, user_id, format),
+        media_type=EXPORT_FORMATS[format],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
 @app.get("/api/data/storage-stats")
 async def get_storage():
     """Phase 7: Get storage statistics"""
@@ -653,6 +961,48 @@ async def backup_data():
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/data/regrade")
+async def regrade_data(dry_run: bool = False):
+    """Phase 37: Re-grade practice history on the server (dry_run only counts)"""
+    try:
+        result = grading.regrade_practices(dry_run=dry_run)
+        return {"success": True, "dry_run": dry_run, **result}
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/admin/query-stats")
+async def admin_query_stats(reset: bool = False):
+    """
+    Phase 30: Executions and timings per registered statement in this
+    worker process, most total time first; reset=true starts a new window
+    Phase 31: Latency histogram, percentiles, rows and callers per statement
+    """
+    stats = query_stats()
+    if reset:
+        reset_query_stats()
+    return {"pid": os.getpid(), "statements": stats}
+
+@app.get("/api/admin/slow-queries")
+async def admin_slow_queries():
+    """Phase 31: Recent statements over SLOW_QUERY_MS with their query plans, newest first"""
+    return {"pid": os.getpid(), "threshold_ms": profiler.SLOW_QUERY_MS, "queries": slow_queries()}
+
+@app.get("/api/admin/stalls")
+async def admin_stalls(reset: bool = False):
+    """
+    Phase 33: Event loop stalls per endpoint with the blocking call sites,
+    worst first (only while STALL_DETECTOR=1)
+    """
+    detector = stalls.detector
+    if detector is None:
+        return {"enabled": False, "pid": os.getpid(), "endpoints": []}
+    report = detector.report()
+    if reset:
+        detector.reset()
+    return {"enabled": True, "pid": os.getpid(), "threshold_ms": detector.threshold * 1000, "endpoints": report}
+
 @app.post("/api/admin/reset-db")
 async def reset_database():
     """Reset database to original state with only 3 initial words"""
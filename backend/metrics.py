@@ -0,0 +1,200 @@
+"""
+Phase 32: Prometheus metrics
+GET /metrics serves these in the Prometheus text format (0.0.4), written
+here without a client library:
+- http_request_duration_seconds: latency histogram per method and route
+  template (/api/children/{child_id}, not the filled-in path)
+- http_requests_total: requests per method, route and status
+- http_requests_in_flight
+- event_loop_lag_seconds: how late a periodic wakeup of the event loop was
+- db_pool_*: database.connect_db pool utilization
+- practice_sessions: saved practice sessions (the session registry)
+- drawing_bytes_written_total
+
+With several workers each process keeps its own numbers and a scrape is
+answered by whichever worker gets it; the pid label tells them apart.
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+
+import database
+from profiler import Histogram
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS_SECONDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# Event loop lag buckets (seconds); the loop wakes up every LAG_INTERVAL_SECONDS
+LAG_BUCKETS_SECONDS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+LAG_INTERVAL_SECONDS = 0.5
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_lock = threading.Lock()
+# (method, route) -> Histogram
+_request_latency = {}
+# (method, route, status) -> count
+_request_counts = {}
+_in_flight = 0
+_event_loop_lag = Histogram(LAG_BUCKETS_SECONDS)
+_last_event_loop_lag = 0.0
+_drawing_bytes = 0
+_started_at = time.time()
+
+
+def observe_request(method: str, route: str, status: int, seconds: float):
+    """Record one finished request"""
+    with _lock:
+        histogram = _request_latency.get((method, route))
+        if histogram is None:
+            histogram = _request_latency[(method, route)] = Histogram(LATENCY_BUCKETS_SECONDS)
+        histogram.observe(seconds)
+        key = (method, route, status)
+        _request_counts[key] = _request_counts.get(key, 0) + 1
+
+
+def add_drawing_bytes(count: int):
+    """Count bytes of drawings written to disk"""
+    global _drawing_bytes
+    with _lock:
+        _drawing_bytes += count
+
+
+def _route_template(scope) -> str:
+    """Route path template for a handled request, so ids don't explode the label set"""
+    route = scope.get('route')
+    if route is not None:
+        return route.path
+    if scope.get('endpoint') is not None:
+        # A mount (e.g. /drawings) - label it by its prefix
+        return (scope.get('root_path') or '') + '/*'
+    return 'unmatched'
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing every HTTP request (streamed bodies included)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        global _in_flight
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+
+        status = 500
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        with _lock:
+            _in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            with _lock:
+                _in_flight -= 1
+            observe_request(scope['method'], _route_template(scope), status, time.perf_counter() - started)
+
+
+async def monitor_event_loop_lag(interval: float = LAG_INTERVAL_SECONDS):
+    """Sleep interval seconds in a loop and record how much later than that we woke up"""
+    global _last_event_loop_lag
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - started - interval)
+        with _lock:
+            _event_loop_lag.observe(lag)
+            _last_event_loop_lag = lag
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(**labels) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + '}'
+
+
+def _format_number(value) -> str:
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _histogram_lines(name: str, histogram: Histogram, **labels):
+    for bound, count in histogram.cumulative():
+        yield f"{name}_bucket{_labels(**labels, le=bound)} {count}"
+    yield f"{name}_sum{_labels(**labels)} {_format_number(histogram.sum)}"
+    yield f"{name}_count{_labels(**labels)} {histogram.count}"
+
+
+def render(pool=None, sessions=None) -> str:
+    """
+    All metrics in the Prometheus text format
+    pool: database.pool_stats(); sessions: saved session count (None = unavailable)
+    """
+    pid = os.getpid()
+    lines = []
+
+    def metric(name, kind, help_text):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    with _lock:
+        metric('http_request_duration_seconds', 'histogram', 'HTTP request latency by route template')
+        for (method, route), histogram in sorted(_request_latency.items()):
+            lines.extend(_histogram_lines('http_request_duration_seconds', histogram,
+                                          method=method, route=route, pid=pid))
+
+        metric('http_requests_total', 'counter', 'HTTP requests by route template and status')
+        for (method, route, status), count in sorted(_request_counts.items()):
+            lines.append(f"http_requests_total{_labels(method=method, route=route, status=status, pid=pid)} {count}")
+
+        metric('http_requests_in_flight', 'gauge', 'HTTP requests being handled')
+        lines.append(f"http_requests_in_flight{_labels(pid=pid)} {_in_flight}")
+
+        metric('event_loop_lag_seconds', 'histogram',
+               f'Delay of the event loop waking up from a {LAG_INTERVAL_SECONDS}s sleep')
+        lines.extend(_histogram_lines('event_loop_lag_seconds', _event_loop_lag, pid=pid))
+        metric('event_loop_lag_last_seconds', 'gauge', 'Most recent event loop lag measurement')
+        lines.append(f"event_loop_lag_last_seconds{_labels(pid=pid)} {_format_number(_last_event_loop_lag)}")
+
+        metric('drawing_bytes_written_total', 'counter', 'Bytes of drawings written to disk')
+        lines.append(f"drawing_bytes_written_total{_labels(pid=pid)} {_drawing_bytes}")
+
+    if pool is not None:
+        metric('db_pool_connections', 'gauge', 'Pooled database connections by state')
+        lines.append(f"db_pool_connections{_labels(state='in_use', pid=pid)} {pool['in_use']}")
+        lines.append(f"db_pool_connections{_labels(state='idle', pid=pid)} {pool['idle']}")
+        metric('db_pool_max_idle_per_file', 'gauge', 'Idle connections kept per database file')
+        lines.append(f"db_pool_max_idle_per_file{_labels(pid=pid)} {pool['max_idle_per_file']}")
+        metric('db_pool_checkouts_total', 'counter', 'Connection checkouts by whether a pooled connection was reused')
+        lines.append(f"db_pool_checkouts_total{_labels(result='reused', pid=pid)} {pool['reused']}")
+        lines.append(f"db_pool_checkouts_total{_labels(result='opened', pid=pid)} {pool['opened']}")
+
+    if sessions is not None:
+        metric('practice_sessions', 'gauge', 'Saved practice sessions (shared by all workers)')
+        lines.append(f"practice_sessions {sessions}")
+
+    metric('process_start_time_seconds', 'gauge', 'Start time of the process since the Unix epoch')
+    lines.append(f"process_start_time_seconds{_labels(pid=pid)} {_format_number(_started_at)}")
+
+    return '\n'.join(lines) + '\n'
+
+
+def collect() -> str:
+    """render() with the database's pool and session numbers"""
+    try:
+        sessions = database.count_session_states()
+    except sqlite3.Error:
+        # Before the schema exists
+        sessions = None
+    return render(database.pool_stats(), sessions)
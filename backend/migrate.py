@@ -1,167 +1,349 @@
 """
 Database migration system for schema updates
 Handles version tracking and incremental schema changes
+
+Phase 29: Versioned migration engine - the single source of truth for the
+schema (database.init_db delegates here)
+- migrations/NNNN_name.sql: schema changes, each applied in one transaction
+- migrations/NNNN_name.py: data migrations, up(conn, ctx); ctx.run_batches
+  copies in key ranges and commits after every batch, so a large backfill
+  never holds the write lock for long, and resumes where it stopped if the
+  process is interrupted
+- the sha256 of every applied migration file is recorded; a migration that
+  was edited after being applied raises MigrationError
+- PRAGMA user_version holds the latest version applied, so startup on an
+  up-to-date database is a single header read (checksums are verified
+  whenever migrations run and by `python migrate.py status`)
+
+Usage:
+    python migrate.py            # migrate the catalog and every shard
+    python migrate.py status
 """
 
-import sqlite3
-from datetime import date
+import hashlib
+import importlib.util
 import os
-from database import get_db, DB_PATH
-
-# Define migrations in order
-MIGRATIONS = {
-    1: {
-        "name": "initial_schema",
-        "description": "Create initial tables: users, children, words, practices",
-        "up": """
-            -- Users table - Parent/teacher accounts
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                email TEXT NOT NULL UNIQUE,
-                password_hash TEXT NOT NULL,
-                created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-            
-            -- Children table - Child profiles linked to users
-            CREATE TABLE IF NOT EXISTS children (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                name TEXT NOT NULL,
-                age INTEGER,
-                created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(id)
-            );
-            
-            -- Words table - Words to practice
-            CREATE TABLE IF NOT EXISTS words (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                word TEXT NOT NULL,
-                category TEXT NOT NULL,
-                successful_days INTEGER DEFAULT 0,
-                last_practiced DATE,
-                next_review DATE,
-                reference_image TEXT,
-                user_id INTEGER,
-                created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(id),
-                UNIQUE(word, user_id)
-            );
-            
-            -- Practices table - Practice records
-            CREATE TABLE IF NOT EXISTS practices (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                word_id INTEGER NOT NULL,
-                child_id INTEGER NOT NULL,
-                spelled_word TEXT NOT NULL,
-                is_correct BOOLEAN NOT NULL,
-                drawing_filename TEXT,
-                practiced_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (word_id) REFERENCES words(id),
-                FOREIGN KEY (child_id) REFERENCES children(id)
-            );
+import re
+import sqlite3
+
+import database
+import sharding
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+MIGRATION_FILE_PATTERN = re.compile(r'^(\d{4})_(\w+)\.(sql|py)$')
+
+# Rows per transaction for batched data migrations
+DATA_MIGRATION_BATCH_SIZE = 5000
+
+
+class MigrationError(Exception):
+    """A migration failed, or the recorded migrations don't match the files"""
+
+
+class Migration:
+    """One migration file"""
+
+    def __init__(self, path: str):
+        match = MIGRATION_FILE_PATTERN.match(os.path.basename(path))
+        self.version = int(match.group(1))
+        self.name = match.group(2)
+        self.kind = match.group(3)
+        self.path = path
+        with open(path, 'rb') as f:
+            self.source = f.read()
+        self.checksum = hashlib.sha256(self.source).hexdigest()
+        self.description = _first_comment_line(self.source.decode('utf-8'))
+
+
+def _first_comment_line(text: str) -> str:
+    """First non-empty line of the leading SQL comment or docstring"""
+    for line in text.splitlines():
+        line = line.strip().lstrip('-').strip().strip('"').strip()
+        if line:
+            return line
+    return ''
+
+
+class MigrationContext:
+    """What a Python migration gets besides its connection"""
+
+    def __init__(self, conn, migration: Migration, shard_index, batch_size: int):
+        self.conn = conn
+        self.migration = migration
+        self.shard_index = shard_index
+        self.catalog = shard_index is None
+        self.batch_size = batch_size
+
+    def run_batches(self, statement, table: str, key: str = 'id') -> int:
         """
-    }
-}
-
-def create_migrations_table():
-    """Create migrations tracking table"""
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute("""
+        Run statement over consecutive ranges of table.key, one transaction each
+
+        statement takes (after_key, up_to_key) parameters, or is a function
+        step(conn, after_key, up_to_key) returning rows changed, for work SQL
+        can't express; each range covers batch_size rows. The last finished
+        key is checkpointed in migration_progress with every batch, so a
+        rerun continues from there.
+
+        Returns: rows changed
+        """
+        conn = self.conn
+        version = self.migration.version
+        row = conn.execute("SELECT last_key FROM migration_progress WHERE version = ?", (version,)).fetchone()
+        last_key = row[0] if row else None
+        if last_key is None:
+            first = conn.execute(f"SELECT MIN({key}) FROM {table}").fetchone()[0]
+            if first is None:
+                return 0
+            last_key = first - 1
+
+        changed = 0
+        while True:
+            # Key of the batch_size-th row after last_key, or the last key there is
+            row = conn.execute(
+                f"SELECT {key} FROM {table} WHERE {key} > ? ORDER BY {key} LIMIT 1 OFFSET ?",
+                (last_key, self.batch_size - 1)
+            ).fetchone()
+            up_to = row[0] if row else conn.execute(f"SELECT MAX({key}) FROM {table}").fetchone()[0]
+            if up_to is None or up_to <= last_key:
+                return changed
+
+            if callable(statement):
+                changed += statement(conn, last_key, up_to)
+            else:
+                changed += max(conn.execute(statement, (last_key, up_to)).rowcount, 0)
+            conn.execute(
+                "INSERT OR REPLACE INTO migration_progress (version, last_key) VALUES (?, ?)",
+                (version, up_to)
+            )
+            conn.commit()
+            last_key = up_to
+
+
+_migrations = None
+
+
+def load_migrations():
+    """All migrations in version order (read once per process)"""
+    global _migrations
+    if _migrations is None:
+        migrations = sorted(
+            (Migration(os.path.join(MIGRATIONS_DIR, f))
+             for f in os.listdir(MIGRATIONS_DIR) if MIGRATION_FILE_PATTERN.match(f)),
+            key=lambda m: m.version
+        )
+        versions = [m.version for m in migrations]
+        if versions != list(range(1, len(migrations) + 1)):
+            raise MigrationError(f"Migration versions must be 1..N without gaps or duplicates, got {versions}")
+        _migrations = migrations
+    return _migrations
+
+
+def latest_version() -> int:
+    """Version of the newest migration"""
+    return load_migrations()[-1].version
+
+
+def get_version(path: str = None) -> int:
+    """PRAGMA user_version of a database file (0 if it doesn't exist yet)"""
+    path = path or database.DB_PATH
+    if not os.path.exists(path):
+        return 0
+    conn = database.connect_db(path)
+    try:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def create_migrations_table(conn):
+    """Create migrations tracking tables (adding checksums to pre-Phase 29 databases)"""
+    conn.execute("""
         CREATE TABLE IF NOT EXISTS schema_migrations (
             id INTEGER PRIMARY KEY,
             name TEXT NOT NULL UNIQUE,
             description TEXT,
-            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            checksum TEXT
         )
     """)
+    columns = {r[1] for r in conn.execute("PRAGMA table_info(schema_migrations)")}
+    if 'checksum' not in columns:
+        conn.execute("ALTER TABLE schema_migrations ADD COLUMN checksum TEXT")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS migration_progress (
+            version INTEGER PRIMARY KEY,
+            last_key INTEGER
+        )
+    """)
+    conn.commit()
+
+
+def get_applied_migrations(conn):
+    """{version: recorded checksum} of applied migrations"""
+    return {r[0]: r[1] for r in conn.execute("SELECT id, checksum FROM schema_migrations")}
+
+
+def verify_checksums(conn):
+    """
+    Compare recorded checksums with the migration files
+    Migrations recorded before checksums existed adopt the current one.
+    Raises MigrationError on a mismatch or on versions this code doesn't have.
+    """
+    migrations = {m.version: m for m in load_migrations()}
+    applied = get_applied_migrations(conn)
+
+    unknown = sorted(set(applied) - set(migrations))
+    if unknown:
+        raise MigrationError(f"Database has migration(s) {unknown} that this code doesn't know about")
+
+    for version, recorded in applied.items():
+        migration = migrations[version]
+        if recorded is None:
+            conn.execute("UPDATE schema_migrations SET checksum = ? WHERE id = ?", (migration.checksum, version))
+        elif recorded != migration.checksum:
+            raise MigrationError(
+                f"Migration {version} ({migration.name}) was changed after it was applied - "
+                f"add a new migration instead of editing {os.path.basename(migration.path)}"
+            )
     conn.commit()
-    conn.close()
-
-def get_applied_migrations():
-    """Get list of applied migrations"""
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute("SELECT id, name FROM schema_migrations ORDER BY id")
-    migrations = cursor.fetchall()
-    conn.close()
-    return {m[0]: m[1] for m in migrations}
-
-def apply_migration(migration_id: int, migration: dict) -> bool:
-    """Apply a single migration"""
-    conn = get_db()
-    cursor = conn.cursor()
-    
+    return applied
+
+
+def _load_module(migration: Migration):
+    spec = importlib.util.spec_from_file_location(f"migration_{migration.version:04d}", migration.path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def apply_migration(conn, migration: Migration, shard_index=None, batch_size: int = DATA_MIGRATION_BATCH_SIZE):
+    """Apply one migration and record it (with user_version) in the same transaction"""
     try:
-        # Execute migration SQL
-        cursor.executescript(migration["up"])
-        
-        # Track migration
-        cursor.execute(
-            "INSERT INTO schema_migrations (id, name, description) VALUES (?, ?, ?)",
-            (migration_id, migration["name"], migration["description"])
+        if migration.kind == 'sql':
+            conn.executescript("BEGIN;\n" + migration.source.decode('utf-8'))
+        else:
+            ctx = MigrationContext(conn, migration, shard_index, batch_size)
+            _load_module(migration).up(conn, ctx)
+            conn.execute("DELETE FROM migration_progress WHERE version = ?", (migration.version,))
+
+        conn.execute(
+            "INSERT INTO schema_migrations (id, name, description, checksum) VALUES (?, ?, ?, ?)",
+            (migration.version, migration.name, migration.description, migration.checksum)
         )
-        
+        conn.execute(f"PRAGMA user_version = {migration.version:d}")
         conn.commit()
-        conn.close()
-        return True
     except Exception as e:
         conn.rollback()
+        raise MigrationError(f"Migration {migration.version} ({migration.name}) failed: {e}") from e
+
+
+def migrate_database(path: str = None, shard_index=None, batch_size: int = DATA_MIGRATION_BATCH_SIZE,
+                     verbose: bool = False) -> int:
+    """
+    Bring one database file up to the latest version
+
+    Args:
+        path: database file (default: the catalog, database.DB_PATH)
+        shard_index: set when path is a shard
+        batch_size: rows per transaction for batched data migrations
+
+    Returns: number of migrations applied (0 = already current)
+    """
+    path = path or database.DB_PATH
+    latest = latest_version()
+    if get_version(path) == latest:
+        return 0
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if not os.path.exists(path):
+        # WAL files left by a deleted database would be replayed into the new one
+        for suffix in ('-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    conn = database.connect_db(path)
+    try:
+        create_migrations_table(conn)
+        applied = verify_checksums(conn)
+
+        count = 0
+        for migration in load_migrations():
+            if migration.version in applied:
+                continue
+            if verbose:
+                print(f"Applying migration {migration.version}: {migration.name}")
+            apply_migration(conn, migration, shard_index, batch_size)
+            count += 1
+
+        # Databases migrated before user_version was used already have everything
+        conn.execute(f"PRAGMA user_version = {latest:d}")
+        conn.commit()
+        return count
+    finally:
+        conn.close()
+
+
+def get_pending_migrations(path: str = None):
+    """Versions not applied to a database yet (none if its user_version is current)"""
+    path = path or database.DB_PATH
+    if get_version(path) == latest_version():
+        return []
+    if not os.path.exists(path):
+        return [m.version for m in load_migrations()]
+    conn = database.connect_db(path)
+    try:
+        try:
+            applied = {r[0] for r in conn.execute("SELECT id FROM schema_migrations")}
+        except sqlite3.OperationalError:
+            # Tracking table not created yet
+            applied = set()
+    finally:
         conn.close()
-        print(f"Migration {migration_id} failed: {e}")
-        return False
-
-def migrate_to_latest():
-    """Apply all pending migrations"""
-    create_migrations_table()
-    
-    applied = get_applied_migrations()
-    pending = [mid for mid in sorted(MIGRATIONS.keys()) if mid not in applied]
-    
-    if not pending:
-        print("✓ Database is up to date")
-        return True
-    
-    print(f"Found {len(pending)} pending migration(s)")
-    
-    for migration_id in pending:
-        migration = MIGRATIONS[migration_id]
-        print(f"Applying migration {migration_id}: {migration['name']}")
-        
-        if not apply_migration(migration_id, migration):
-            return False
-        
-        print(f"✓ Migration {migration_id} applied")
-    
-    print(f"✓ All {len(pending)} migration(s) applied successfully")
+    return [m.version for m in load_migrations() if m.version not in applied]
+
+
+def migrate_to_latest(verbose: bool = True):
+    """Apply all pending migrations to the catalog and every shard"""
+    applied = database.init_db()
+    if verbose:
+        print(f"✓ Applied {applied} migration(s)" if applied else "✓ Database is up to date")
     return True
 
-def get_migration_status():
-    """Get current migration status"""
-    create_migrations_table()
-    applied = get_applied_migrations()
-    
-    print("\n=== Database Migration Status ===\n")
-    
-    for mid in sorted(MIGRATIONS.keys()):
-        status = "✓ Applied" if mid in applied else "✗ Pending"
-        migration = MIGRATIONS[mid]
-        print(f"{status} | Migration {mid}: {migration['name']}")
-        print(f"       {migration['description']}\n")
-    
-    applied_count = len(applied)
-    total_count = len(MIGRATIONS)
-    print(f"Progress: {applied_count}/{total_count} migrations applied")
-    
-    return applied_count == total_count
+
+def get_migration_status(path: str = None):
+    """Print which migrations are applied to a database and whether their files changed"""
+    path = path or database.DB_PATH
+    print(f"\n=== Database Migration Status: {path} ===\n")
+
+    applied = {}
+    if os.path.exists(path):
+        conn = database.connect_db(path)
+        try:
+            create_migrations_table(conn)
+            applied = get_applied_migrations(conn)
+        finally:
+            conn.close()
+
+    migrations = load_migrations()
+    for migration in migrations:
+        if migration.version not in applied:
+            status = "✗ Pending"
+        elif applied[migration.version] not in (None, migration.checksum):
+            status = "✗ Changed"
+        else:
+            status = "✓ Applied"
+        print(f"{status} | Migration {migration.version}: {migration.name} ({migration.kind})")
+        print(f"       {migration.description}\n")
+
+    print(f"Progress: {len(applied)}/{len(migrations)} migrations applied, user_version {get_version(path)}")
+    return len(applied) == len(migrations)
+
 
 if __name__ == "__main__":
     import sys
-    
-    if len(sys.argv) > 1:
-        if sys.argv[1] == "status":
-            get_migration_status()
-        elif sys.argv[1] == "migrate":
-            migrate_to_latest()
+
+    if len(sys.argv) > 1 and sys.argv[1] == "status":
+        get_migration_status()
+        for index in range(sharding.SHARD_COUNT):
+            get_migration_status(sharding.shard_path(database.DB_PATH, index))
     else:
         migrate_to_latest()
@@ -0,0 +1,49 @@
+-- Create initial tables: users, children, words, practices
+
+-- Users table - Phase 12: Parent/teacher accounts
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    email TEXT NOT NULL UNIQUE,
+    password_hash TEXT NOT NULL,
+    created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Children table - Phase 12: Child profiles linked to users
+CREATE TABLE IF NOT EXISTS children (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    age INTEGER,
+    created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id)
+);
+
+-- Words table - Phase 4: Added successful_days, last_practiced, next_review
+-- Phase 5: Added reference_image
+-- Phase 12: Added user_id for family custom words (NULL = core/global)
+CREATE TABLE IF NOT EXISTS words (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    word TEXT NOT NULL,
+    category TEXT NOT NULL,
+    successful_days INTEGER DEFAULT 0,
+    last_practiced DATE,
+    next_review DATE,
+    reference_image TEXT,
+    user_id INTEGER,
+    created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id),
+    UNIQUE(word, user_id)
+);
+
+-- Practices table - Phase 12: Added child_id to tie practices to specific child
+CREATE TABLE IF NOT EXISTS practices (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    word_id INTEGER NOT NULL,
+    child_id INTEGER NOT NULL,
+    spelled_word TEXT NOT NULL,
+    is_correct BOOLEAN NOT NULL,
+    drawing_filename TEXT,
+    practiced_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (word_id) REFERENCES words(id),
+    FOREIGN KEY (child_id) REFERENCES children(id)
+);
@@ -0,0 +1,15 @@
+-- Phase 13: Per-child word progress tracking
+
+-- Tracks successful_days per child to fix multi-child isolation bug
+CREATE TABLE IF NOT EXISTS child_progress (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    child_id INTEGER NOT NULL,
+    word_id INTEGER NOT NULL,
+    successful_days INTEGER DEFAULT 0,
+    last_practiced DATE,
+    next_review DATE,
+    created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (child_id) REFERENCES children(id),
+    FOREIGN KEY (word_id) REFERENCES words(id),
+    UNIQUE(child_id, word_id)
+);
@@ -0,0 +1,12 @@
+-- Phase 14: Idempotency keys for batch practice uploads
+
+-- Lets offline clients retry a batch without recording the same answer twice
+CREATE TABLE IF NOT EXISTS practice_submissions (
+    user_id INTEGER NOT NULL,
+    idempotency_key TEXT NOT NULL,
+    practice_id INTEGER NOT NULL,
+    created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, idempotency_key),
+    FOREIGN KEY (user_id) REFERENCES users(id),
+    FOREIGN KEY (practice_id) REFERENCES practices(id)
+);
@@ -0,0 +1,19 @@
+-- Phase 16: Precomputed daily due list per child
+
+-- get_words_for_child reads today's rows instead of re-running the LEFT JOIN
+CREATE TABLE IF NOT EXISTS due_queue (
+    child_id INTEGER NOT NULL,
+    queue_date DATE NOT NULL,
+    word_id INTEGER NOT NULL,
+    successful_days INTEGER DEFAULT 0,
+    next_review DATE,
+    PRIMARY KEY (child_id, queue_date, word_id)
+) WITHOUT ROWID;
+
+-- Which child/day queues have been built
+CREATE TABLE IF NOT EXISTS due_queue_builds (
+    child_id INTEGER NOT NULL,
+    queue_date DATE NOT NULL,
+    built_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (child_id, queue_date)
+) WITHOUT ROWID;
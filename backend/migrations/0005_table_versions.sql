@@ -0,0 +1,11 @@
+-- Phase 19: Change counters for HTTP caching (ETags)
+
+-- Write functions bump a table's version in the same transaction as the change
+CREATE TABLE IF NOT EXISTS table_versions (
+    name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+);
+
+-- One row per database.VERSIONED_TABLES entry
+INSERT OR IGNORE INTO table_versions (name, version) VALUES
+    ('words', 0), ('practices', 0), ('child_progress', 0), ('children', 0);
@@ -0,0 +1,5 @@
+-- Phase 22: Keyset pagination indexes
+
+-- Pages seek on (sort column, id)
+CREATE INDEX IF NOT EXISTS idx_words_created_id ON words(created_date, id);
+CREATE INDEX IF NOT EXISTS idx_practices_word_date_id ON practices(word_id, practiced_date, id);
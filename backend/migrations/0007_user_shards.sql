@@ -0,0 +1,6 @@
+-- Phase 26: User -> shard assignments (only used in sharding mode)
+
+CREATE TABLE IF NOT EXISTS user_shards (
+    user_id INTEGER PRIMARY KEY,
+    shard INTEGER NOT NULL
+);
@@ -0,0 +1,9 @@
+-- Phase 27: Each child's in-progress practice session
+
+-- JSON session state, so every worker process sees the same session
+CREATE TABLE IF NOT EXISTS practice_sessions (
+    child_id INTEGER PRIMARY KEY,
+    state TEXT NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (child_id) REFERENCES children(id)
+);
@@ -0,0 +1,39 @@
+"""
+Phase 4: Seed the core words on a new catalog
+Phase 26: On a shard, start the AUTOINCREMENT counters at the shard's own
+id range instead (core words are copied in by database.sync_core_words)
+"""
+
+from datetime import date
+
+import sharding
+
+# (word, category) - Phase 12: core words have user_id = NULL
+CORE_WORDS = [
+    ("bee", "insects"),
+    ("spider", "insects"),
+    ("butterfly", "insects"),
+]
+
+
+def up(conn, ctx):
+    if ctx.shard_index is not None:
+        last_unused = sharding.id_range_start(ctx.shard_index) - 1
+        for table in sharding.SHARDED_ID_TABLES:
+            conn.execute(
+                "UPDATE sqlite_sequence SET seq = ? WHERE name = ? AND seq < ?",
+                (last_unused, table, last_unused)
+            )
+            conn.execute("""
+                INSERT INTO sqlite_sequence (name, seq)
+                SELECT ?, ? WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = ?)
+            """, (table, last_unused, table))
+        return
+
+    if conn.execute("SELECT COUNT(*) FROM words").fetchone()[0] == 0:
+        today = date.today().isoformat()
+        conn.executemany(
+            "INSERT INTO words (word, category, successful_days, last_practiced, next_review, user_id) "
+            "VALUES (?, ?, 0, NULL, ?, NULL)",
+            [(word, category, today) for word, category in CORE_WORDS]
+        )
@@ -0,0 +1,24 @@
+"""
+Backfill child_progress from the pre-Phase 13 progress stored on words
+
+Before Phase 13, progress lived on the word itself, so children who
+practiced back then have no child_progress rows. Copy the word's progress
+for every (child, word) pair with a correct practice but no row yet.
+Runs in id ranges over practices, one short write transaction per batch.
+"""
+
+from database import bump_table_versions
+
+
+def up(conn, ctx):
+    inserted = ctx.run_batches("""
+        INSERT OR IGNORE INTO child_progress (child_id, word_id, successful_days, last_practiced, next_review)
+        SELECT p.child_id, p.word_id, w.successful_days, w.last_practiced, w.next_review
+        FROM practices p
+        JOIN words w ON w.id = p.word_id
+        WHERE p.id > ? AND p.id <= ?
+        AND p.is_correct = 1 AND w.successful_days > 0
+        GROUP BY p.child_id, p.word_id
+    """, table='practices')
+    if inserted:
+        bump_table_versions(conn.cursor(), 'child_progress')
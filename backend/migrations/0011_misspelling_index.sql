@@ -0,0 +1,17 @@
+-- Phase 38: Misspelling index and per-child letter confusions
+
+-- How often each word was misspelled each way (answers normalized by grading.py)
+CREATE TABLE IF NOT EXISTS word_misspellings (
+    word_id INTEGER NOT NULL,
+    spelled_word TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (word_id, spelled_word)
+) WITHOUT ROWID;
+
+-- Each child's letter confusion counters, a flat uint32 array (see misspellings.ConfusionMatrix)
+CREATE TABLE IF NOT EXISTS child_confusions (
+    child_id INTEGER PRIMARY KEY,
+    misspelled INTEGER NOT NULL DEFAULT 0,
+    counts BLOB NOT NULL,
+    FOREIGN KEY (child_id) REFERENCES children(id)
+);
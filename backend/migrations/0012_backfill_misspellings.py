@@ -0,0 +1,12 @@
+"""
+Phase 38: Build the misspelling index and confusion counters from the practices recorded so far
+
+The tables are new (0011) and start empty. Runs in id ranges over
+practices, one short write transaction per batch.
+"""
+
+import misspellings
+
+
+def up(conn, ctx):
+    ctx.run_batches(misspellings.count_practices, table='practices')
@@ -0,0 +1,296 @@
+"""
+Phase 38: Misspelling analytics
+practices.spelled_word used to be stored and never looked at. Every
+wrong answer now also updates, in the same transaction as its INSERT:
+
+- word_misspellings: how often each word was misspelled each way
+  ('butterfly' -> 'buterfly' x12), so the dashboard lists the common
+  misspellings of the hardest words
+- child_confusions: each child's letter confusions as one flat uint32
+  array (ConfusionMatrix) - which letter was written for which, which
+  were left out or added, and which adjacent pairs were swapped ('ie'
+  written 'ei')
+
+The errors come from grading.py. Dashboards read these counters instead
+of scanning practices. Deleting a word or a child subtracts its
+practices again, renaming a word re-grades them, and rebuild() recomputes everything from practices
+(run by migration 0012, or python misspellings.py rebuild).
+"""
+
+from array import array
+
+import grading
+import queries
+
+ALPHABET = 'abcdefghijklmnopqrstuvwxyz'
+# Slot 0 is the gap (the other side of an omission / insertion), the last one any other character
+LETTERS = [''] + list(ALPHABET) + ['?']
+SIZE = len(LETTERS)
+GAP, OTHER = 0, SIZE - 1
+CELLS = SIZE * SIZE
+
+# Practices read and folded into the tables per transaction by rebuild()
+REBUILD_CHUNK_SIZE = 50000
+
+
+def _slot(char: str) -> int:
+    if not char:
+        return GAP
+    index = ord(char) - 97
+    return index + 1 if 0 <= index < 26 else OTHER
+
+
+def _cells(ops):
+    """ConfusionMatrix cell of each grading error"""
+    for error_type, _, expected, spelled in ops:
+        if error_type == 'transposition':
+            yield CELLS + _slot(expected[0]) * SIZE + _slot(expected[1])
+        else:
+            yield _slot(expected) * SIZE + _slot(spelled)
+
+
+class ConfusionMatrix:
+    """
+    One child's letter confusion counters in a flat array('I')
+
+    edits[expected][spelled]: substitutions, with GAP as spelled for an
+    omission and as expected for an insertion
+    swaps[first][second]: 'first second' written 'second first'
+    """
+
+    CELLS = CELLS
+
+    def __init__(self, data: bytes = None):
+        self.counts = array('I')
+        if data:
+            self.counts.frombytes(data)
+        else:
+            self.counts.extend(bytes(2 * self.CELLS))
+
+    def to_bytes(self) -> bytes:
+        return self.counts.tobytes()
+
+    def add(self, ops, sign: int = 1):
+        """Count grading errors (tuples of type, position, expected, spelled); sign=-1 takes them back"""
+        counts = self.counts
+        for cell in _cells(ops):
+            counts[cell] = max(0, counts[cell] + sign)
+
+    def add_counts(self, cell_counts):
+        """Add {cell: count} totals, as collected by _fold()"""
+        counts = self.counts
+        for cell, count in cell_counts.items():
+            counts[cell] += count
+
+    def top(self, limit: int = 10):
+        """Most frequent confusions: [{'type', 'expected', 'spelled', 'count'}]"""
+        cells = sorted((i for i, n in enumerate(self.counts) if n), key=lambda i: -self.counts[i])[:limit]
+        result = []
+        for cell in cells:
+            table, offset = divmod(cell, self.CELLS)
+            row, col = divmod(offset, SIZE)
+            expected, spelled = LETTERS[row], LETTERS[col]
+            if table:
+                error_type, expected, spelled = 'transposition', expected + spelled, spelled + expected
+            elif row == GAP:
+                error_type = 'insertion'
+            elif col == GAP:
+                error_type = 'omission'
+            else:
+                error_type = 'substitution'
+            result.append({'type': error_type, 'expected': expected, 'spelled': spelled, 'count': self.counts[cell]})
+        return result
+
+    def matrices(self):
+        """{'letters', 'edits', 'swaps'} as nested lists, rows = expected letter"""
+        rows = [self.counts[i:i + SIZE].tolist() for i in range(0, 2 * self.CELLS, SIZE)]
+        return {'letters': LETTERS, 'edits': rows[:SIZE], 'swaps': rows[SIZE:]}
+
+
+def _apply(cursor, child_id: int, word_id: int, word: str, spelled_word: str, sign: int):
+    """Add (sign=1) or take back (sign=-1) one answer's errors"""
+    expected, spelled, ops = grading.grade_ops(word, spelled_word)
+    if not ops:
+        return
+    queries.execute(cursor, 'misspellings.add', (word_id, spelled, sign))
+    if sign < 0:
+        queries.execute(cursor, 'misspellings.prune', (word_id, spelled))
+
+    row = queries.execute(cursor, 'confusions.get', (child_id,)).fetchone()
+    matrix = ConfusionMatrix(row[1] if row else None)
+    matrix.add(ops, sign)
+    queries.execute(cursor, 'confusions.save', (child_id, max(0, (row[0] if row else 0) + sign), matrix.to_bytes()))
+
+
+def record_practice(cursor, word_id: int, child_id: int, spelled_word: str):
+    """Count a new practice's errors (call in the transaction that inserts it)"""
+    row = queries.execute(cursor, 'words.by_id', (word_id,)).fetchone()
+    if row:
+        _apply(cursor, child_id, word_id, row[0], spelled_word, 1)
+
+
+def forget_practices(cursor, name: str, key: int):
+    """
+    Take back the errors of practices about to be deleted
+    name: 'misspellings.practices_for_word' or 'misspellings.practices_for_child'
+    """
+    for word_id, child_id, word, spelled_word in queries.execute(cursor, name, (key,)).fetchall():
+        _apply(cursor, child_id, word_id, word, spelled_word, -1)
+
+
+def rename_word(cursor, word_id: int, new_word: str):
+    """
+    Re-grade a word's practices against its new text
+    Call in the transaction that renames it, before the UPDATE (the
+    practices are taken back against the text still stored)
+    """
+    for _, child_id, word, spelled_word in queries.execute(cursor, 'misspellings.practices_for_word',
+                                                           (word_id,)).fetchall():
+        if word != new_word:
+            _apply(cursor, child_id, word_id, word, spelled_word, -1)
+            _apply(cursor, child_id, word_id, new_word, spelled_word, 1)
+
+
+def _fold(cursor, rows) -> int:
+    """
+    Add a batch of practices (rows of id, word_id, child_id, word, spelled_word)
+    to both structures; memory is bounded by the batch, not the table
+
+    Returns: number of misspelled practices counted
+    """
+    word_counts = {}
+    child_counts = {}
+    for _, word_id, child_id, word, spelled_word in rows:
+        _, spelled, ops = grading.grade_ops(word, spelled_word)
+        if ops:
+            key = (word_id, spelled)
+            word_counts[key] = word_counts.get(key, 0) + 1
+            entry = child_counts.get(child_id)
+            if entry is None:
+                entry = child_counts[child_id] = [0, {}]
+            entry[0] += 1
+            cells = entry[1]
+            for cell in _cells(ops):
+                cells[cell] = cells.get(cell, 0) + 1
+
+    queries.executemany(cursor, 'misspellings.add', [(w, s, n) for (w, s), n in word_counts.items()])
+    for child_id, (misspelled, cells) in child_counts.items():
+        row = queries.execute(cursor, 'confusions.get', (child_id,)).fetchone()
+        matrix = ConfusionMatrix(row[1] if row else None)
+        matrix.add_counts(cells)
+        queries.execute(cursor, 'confusions.save',
+                        (child_id, (row[0] if row else 0) + misspelled, matrix.to_bytes()))
+    return sum(n for n, _ in child_counts.values())
+
+
+def count_practices(conn, after_id: int, up_to_id: int) -> int:
+    """Count the practices with after_id < id <= up_to_id (a MigrationContext.run_batches step)"""
+    rows = queries.execute(conn, 'misspellings.practices_range', (after_id, up_to_id)).fetchall()
+    return _fold(conn.cursor(), rows)
+
+
+def rebuild(conn) -> int:
+    """
+    Recompute both structures on one database from its practices
+    Clears them, then counts REBUILD_CHUNK_SIZE practices per transaction
+    (commits as it goes). Practices saved meanwhile are counted on insert;
+    a word or child deleted meanwhile can leave the counts off until the
+    next rebuild.
+
+    Returns: number of misspelled practices counted
+    """
+    cursor = conn.cursor()
+    queries.execute(cursor, 'misspellings.delete_all')
+    queries.execute(cursor, 'confusions.delete_all')
+    # Newer practices are counted by record_practice() once this commits
+    last_practice = queries.execute(cursor, 'misspellings.last_practice').fetchone()[0] or 0
+    conn.commit()
+
+    total = 0
+    last_id = 0
+    while last_id < last_practice:
+        rows = queries.execute(cursor, 'misspellings.practices_page',
+                               (last_id, last_practice, REBUILD_CHUNK_SIZE)).fetchall()
+        if not rows:
+            break
+        total += _fold(cursor, rows)
+        conn.commit()
+        last_id = rows[-1][0]
+    return total
+
+
+def rebuild_all() -> int:
+    """rebuild() the catalog and every shard"""
+    from database import all_db_paths, connect_db
+
+    total = 0
+    for path in all_db_paths():
+        conn = connect_db(path)
+        try:
+            total += rebuild(conn)
+        finally:
+            conn.close()
+    return total
+
+
+def common_misspellings(limit: int = 20, per_word: int = 5):
+    """
+    Most misspelled words with their most common misspellings, over the catalog and every shard
+
+    Returns: [{'word_id', 'word', 'misspelled', 'misspellings': [{'spelled', 'count'}]}]
+    """
+    from database import all_db_paths, connect_db
+
+    words = {}
+    for path in all_db_paths():
+        conn = connect_db(path)
+        try:
+            for word_id, word, spelled, count in queries.execute(conn, 'misspellings.all'):
+                entry = words.setdefault(word_id, {'word_id': word_id, 'word': word, 'misspelled': 0, 'counts': {}})
+                entry['misspelled'] += count
+                entry['counts'][spelled] = entry['counts'].get(spelled, 0) + count
+        finally:
+            conn.close()
+
+    top = sorted(words.values(), key=lambda w: (-w['misspelled'], w['word']))[:limit]
+    for entry in top:
+        counts = entry.pop('counts')
+        entry['misspellings'] = [
+            {'spelled': spelled, 'count': count}
+            for spelled, count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:per_word]
+        ]
+    return top
+
+
+def child_confusions(child_id: int, limit: int = 10):
+    """
+    A child's letter confusions
+
+    Returns: {'child_id', 'misspelled', 'top': ConfusionMatrix.top(), 'matrix': ConfusionMatrix.matrices()}
+    """
+    from database import get_db
+
+    conn = get_db(row_id=child_id)
+    try:
+        row = queries.execute(conn, 'confusions.get', (child_id,)).fetchone()
+    finally:
+        conn.close()
+    matrix = ConfusionMatrix(row[1] if row else None)
+    return {
+        'child_id': child_id,
+        'misspelled': row[0] if row else 0,
+        'top': matrix.top(limit),
+        'matrix': matrix.matrices(),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Misspelling index tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("rebuild", help="Recompute the misspelling index and confusions from practices")
+    args = parser.parse_args()
+
+    if args.command == "rebuild":
+        print(f"✓ Counted {rebuild_all()} misspelled practices")
@@ -83,3 +83,12 @@ class PracticeResponse(BaseModel):
     is_correct: bool
     drawing_filename: Optional[str]
     practiced_date: str
+
+class BatchPracticeRecord(BaseModel):
+    """One practice inside a batch upload (Phase 14)"""
+    idempotency_key: str
+    word_id: int
+    child_id: int
+    spelled_word: str
+    is_correct: Optional[bool] = None  # Phase 37: ignored, the server grades spelled_word
+    drawing: Optional[str] = None  # filename of the matching upload in the 'drawings' field
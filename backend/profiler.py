@@ -0,0 +1,314 @@
+"""
+Phase 31: SQL query profiler
+Every statement run on a pooled connection (database.connect_db) goes
+through ProfiledCursor, which records per statement:
+- a latency histogram of the execute step (for SELECTs with ORDER BY /
+  GROUP BY that is nearly all the work; rows streamed afterwards by
+  fetch calls are counted but not timed)
+- rows returned (counted as they are fetched) or changed
+- which functions issued it
+Statements from the queries.py registry are reported by their name, any
+other SQL by its first line.
+
+A statement slower than SLOW_QUERY_MS is printed with its EXPLAIN QUERY
+PLAN and kept in a short in-memory log. Both are served by
+GET /api/admin/query-stats and GET /api/admin/slow-queries, and tests can
+count the queries a request makes with capture() (the query_counter
+fixture in conftest.py).
+"""
+
+import bisect
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from datetime import datetime
+
+PROFILING_ENABLED = os.getenv('QUERY_PROFILING', '1') == '1'
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', '100'))
+SLOW_QUERY_LOG_SIZE = 100
+
+# Upper bounds (ms) of the latency histogram buckets; one more bucket is +Inf
+LATENCY_BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+# Distinct statement names kept; SQL built with literals in it could otherwise grow this forever
+MAX_STATEMENTS = 500
+OVERFLOW_NAME = 'sql: (other)'
+
+# Frames in these files are skipped when finding who issued a query
+_INTERNAL_FILES = {os.path.abspath(__file__), os.path.abspath(os.path.join(os.path.dirname(__file__), 'queries.py'))}
+
+
+class Histogram:
+    """Fixed-bucket histogram; bucket i counts values <= buckets[i] (the last one is +Inf)"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Estimate of the q-quantile: the upper bound of the bucket it falls in (max for +Inf)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def cumulative(self):
+        """[(upper bound, observations <= it)], ending with ('+Inf', count)"""
+        result, seen = [], 0
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            seen += count
+            result.append((bound, seen))
+        return result
+
+
+class StatementStats:
+    """Everything recorded for one statement name"""
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.rows = 0
+        self.callers = Counter()
+
+    def to_dict(self, name: str) -> dict:
+        latency = self.latency
+        return {
+            'name': name,
+            'count': latency.count,
+            'total_ms': round(latency.sum, 3),
+            'avg_ms': round(latency.sum / latency.count, 3) if latency.count else 0.0,
+            'p50_ms': latency.quantile(0.5),
+            'p95_ms': latency.quantile(0.95),
+            'p99_ms': latency.quantile(0.99),
+            'max_ms': round(latency.max, 3),
+            'rows': self.rows,
+            'histogram_ms': {str(bound): count for bound, count in latency.cumulative()},
+            'callers': dict(self.callers.most_common(5)),
+        }
+
+
+_stats = {}
+_slow_queries = deque(maxlen=SLOW_QUERY_LOG_SIZE)
+_captures = []
+_lock = threading.Lock()
+
+
+def _unnamed(sql: str) -> str:
+    """Name for SQL that isn't in the registry: its first non-empty line"""
+    for line in sql.splitlines():
+        line = line.strip()
+        if line:
+            return 'sql: ' + line[:80]
+    return 'sql: (empty)'
+
+
+# co_filename -> whether it is one of _INTERNAL_FILES
+_internal_filenames = {}
+
+
+def _is_internal(filename: str) -> bool:
+    internal = _internal_filenames.get(filename)
+    if internal is None:
+        internal = _internal_filenames[filename] = os.path.abspath(filename) in _INTERNAL_FILES
+    return internal
+
+
+# Code of thin wrappers elsewhere (e.g. PooledConnection.execute), also skipped
+_wrapper_codes = set()
+
+
+def wrapper(func):
+    """Decorator: frames of func are never reported as the caller of a query"""
+    _wrapper_codes.add(func.__code__)
+    return func
+
+
+def _caller() -> str:
+    """module.function of the nearest frame outside the profiler, the registry and wrappers"""
+    frame = sys._getframe(2)
+    while frame is not None and (frame.f_code in _wrapper_codes or _is_internal(frame.f_code.co_filename)):
+        frame = frame.f_back
+    if frame is None:
+        return '?'
+    module = os.path.splitext(os.path.basename(frame.f_code.co_filename))[0]
+    return f"{module}.{frame.f_code.co_name}"
+
+
+def _stats_for(name: str) -> StatementStats:
+    # Caller holds _lock
+    stats = _stats.get(name)
+    if stats is None:
+        if len(_stats) >= MAX_STATEMENTS:
+            name = OVERFLOW_NAME
+            stats = _stats.get(name)
+        if stats is None:
+            stats = _stats[name] = StatementStats()
+    return stats
+
+
+def record(name: str, elapsed_ms: float, rows: int = 0, caller: str = '?'):
+    """Record one execution of a statement"""
+    with _lock:
+        stats = _stats_for(name)
+        stats.latency.observe(elapsed_ms)
+        stats.rows += rows
+        stats.callers[caller] += 1
+        for capture in _captures:
+            capture.names.append(name)
+
+
+def _record_rows(name: str, rows: int):
+    with _lock:
+        _stats_for(name).rows += rows
+
+
+def _log_slow_query(conn, name: str, sql: str, params, elapsed_ms: float, caller: str):
+    """Print a slow statement with its query plan and keep it for the admin endpoint"""
+    try:
+        # Plain sqlite3 execute: not profiled itself
+        plan = [row[3] for row in sqlite3.Connection.execute(conn, "EXPLAIN QUERY PLAN " + sql, params)]
+    except (sqlite3.Error, ValueError):
+        plan = []
+    entry = {
+        'name': name,
+        'elapsed_ms': round(elapsed_ms, 3),
+        'caller': caller,
+        'sql': ' '.join(sql.split()),
+        'plan': plan,
+        'at': datetime.now().isoformat(timespec='seconds'),
+    }
+    with _lock:
+        _slow_queries.append(entry)
+    print(f"Slow query {name} ({elapsed_ms:.1f}ms) from {caller}: {' | '.join(plan) or 'no plan'}")
+
+
+class ProfiledCursor(sqlite3.Cursor):
+    """Cursor whose executions and fetched rows are recorded under a statement name"""
+
+    def execute(self, sql, parameters=(), name: str = None):
+        if not PROFILING_ENABLED:
+            return super().execute(sql, parameters)
+        name = name or _unnamed(sql)
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._finish(name, sql, parameters, (time.perf_counter() - started) * 1000)
+
+    def executemany(self, sql, seq_of_parameters, name: str = None):
+        if not PROFILING_ENABLED:
+            return super().executemany(sql, seq_of_parameters)
+        name = name or _unnamed(sql)
+        seq_of_parameters = list(seq_of_parameters)
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            first = seq_of_parameters[0] if seq_of_parameters else ()
+            self._finish(name, sql, first, (time.perf_counter() - started) * 1000)
+
+    def _finish(self, name, sql, parameters, elapsed_ms):
+        caller = _caller()
+        # rowcount is -1 for SELECTs; their rows are counted as they're fetched
+        record(name, elapsed_ms, max(self.rowcount, 0), caller)
+        self._profile_name = name
+        if elapsed_ms >= SLOW_QUERY_MS:
+            _log_slow_query(self.connection, name, sql, parameters, elapsed_ms, caller)
+
+    def fetchone(self):
+        row = super().fetchone()
+        if row is not None and getattr(self, '_profile_name', None):
+            _record_rows(self._profile_name, 1)
+        return row
+
+    def fetchmany(self, size=None):
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        if rows and getattr(self, '_profile_name', None):
+            _record_rows(self._profile_name, len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        if rows and getattr(self, '_profile_name', None):
+            _record_rows(self._profile_name, len(rows))
+        return rows
+
+    def __next__(self):
+        row = super().__next__()
+        if getattr(self, '_profile_name', None):
+            _record_rows(self._profile_name, 1)
+        return row
+
+
+class QueryCapture:
+    """Statement names executed while a capture() block is open, in order"""
+
+    def __init__(self):
+        self.names = []
+
+    @property
+    def count(self) -> int:
+        return len(self.names)
+
+    def counts(self) -> Counter:
+        return Counter(self.names)
+
+    def reset(self):
+        self.names.clear()
+
+
+@contextmanager
+def capture():
+    """
+    Collect every statement executed (in any thread) until the block ends
+
+        with capture() as queries:
+            client.get('/api/children')
+        assert queries.count <= 3
+    """
+    captured = QueryCapture()
+    with _lock:
+        _captures.append(captured)
+    try:
+        yield captured
+    finally:
+        with _lock:
+            _captures.remove(captured)
+
+
+def query_stats():
+    """Per-statement stats since start (or the last reset), most total time first"""
+    with _lock:
+        stats = [s.to_dict(name) for name, s in _stats.items()]
+    return sorted(stats, key=lambda s: s['total_ms'], reverse=True)
+
+
+def slow_queries():
+    """Recent statements over SLOW_QUERY_MS, newest first"""
+    with _lock:
+        return list(reversed(_slow_queries))
+
+
+def reset_query_stats():
+    """Forget all recorded executions and slow queries"""
+    with _lock:
+        _stats.clear()
+        _slow_queries.clear()
@@ -0,0 +1,374 @@
+"""
+Phase 30: Query registry
+Every fixed statement database.py runs, by name. Keeping the SQL text
+constant means each pooled connection (database.connect_db) parses a
+statement once and then reuses it from SQLite's statement cache, and no
+query is assembled from caller input with f-strings.
+
+Phase 31: profiler.py records every run under the statement's name
+(GET /api/admin/query-stats).
+"""
+
+import sqlite3
+
+from profiler import ProfiledCursor
+
+QUERIES = {
+    # ----- words -----
+    'words.all': "SELECT id, word, category FROM words",
+    'words.due_random': """
+        SELECT id, word, category, successful_days
+        FROM words
+        WHERE next_review <= ?
+        ORDER BY RANDOM()
+        LIMIT 1
+    """,
+    'words.due': """
+        SELECT id, word, category, successful_days
+        FROM words
+        WHERE next_review <= ?
+        ORDER BY successful_days ASC, word ASC
+    """,
+    'words.by_id': "SELECT word, category FROM words WHERE id = ?",
+    'words.exists': "SELECT id FROM words WHERE id = ?",
+    'words.progress': "SELECT successful_days, last_practiced FROM words WHERE id = ?",
+    'words.set_progress': """
+        UPDATE words
+        SET successful_days = ?, last_practiced = ?, next_review = ?
+        WHERE id = ?
+    """,
+    'words.insert': """
+        INSERT INTO words (word, category, successful_days, next_review, reference_image)
+        VALUES (?, ?, 0, ?, ?)
+    """,
+    # Bulk import; the second ? is a JSON list of words. IS also matches NULL (core words)
+    'words.existing_in_scope': """
+        SELECT word FROM words
+        WHERE user_id IS ? AND word IN (SELECT value FROM json_each(?))
+    """,
+    'words.import': """
+        INSERT OR IGNORE INTO words (word, category, successful_days, next_review, reference_image, user_id)
+        VALUES (?, ?, 0, ?, ?, ?)
+    """,
+    'words.insert_initial': """
+        INSERT INTO words (word, category, successful_days, last_practiced, next_review, user_id)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """,
+    # NULL leaves a column unchanged
+    'words.update': """
+        UPDATE words
+        SET word = COALESCE(?, word), category = COALESCE(?, category),
+            reference_image = COALESCE(?, reference_image)
+        WHERE id = ?
+    """,
+    'words.delete': "DELETE FROM words WHERE id = ?",
+    'words.delete_all': "DELETE FROM words",
+    'words.admin_list': """
+        SELECT id, word, category, successful_days, last_practiced, next_review, created_date
+        FROM words
+        ORDER BY created_date DESC
+    """,
+
+    # ----- core word copies on shards (Phase 26); ? is a JSON id list or NULL for all -----
+    'shard_words.copy_core': """
+        INSERT OR REPLACE INTO main.words
+            (id, word, category, successful_days, last_practiced, next_review, reference_image, user_id, created_date)
+        SELECT id, word, category, successful_days, last_practiced, next_review, reference_image, user_id, created_date
+        FROM catalog.words
+        WHERE user_id IS NULL AND (?1 IS NULL OR id IN (SELECT value FROM json_each(?1)))
+    """,
+    'shard_words.delete_removed_core': """
+        DELETE FROM main.words
+        WHERE user_id IS NULL AND (?1 IS NULL OR id IN (SELECT value FROM json_each(?1)))
+        AND id NOT IN (SELECT id FROM catalog.words WHERE user_id IS NULL)
+    """,
+
+    # ----- practices -----
+    'practices.insert': """
+        INSERT INTO practices (word_id, child_id, spelled_word, is_correct, drawing_filename)
+        VALUES (?, ?, ?, ?, ?)
+    """,
+    'practices.for_word': """
+        SELECT id, spelled_word, is_correct, drawing_filename, practiced_date
+        FROM practices
+        WHERE word_id = ?
+        ORDER BY practiced_date DESC
+    """,
+    'practices.recent_drawings': """
+        SELECT
+            p.drawing_filename,
+            w.word,
+            p.is_correct,
+            p.practiced_date
+        FROM practices p
+        JOIN words w ON p.word_id = w.id
+        WHERE p.drawing_filename IS NOT NULL
+        ORDER BY p.practiced_date DESC
+        LIMIT ?
+    """,
+    'practices.delete_for_word': "DELETE FROM practices WHERE word_id = ?",
+    'practices.delete_for_child': "DELETE FROM practices WHERE child_id = ?",
+    'practices.delete_all': "DELETE FROM practices",
+    'practices.grading_page': """
+        SELECT p.id, p.is_correct, p.spelled_word, w.word
+        FROM practices p
+        JOIN words w ON w.id = p.word_id
+        WHERE p.id > ?
+        ORDER BY p.id
+        LIMIT ?
+    """,
+    'practices.set_correct': "UPDATE practices SET is_correct = ? WHERE id = ?",
+
+    # ----- misspelling index (Phase 38) -----
+    'misspellings.add': """
+        INSERT INTO word_misspellings (word_id, spelled_word, count) VALUES (?, ?, ?)
+        ON CONFLICT(word_id, spelled_word) DO UPDATE SET count = count + excluded.count
+    """,
+    'misspellings.prune': "DELETE FROM word_misspellings WHERE word_id = ? AND spelled_word = ? AND count <= 0",
+    'misspellings.all': """
+        SELECT m.word_id, w.word, m.spelled_word, m.count
+        FROM word_misspellings m
+        JOIN words w ON w.id = m.word_id
+    """,
+    'misspellings.delete_all': "DELETE FROM word_misspellings",
+    'misspellings.practices_for_word': """
+        SELECT p.word_id, p.child_id, w.word, p.spelled_word
+        FROM practices p
+        JOIN words w ON w.id = p.word_id
+        WHERE p.word_id = ?
+    """,
+    'misspellings.practices_for_child': """
+        SELECT p.word_id, p.child_id, w.word, p.spelled_word
+        FROM practices p
+        JOIN words w ON w.id = p.word_id
+        WHERE p.child_id = ?
+    """,
+    'misspellings.last_practice': "SELECT MAX(id) FROM practices",
+    'misspellings.practices_page': """
+        SELECT p.id, p.word_id, p.child_id, w.word, p.spelled_word
+        FROM practices p
+        JOIN words w ON w.id = p.word_id
+        WHERE p.id > ? AND p.id <= ?
+        ORDER BY p.id
+        LIMIT ?
+    """,
+    'misspellings.practices_range': """
+        SELECT p.id, p.word_id, p.child_id, w.word, p.spelled_word
+        FROM practices p
+        JOIN words w ON w.id = p.word_id
+        WHERE p.id > ? AND p.id <= ?
+    """,
+    'confusions.get': "SELECT misspelled, counts FROM child_confusions WHERE child_id = ?",
+    'confusions.save': "INSERT OR REPLACE INTO child_confusions (child_id, misspelled, counts) VALUES (?, ?, ?)",
+    'confusions.delete_for_child': "DELETE FROM child_confusions WHERE child_id = ?",
+    'confusions.delete_all': "DELETE FROM child_confusions",
+
+    # ----- dashboard (Phase 6) -----
+    'stats.overview': """
+        SELECT
+            COUNT(DISTINCT CASE WHEN DATE(practiced_date) = DATE('now') THEN word_id END) as words_today,
+            COUNT(DISTINCT CASE WHEN DATE(practiced_date) >= DATE('now', '-7 days') THEN word_id END) as words_this_week,
+            ROUND(AVG(CASE WHEN is_correct = 1 THEN 100.0 ELSE 0.0 END), 1) as overall_accuracy,
+            COUNT(*) as total_practices
+        FROM practices
+    """,
+    'stats.word_accuracy': """
+        SELECT
+            w.word,
+            w.category,
+            COUNT(*) as total_attempts,
+            SUM(CASE WHEN p.is_correct = 1 THEN 1 ELSE 0 END) as correct_attempts,
+            ROUND(100.0 * SUM(CASE WHEN p.is_correct = 1 THEN 1 ELSE 0 END) / COUNT(*), 1) as accuracy
+        FROM words w
+        JOIN practices p ON w.id = p.word_id
+        GROUP BY w.id, w.word, w.category
+        ORDER BY accuracy ASC, total_attempts DESC
+    """,
+    # ? is a date modifier such as '-7 days'
+    'stats.practice_trend': """
+        SELECT
+            DATE(practiced_date) as practice_date,
+            COUNT(*) as practice_count,
+            SUM(CASE WHEN is_correct = 1 THEN 1 ELSE 0 END) as correct_count
+        FROM practices
+        WHERE DATE(practiced_date) >= DATE('now', ?)
+        GROUP BY DATE(practiced_date)
+        ORDER BY practice_date ASC
+    """,
+
+    # ----- practice submissions (Phase 14) -----
+    'submissions.find': """
+        SELECT practice_id FROM practice_submissions
+        WHERE user_id = ? AND idempotency_key = ?
+    """,
+    # Second ? is a JSON list of keys
+    'submissions.find_many': """
+        SELECT idempotency_key, practice_id FROM practice_submissions
+        WHERE user_id = ? AND idempotency_key IN (SELECT value FROM json_each(?))
+    """,
+    'submissions.insert': """
+        INSERT INTO practice_submissions (user_id, idempotency_key, practice_id)
+        VALUES (?, ?, ?)
+    """,
+    'submissions.delete_for_word': """
+        DELETE FROM practice_submissions
+        WHERE practice_id IN (SELECT id FROM practices WHERE word_id = ?)
+    """,
+    'submissions.delete_for_child': """
+        DELETE FROM practice_submissions
+        WHERE practice_id IN (SELECT id FROM practices WHERE child_id = ?)
+    """,
+    'submissions.delete_all': "DELETE FROM practice_submissions",
+
+    # ----- users (Phase 12) -----
+    'users.insert': "INSERT INTO users (email, password_hash) VALUES (?, ?)",
+    'users.by_email': "SELECT id, email, password_hash FROM users WHERE email = ?",
+    'users.by_id': "SELECT id, email, created_date FROM users WHERE id = ?",
+    'user_shards.insert': "INSERT INTO user_shards (user_id, shard) VALUES (?, ?)",
+    'user_shards.for_user': "SELECT shard FROM user_shards WHERE user_id = ?",
+
+    # ----- children (Phase 12) -----
+    'children.insert': "INSERT INTO children (user_id, name, age) VALUES (?, ?, ?)",
+    'children.for_user': """
+        SELECT id, user_id, name, age, created_date FROM children WHERE user_id = ? ORDER BY created_date DESC
+    """,
+    'children.by_id': "SELECT id, user_id, name, age, created_date FROM children WHERE id = ?",
+    'children.user_id': "SELECT user_id FROM children WHERE id = ?",
+    'children.all_ids': "SELECT id FROM children",
+    # NULL leaves a column unchanged
+    'children.update': """
+        UPDATE children SET name = COALESCE(?, name), age = COALESCE(?, age) WHERE id = ?
+    """,
+    'children.delete': "DELETE FROM children WHERE id = ?",
+
+    # ----- child progress (Phase 13) -----
+    'child_progress.get': """
+        SELECT successful_days, last_practiced FROM child_progress
+        WHERE child_id = ? AND word_id = ?
+    """,
+    'child_progress.update': """
+        UPDATE child_progress
+        SET successful_days = ?, last_practiced = ?, next_review = ?
+        WHERE child_id = ? AND word_id = ?
+    """,
+    'child_progress.insert': """
+        INSERT INTO child_progress (child_id, word_id, successful_days, last_practiced, next_review)
+        VALUES (?, ?, ?, ?, ?)
+    """,
+    'child_progress.delete_for_child': "DELETE FROM child_progress WHERE child_id = ?",
+    'child_progress.successful_days': """
+        SELECT successful_days FROM child_progress
+        WHERE child_id = ? AND word_id = ?
+    """,
+    # Scheduler re-plan, keyset on id
+    'child_progress.replan_page': """
+        SELECT id, successful_days, last_practiced
+        FROM child_progress
+        WHERE id > ? AND last_practiced IS NOT NULL
+        ORDER BY id
+        LIMIT ?
+    """,
+    'child_progress.set_next_review': "UPDATE child_progress SET next_review = ? WHERE id = ?",
+
+    # ----- due queue (Phase 16) -----
+    'due_queue.words_for_child': """
+        SELECT
+            w.id,
+            w.word,
+            w.category,
+            q.successful_days,
+            w.user_id,
+            q.next_review
+        FROM due_queue q
+        JOIN words w ON w.id = q.word_id
+        WHERE q.child_id = ? AND q.queue_date = ?
+        ORDER BY q.successful_days ASC, w.word ASC
+    """,
+    # Core words + the family's custom words with the child's progress that are
+    # due on the queue date; a word the child never practiced is always due
+    'due_queue.build': """
+        INSERT INTO due_queue (child_id, queue_date, word_id, successful_days, next_review)
+        SELECT
+            ?,
+            ?,
+            w.id,
+            COALESCE(cp.successful_days, 0),
+            COALESCE(cp.next_review, w.next_review)
+        FROM words w
+        LEFT JOIN child_progress cp ON w.id = cp.word_id AND cp.child_id = ?
+        WHERE (w.user_id IS NULL OR w.user_id = ?)
+        AND (cp.next_review IS NULL OR cp.next_review <= ?)
+    """,
+    'due_queue.add_word': """
+        INSERT OR IGNORE INTO due_queue (child_id, queue_date, word_id, successful_days, next_review)
+        SELECT b.child_id, b.queue_date, ?, 0, ?
+        FROM due_queue_builds b
+        JOIN children c ON c.id = b.child_id
+        WHERE b.queue_date >= ? AND (? IS NULL OR c.user_id = ?)
+    """,
+    'due_queue.drop_mastered': """
+        DELETE FROM due_queue
+        WHERE child_id = ? AND word_id = ? AND queue_date < ?
+    """,
+    'due_queue.delete_for_child': "DELETE FROM due_queue WHERE child_id = ?",
+    'due_queue.delete_for_word': "DELETE FROM due_queue WHERE word_id = ?",
+    'due_queue.delete_before': "DELETE FROM due_queue WHERE queue_date < ?",
+    'due_queue.delete_all': "DELETE FROM due_queue",
+    'due_queue_builds.exists': "SELECT 1 FROM due_queue_builds WHERE child_id = ? AND queue_date = ?",
+    'due_queue_builds.insert': "INSERT INTO due_queue_builds (child_id, queue_date) VALUES (?, ?)",
+    'due_queue_builds.delete_for_child': "DELETE FROM due_queue_builds WHERE child_id = ?",
+    'due_queue_builds.delete_for_user': """
+        DELETE FROM due_queue_builds
+        WHERE child_id IN (SELECT id FROM children WHERE user_id = ?)
+    """,
+    'due_queue_builds.delete_before': "DELETE FROM due_queue_builds WHERE queue_date < ?",
+    'due_queue_builds.delete_all': "DELETE FROM due_queue_builds",
+
+    # ----- table versions (Phase 19) -----
+    'table_versions.bump': "UPDATE table_versions SET version = version + 1 WHERE name = ?",
+    'table_versions.all': "SELECT name, version FROM table_versions",
+
+    # ----- practice sessions (Phase 27) -----
+    'sessions.get': "SELECT state FROM practice_sessions WHERE child_id = ?",
+    'sessions.save': """
+        INSERT OR REPLACE INTO practice_sessions (child_id, state, updated_at)
+        VALUES (?, ?, CURRENT_TIMESTAMP)
+    """,
+    'sessions.delete_for_child': "DELETE FROM practice_sessions WHERE child_id = ?",
+    'sessions.delete_all': "DELETE FROM practice_sessions",
+    'sessions.count': "SELECT COUNT(*) FROM practice_sessions",
+}
+
+# SQLite's per-connection statement cache (sqlite3.connect(cached_statements=...)).
+# The default of 128 is smaller than registry + keyset page variants, which
+# would evict statements in a loop; leave room for what migrations run too.
+STATEMENT_CACHE_SIZE = 256
+
+
+def _cursor(target):
+    """A cursor for target, which may be a connection or a cursor"""
+    return target.cursor() if isinstance(target, sqlite3.Connection) else target
+
+
+def execute(target, name: str, params=()):
+    """Run a registered statement on a cursor or connection; returns the cursor"""
+    return execute_sql(target, name, QUERIES[name], params)
+
+
+def execute_sql(target, name: str, sql: str, params=()):
+    """
+    Run SQL composed at runtime from fixed pieces (e.g. keyset pages),
+    profiled under name
+    """
+    cursor = _cursor(target)
+    if isinstance(cursor, ProfiledCursor):
+        return cursor.execute(sql, params, name=name)
+    return cursor.execute(sql, params)
+
+
+def executemany(target, name: str, seq_of_params):
+    """executemany for a registered statement (profiled as one run)"""
+    cursor = _cursor(target)
+    if isinstance(cursor, ProfiledCursor):
+        return cursor.executemany(QUERIES[name], seq_of_params, name=name)
+    return cursor.executemany(QUERIES[name], seq_of_params)
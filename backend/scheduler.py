@@ -0,0 +1,268 @@
+"""
+Phase 17: Spaced-repetition scheduler engine
+Single home for "when is this word due next" so database.py doesn't
+duplicate the interval rule, plus a NumPy batch mode to re-plan every
+child_progress row when algorithm parameters change.
+
+Algorithms only see successful_days (the number of distinct days a word
+was spelled correctly), since that is what the schema tracks:
+- fixed: the original rule (+2 days after 1st success, +3 after that)
+- sm2:   SM-2 interval growth with a constant ease factor
+- fsrs:  FSRS-style stability growth turned into an interval for a target recall
+
+Select the live algorithm with SCHEDULER_ALGORITHM=fixed|sm2|fsrs
+
+Usage:
+    python scheduler.py replan --algorithm sm2
+"""
+
+import os
+from abc import ABC, abstractmethod
+from datetime import date, timedelta
+
+# Upper bound on any interval so long-mastered words still come back
+DEFAULT_MAX_INTERVAL_DAYS = 365
+
+# Rows read / written per transaction during a re-plan
+REPLAN_CHUNK_SIZE = 50000
+
+
+class SchedulingAlgorithm(ABC):
+    """Base class: maps successful_days to days until next review"""
+
+    name = None
+
+    def __init__(self, max_interval_days: int = DEFAULT_MAX_INTERVAL_DAYS):
+        self.max_interval_days = max_interval_days
+
+    @abstractmethod
+    def interval_days(self, successful_days: int) -> int:
+        """Days until next review after reaching successful_days"""
+
+    def interval_days_batch(self, successful_days):
+        """
+        Vectorized interval_days over a NumPy integer array
+        Subclasses override this; the default falls back to a Python loop
+        """
+        import numpy as np
+        return np.fromiter(
+            (self.interval_days(int(n)) for n in successful_days),
+            dtype=np.int64, count=len(successful_days)
+        )
+
+    def next_review(self, successful_days: int, practiced_on: date = None) -> str:
+        """ISO date of next review for a word practiced on practiced_on (default today)"""
+        practiced_on = practiced_on or date.today()
+        return (practiced_on + timedelta(days=self.interval_days(successful_days))).isoformat()
+
+    def next_review_batch(self, successful_days, last_practiced):
+        """
+        Vectorized next_review
+
+        Args:
+            successful_days: integer array
+            last_practiced: datetime64[D] array (or ISO date strings)
+
+        Returns:
+            datetime64[D] array of next review dates
+        """
+        import numpy as np
+        last = np.asarray(last_practiced, dtype='datetime64[D]')
+        intervals = self.interval_days_batch(np.asarray(successful_days, dtype=np.int64))
+        return last + intervals.astype('timedelta64[D]')
+
+    def _clamp(self, days):
+        return max(1, min(int(days), self.max_interval_days))
+
+
+class FixedIntervalScheduler(SchedulingAlgorithm):
+    """Phase 4 rule: +2 days after the first success, +3 days after 2+ successes"""
+
+    name = 'fixed'
+
+    def __init__(self, first_interval: int = 2, later_interval: int = 3, **kwargs):
+        super().__init__(**kwargs)
+        self.first_interval = first_interval
+        self.later_interval = later_interval
+
+    def interval_days(self, successful_days: int) -> int:
+        if successful_days == 1:
+            # After first success → review in 2 days
+            return self.first_interval
+        elif successful_days >= 2:
+            # After 2+ successes → review in 3 days
+            return self.later_interval
+        return 1
+
+    def interval_days_batch(self, successful_days):
+        import numpy as np
+        n = np.asarray(successful_days, dtype=np.int64)
+        return np.where(n >= 2, self.later_interval, np.where(n == 1, self.first_interval, 1)).astype(np.int64)
+
+
+class SM2Scheduler(SchedulingAlgorithm):
+    """
+    SM-2 intervals: I(1) = first_interval, I(2) = second_interval,
+    I(n) = I(n-1) * ease. Practices only record right/wrong, so the
+    ease factor is a fixed parameter instead of being graded per answer.
+    """
+
+    name = 'sm2'
+
+    def __init__(self, first_interval: int = 1, second_interval: int = 6, ease: float = 2.5, **kwargs):
+        super().__init__(**kwargs)
+        self.first_interval = first_interval
+        self.second_interval = second_interval
+        self.ease = ease
+
+    def interval_days(self, successful_days: int) -> int:
+        if successful_days <= 1:
+            return self._clamp(self.first_interval)
+        if successful_days == 2:
+            return self._clamp(self.second_interval)
+        return self._clamp(round(self.second_interval * self.ease ** (successful_days - 2)))
+
+    def interval_days_batch(self, successful_days):
+        import numpy as np
+        n = np.asarray(successful_days, dtype=np.int64)
+        # Cap the exponent so huge counts can't overflow before clipping
+        exponent = np.clip(n - 2, 0, 64).astype(np.float64)
+        grown = np.rint(self.second_interval * np.power(self.ease, exponent))
+        days = np.where(n <= 1, self.first_interval, np.where(n == 2, self.second_interval, grown))
+        return np.clip(days, 1, self.max_interval_days).astype(np.int64)
+
+
+class FSRSScheduler(SchedulingAlgorithm):
+    """
+    FSRS-style scheduling: memory stability grows by stability_growth with
+    each successful day, and the interval is the time until predicted recall
+    drops to desired_retention using the FSRS power forgetting curve
+    R(t) = (1 + FACTOR * t / S) ** DECAY.
+    """
+
+    name = 'fsrs'
+
+    DECAY = -0.5
+    FACTOR = 0.9 ** (1 / DECAY) - 1  # makes R(S) == 0.9
+
+    def __init__(self, initial_stability: float = 2.0, stability_growth: float = 2.2,
+                 desired_retention: float = 0.9, **kwargs):
+        super().__init__(**kwargs)
+        self.initial_stability = initial_stability
+        self.stability_growth = stability_growth
+        self.desired_retention = desired_retention
+
+    def _interval_for_stability(self, stability):
+        return stability / self.FACTOR * (self.desired_retention ** (1 / self.DECAY) - 1)
+
+    def interval_days(self, successful_days: int) -> int:
+        stability = self.initial_stability * self.stability_growth ** max(successful_days - 1, 0)
+        return self._clamp(round(self._interval_for_stability(stability)))
+
+    def interval_days_batch(self, successful_days):
+        import numpy as np
+        n = np.asarray(successful_days, dtype=np.int64)
+        exponent = np.clip(n - 1, 0, 64).astype(np.float64)
+        stability = self.initial_stability * np.power(self.stability_growth, exponent)
+        days = np.rint(self._interval_for_stability(stability))
+        return np.clip(days, 1, self.max_interval_days).astype(np.int64)
+
+
+ALGORITHMS = {
+    FixedIntervalScheduler.name: FixedIntervalScheduler,
+    SM2Scheduler.name: SM2Scheduler,
+    FSRSScheduler.name: FSRSScheduler,
+}
+
+_active_scheduler = None
+
+
+def create_scheduler(name: str, **params) -> SchedulingAlgorithm:
+    """Build a scheduler by name ('fixed', 'sm2' or 'fsrs')"""
+    if name not in ALGORITHMS:
+        raise ValueError(f"Unknown scheduling algorithm '{name}'. Choose from: {', '.join(ALGORITHMS)}")
+    return ALGORITHMS[name](**params)
+
+
+def get_scheduler() -> SchedulingAlgorithm:
+    """Get the live scheduler (from SCHEDULER_ALGORITHM, default 'fixed')"""
+    global _active_scheduler
+    if _active_scheduler is None:
+        _active_scheduler = create_scheduler(os.getenv('SCHEDULER_ALGORITHM', 'fixed'))
+    return _active_scheduler
+
+
+def set_scheduler(scheduler) -> SchedulingAlgorithm:
+    """Replace the live scheduler with an instance or algorithm name"""
+    global _active_scheduler
+    if isinstance(scheduler, str):
+        scheduler = create_scheduler(scheduler)
+    _active_scheduler = scheduler
+    return _active_scheduler
+
+
+def replan_child_progress(scheduler: SchedulingAlgorithm = None, chunk_size: int = REPLAN_CHUNK_SIZE) -> int:
+    """
+    Recompute next_review for every child_progress row with a scheduler
+    Reads, computes and writes chunk_size rows per transaction (keyset on id),
+    so 100k+ rows re-plan in a few passes without holding a long write lock.
+
+    Returns: number of rows updated
+    """
+    import numpy as np
+    from database import all_db_paths, bump_table_versions, connect_db, invalidate_due_queues
+    import queries
+
+    scheduler = scheduler or get_scheduler()
+    updated = 0
+
+    # Phase 26: child_progress is spread over the catalog and every shard
+    for path in all_db_paths():
+        conn = connect_db(path)
+        cursor = conn.cursor()
+        last_id = 0
+
+        while True:
+            rows = queries.execute(cursor, 'child_progress.replan_page', (last_id, chunk_size)).fetchall()
+            if not rows:
+                break
+
+            ids, successful_days, last_practiced = zip(*rows)
+            next_review = scheduler.next_review_batch(
+                np.fromiter(successful_days, dtype=np.int64, count=len(rows)),
+                np.array(last_practiced, dtype='datetime64[D]')
+            )
+
+            queries.executemany(cursor, 'child_progress.set_next_review',
+                                zip(next_review.astype(str).tolist(), ids))
+            bump_table_versions(cursor, 'child_progress')
+            conn.commit()
+
+            updated += len(rows)
+            last_id = ids[-1]
+
+        conn.close()
+
+    # Due dates moved, so built queues are stale
+    if updated:
+        invalidate_due_queues()
+    return updated
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Spaced-repetition scheduler tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    replan = sub.add_parser("replan", help="Recompute next_review for every child_progress row")
+    replan.add_argument("--algorithm", choices=sorted(ALGORITHMS), default=None)
+    replan.add_argument("--chunk-size", type=int, default=REPLAN_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    if args.command == "replan":
+        chosen = create_scheduler(args.algorithm) if args.algorithm else get_scheduler()
+        started = time.perf_counter()
+        count = replan_child_progress(chosen, args.chunk_size)
+        print(f"✓ Re-planned {count} child_progress rows with '{chosen.name}' "
+              f"in {time.perf_counter() - started:.2f}s")
@@ -4,11 +4,15 @@ Implements Anki-like queue system:
 - Maintains a queue of words for today's session
 - Prevents consecutive duplicate words
 - Cycles words until all are mastered
+
+Phase 27: Sessions are saved per child in the database (practice_sessions)
+instead of living in one worker's memory, so any worker process can
+continue a child's session.
 """
 
 import random
 from datetime import date
-from database import get_words_for_today, get_words_for_child
+from database import get_words_for_today, get_words_for_child, update_session_state, get_session_state
 
 class WordSession:
     """Manages word queue for a single practice session"""
@@ -31,13 +35,16 @@ class WordSession:
         
         self._load_words()
     
-    def _load_words(self):
-        """Load available words for today from database"""
+    def _fetch_words(self):
+        """Fetch today's due words (dicts with 'id'), easiest first"""
         # Use child-specific words if child_id is provided
         if self.child_id:
-            all_words = get_words_for_child(self.child_id)
-        else:
-            all_words = get_words_for_today()
+            return get_words_for_child(self.child_id)
+        return get_words_for_today()
+    
+    def _load_words(self):
+        """Load available words for today from database"""
+        all_words = self._fetch_words()
         
         # Limit to num_words if specified
         if self.num_words:
@@ -52,6 +59,30 @@ class WordSession:
         random.shuffle(self.available_words)
         self.session_started = True
     
+    def to_state(self):
+        """JSON-serializable snapshot of the session (see from_state)"""
+        return {
+            'num_words': self.num_words,
+            'child_id': self.child_id,
+            'available_words': self.available_words,
+            'last_word_id': self.last_word_id,
+            'mastered_words': sorted(self.mastered_words),
+            'initial_word_count': self.initial_word_count,
+        }
+    
+    @classmethod
+    def from_state(cls, state):
+        """Rebuild a session from to_state() output without reloading words"""
+        session = cls.__new__(cls)
+        session.num_words = state['num_words']
+        session.child_id = state['child_id']
+        session.available_words = list(state['available_words'])
+        session.last_word_id = state['last_word_id']
+        session.mastered_words = set(state['mastered_words'])
+        session.initial_word_count = state['initial_word_count']
+        session.session_started = True
+        return session
+    
     def get_next_word_id(self):
         """
         Get next word ID ensuring:
@@ -144,3 +175,66 @@ class WordSession:
             'remaining': len(self.available_words) - len([w for w in self.available_words if w in self.mastered_words]),
             'queue_size': len(self.available_words)
         }
+
+
+# ===== PHASE 27: Per-child sessions shared by all workers =====
+
+# A session started without a child is saved under this key
+NO_CHILD_SESSION_KEY = 0
+
+def begin_session(child_id, num_words=None):
+    """
+    Start (or restart) a child's session and pick its first word
+    
+    Returns: (session, first word_id or None if nothing is due)
+    """
+    session = WordSession(num_words=num_words, child_id=child_id)
+    word_id = session.get_next_word_id()
+    update_session_state(child_id or NO_CHILD_SESSION_KEY, lambda state: session.to_state())
+    return session, word_id
+
+def load_session(child_id):
+    """A child's saved session, or None if none was started"""
+    state = get_session_state(child_id or NO_CHILD_SESSION_KEY)
+    return WordSession.from_state(state) if state else None
+
+def advance_session(child_id):
+    """
+    Pick the next word of a child's saved session
+    
+    Returns: (session, word_id), or (None, None) if no session was started
+    """
+    picked = {'session': None, 'word_id': None}
+    
+    def advance(state):
+        if state is None:
+            return None
+        session = WordSession.from_state(state)
+        picked['session'] = session
+        picked['word_id'] = session.get_next_word_id()
+        return session.to_state()
+    
+    update_session_state(child_id or NO_CHILD_SESSION_KEY, advance)
+    return picked['session'], picked['word_id']
+
+def record_session_results(child_id, results):
+    """
+    Apply practice results to a child's saved session (no-op without one)
+    
+    Args:
+        results: iterable of (word_id, is_correct)
+    """
+    results = list(results)
+    
+    def apply(state):
+        if state is None or not results:
+            return None
+        session = WordSession.from_state(state)
+        for word_id, is_correct in results:
+            if is_correct:
+                session.mark_word_mastered(word_id)
+            else:
+                session.mark_word_incorrect(word_id)
+        return session.to_state()
+    
+    update_session_state(child_id or NO_CHILD_SESSION_KEY, apply)
@@ -0,0 +1,103 @@
+"""
+Phase 26: Per-family database sharding
+Optional: set SHARD_COUNT=N (default 0 = everything in spelling.db).
+
+With sharding on:
+- the catalog (spelling.db) keeps users, core words (user_id IS NULL)
+  and which shard each user was assigned to
+- each new family's children, custom words, practices, child_progress,
+  due queues and idempotency keys live in one of N shard files, picked by
+  a consistent-hash ring over user_id - so families on different shards
+  never wait on each other's write lock
+- core words are copied into every shard with the same ids, so
+  per-family queries run unchanged against a single shard file
+- each shard allocates ids from its own range (shard i starts at
+  (i + 1) << 40), so a child, practice or custom word id on its own says
+  which file holds the row
+
+Families created before sharding was switched on stay in the catalog.
+The router itself is database.get_db(user_id=..., row_id=...); this
+module only holds the placement rules.
+"""
+
+import bisect
+import hashlib
+import os
+
+# Number of shard files (0 = sharding off)
+SHARD_COUNT = int(os.getenv('SHARD_COUNT', '0'))
+
+# Where shard files live (default: <data dir>/shards)
+SHARD_DIR = os.getenv('SHARD_DIR')
+
+# Every shard is ATTACHed for cross-family reads; SQLite's default limit is 10
+MAX_SHARDS = 10
+
+# Ids below SHARD_ID_SPAN belong to the catalog; shard i uses [(i+1) * SPAN, (i+2) * SPAN)
+SHARD_ID_SPAN = 1 << 40
+
+# Tables whose ids come from a shard's own range
+SHARDED_ID_TABLES = ('children', 'words', 'practices', 'child_progress')
+
+# Points per shard on the hash ring; more points = more even spread
+VNODES_PER_SHARD = 64
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], 'big')
+
+
+class HashRing:
+    """
+    Consistent-hash ring mapping keys to shard indexes
+    Growing from N to N+1 shards only moves about 1/(N+1) of the keys
+    """
+
+    def __init__(self, shard_count: int, vnodes: int = VNODES_PER_SHARD):
+        points = sorted(
+            (_hash(f"shard-{shard}-{v}"), shard)
+            for shard in range(shard_count)
+            for v in range(vnodes)
+        )
+        self._hashes = [h for h, _ in points]
+        self._shards = [s for _, s in points]
+
+    def shard_for(self, key) -> int:
+        """Shard index owning key (first ring point clockwise of its hash)"""
+        position = bisect.bisect(self._hashes, _hash(str(key))) % len(self._hashes)
+        return self._shards[position]
+
+
+_rings = {}
+
+
+def ring_shard_for_user(user_id: int) -> int:
+    """Shard a new user is placed on"""
+    if SHARD_COUNT not in _rings:
+        _rings[SHARD_COUNT] = HashRing(SHARD_COUNT)
+    return _rings[SHARD_COUNT].shard_for(user_id)
+
+
+def validate_shard_count():
+    """Raise ValueError if SHARD_COUNT is out of range"""
+    if not 0 <= SHARD_COUNT <= MAX_SHARDS:
+        raise ValueError(f"SHARD_COUNT must be between 0 and {MAX_SHARDS}, got {SHARD_COUNT}")
+
+
+def shard_path(catalog_path: str, index: int) -> str:
+    """File of shard index, next to the catalog"""
+    directory = SHARD_DIR or os.path.join(os.path.dirname(os.path.abspath(catalog_path)), 'shards')
+    name = os.path.splitext(os.path.basename(catalog_path))[0]
+    return os.path.join(directory, f"{name}-shard-{index:02d}.db")
+
+
+def shard_for_id(row_id: int):
+    """Shard index a row id was allocated on, or None for the catalog"""
+    if row_id is None or row_id < SHARD_ID_SPAN:
+        return None
+    return row_id // SHARD_ID_SPAN - 1
+
+
+def id_range_start(index: int) -> int:
+    """First id shard index hands out"""
+    return (index + 1) * SHARD_ID_SPAN
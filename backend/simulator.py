@@ -0,0 +1,344 @@
+"""
+Phase 18: Offline schedule simulator
+Replays synthetic (or recorded) practice histories through the scheduler
+and WordSession entirely in memory, then reports per-day workload:
+due words, session queue sizes and the database reads/writes the
+server would see. Use it to capacity-plan the morning rush before
+changing scheduling rules or growing the user base.
+
+Two engines produce the same report:
+- vectorized (default): NumPy arrays over every (child, word) pair;
+  attempts until a correct answer are drawn per word in one pass
+- session: drives a real WordSession per child, answer by answer
+  (slower; useful to cross-check the vectorized numbers)
+
+Usage:
+    python simulator.py --children 5000 --words 60 --days 90
+    python simulator.py --algorithm sm2 --new-children-per-day 50 --json
+    python simulator.py --from-db ../data/spelling.db --days 30
+"""
+
+import json
+import random
+import sqlite3
+from datetime import date, timedelta
+
+import numpy as np
+
+from scheduler import create_scheduler, get_scheduler
+from session import WordSession
+
+# Database statements issued by main.py per event (see start_session,
+# next_word, submit_practice and update_word_on_success_for_child)
+READS_PER_SESSION_START = 4   # due-queue check + read, word lookup, progress lookup
+READS_PER_ATTEMPT = 4         # next-word: child, word, progress; practice: word
+WRITES_PER_ATTEMPT = 1        # practices INSERT
+READS_PER_SUCCESS = 2         # child check + child_progress lookup
+WRITES_PER_SUCCESS = 2        # child_progress upsert + due_queue patch
+WRITES_PER_QUEUE_BUILD = 4    # nightly rebuild: 2 deletes, insert-select, marker
+
+# Typical PNG size of a saved drawing
+DEFAULT_DRAWING_KB = 40
+
+
+class SimulationState:
+    """
+    Flat arrays over every (child, word) pair
+
+    child_of[i]        child index owning pair i
+    successful_days[i] per-child successful_days
+    next_review[i]     day offset (0 = first simulated day) the word is due
+    join_day[c]        day offset child c starts practicing
+    """
+
+    def __init__(self, child_of, successful_days, next_review, join_day):
+        self.child_of = np.asarray(child_of, dtype=np.int64)
+        self.successful_days = np.asarray(successful_days, dtype=np.int64)
+        self.next_review = np.asarray(next_review, dtype=np.int64)
+        self.join_day = np.asarray(join_day, dtype=np.int64)
+
+    @property
+    def num_children(self):
+        return len(self.join_day)
+
+
+def synthetic_state(num_children: int = 1000, words_per_child: int = 40,
+                    new_children_per_day: int = 0, days: int = 30) -> SimulationState:
+    """
+    Build a population of new children with every word due on day 0
+    new_children_per_day adds that many children joining each simulated day
+    """
+    total_children = num_children + new_children_per_day * days
+    join_day = np.zeros(total_children, dtype=np.int64)
+    if new_children_per_day:
+        join_day[num_children:] = 1 + np.arange(new_children_per_day * days) // new_children_per_day
+
+    child_of = np.repeat(np.arange(total_children), words_per_child)
+    successful_days = np.zeros(len(child_of), dtype=np.int64)
+    # New children see every word on the day they join
+    next_review = join_day[child_of].copy()
+    return SimulationState(child_of, successful_days, next_review, join_day)
+
+
+def recorded_state(db_path: str, start: date = None) -> SimulationState:
+    """
+    Load the current per-child progress from a spelling.db file
+    Words a child never practiced are due immediately, like get_words_for_child
+    """
+    start = start or date.today()
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT c.id, COALESCE(cp.successful_days, 0), cp.next_review
+        FROM children c
+        JOIN words w ON (w.user_id IS NULL OR w.user_id = c.user_id)
+        LEFT JOIN child_progress cp ON cp.word_id = w.id AND cp.child_id = c.id
+        ORDER BY c.id
+    """)
+    rows = cursor.fetchall()
+    conn.close()
+
+    if not rows:
+        return SimulationState([], [], [], [])
+
+    child_ids, successful_days, next_review = zip(*rows)
+    _, child_of = np.unique(np.array(child_ids), return_inverse=True)
+    due = np.array([r or start.isoformat() for r in next_review], dtype='datetime64[D]')
+    offsets = (due - np.datetime64(start.isoformat(), 'D')).astype(np.int64)
+    num_children = int(child_of.max()) + 1
+    return SimulationState(child_of, successful_days, np.maximum(offsets, 0),
+                           np.zeros(num_children, dtype=np.int64))
+
+
+def recorded_accuracy(db_path: str, default: float = 0.6) -> float:
+    """Overall share of correct practices in a spelling.db file"""
+    conn = sqlite3.connect(db_path)
+    row = conn.execute("SELECT AVG(CASE WHEN is_correct = 1 THEN 1.0 ELSE 0.0 END) FROM practices").fetchone()
+    conn.close()
+    return row[0] if row and row[0] is not None else default
+
+
+def _correct_probability(successful_days, base: float, gain: float):
+    """Chance an attempt is correct; children improve as a word is learned"""
+    return np.clip(base + gain * successful_days, 0.05, 0.99)
+
+
+def _cap_per_child(indices, child_of, successful_days, cap, rng):
+    """Keep at most cap pairs per child, easiest first (like WordSession num_words)"""
+    order = np.lexsort((rng.random(len(indices)), successful_days[indices], child_of[indices]))
+    indices = indices[order]
+    children = child_of[indices]
+    first = np.searchsorted(children, children, side='left')
+    rank = np.arange(len(indices)) - first
+    return indices[rank < cap]
+
+
+class SimulatedSession(WordSession):
+    """WordSession fed from an in-memory due list instead of the database"""
+
+    def __init__(self, words, num_words=None):
+        self._words = words
+        super().__init__(num_words=num_words)
+
+    def _fetch_words(self):
+        return self._words
+
+
+def _run_session_engine(state, practiced, p_base, p_gain, session_size, rng):
+    """Drive a real WordSession for every child practicing today"""
+    attempts = 0
+    queue_sizes = []
+    mastered = []
+
+    order = np.argsort(state.child_of[practiced], kind='stable')
+    practiced = practiced[order]
+    boundaries = np.flatnonzero(np.diff(state.child_of[practiced])) + 1
+
+    for group in np.split(practiced, boundaries):
+        if len(group) == 0:
+            continue
+        words = sorted(
+            ({'id': int(i), 'successful_days': int(state.successful_days[i])} for i in group),
+            key=lambda w: w['successful_days']
+        )
+        session = SimulatedSession(words, num_words=session_size)
+        queue_sizes.append(session.initial_word_count)
+
+        # Guard against a child who never gets a word right
+        for _ in range(50 * session.initial_word_count):
+            word_id = session.get_next_word_id()
+            if word_id is None:
+                break
+            attempts += 1
+            p = _correct_probability(state.successful_days[word_id], p_base, p_gain)
+            if rng.random() < p:
+                session.mark_word_mastered(word_id)
+                mastered.append(word_id)
+            else:
+                session.mark_word_incorrect(word_id)
+
+    mastered = np.array(mastered, dtype=np.int64)
+    return attempts, np.array(queue_sizes, dtype=np.int64), mastered
+
+
+def _run_vectorized_engine(state, practiced, p_base, p_gain, rng):
+    """Every practiced word is retried until correct: attempts ~ Geometric(p)"""
+    p = _correct_probability(state.successful_days[practiced], p_base, p_gain)
+    attempts = int(rng.geometric(p).sum()) if len(practiced) else 0
+    queue_sizes = np.bincount(state.child_of[practiced], minlength=state.num_children)
+    return attempts, queue_sizes[queue_sizes > 0], practiced
+
+
+def simulate(state: SimulationState, days: int = 30, scheduler=None, participation: float = 0.7,
+             p_base: float = 0.6, p_gain: float = 0.1, session_size: int = None,
+             engine: str = 'vectorized', drawing_kb: float = DEFAULT_DRAWING_KB,
+             peak_hour_share: float = 0.25, seed: int = 0, start: date = None):
+    """
+    Run the simulation and return a per-day report
+
+    Args:
+        state: SimulationState (synthetic_state / recorded_state); updated in place
+        days: number of days to simulate
+        scheduler: SchedulingAlgorithm (default: live scheduler)
+        participation: chance a child practices on a given day
+        p_base, p_gain: attempt correct probability = p_base + p_gain * successful_days
+        session_size: words per session (None = all due words, like num_words=None)
+        engine: 'vectorized' or 'session'
+        drawing_kb: average saved drawing size
+        peak_hour_share: fraction of a day's traffic landing in the busiest hour
+        seed: RNG seed for repeatable runs
+        start: calendar date of day 0 (default today)
+
+    Returns:
+        dict: {'days': [per-day dict], 'summary': peak/total figures}
+    """
+    if engine not in ('vectorized', 'session'):
+        raise ValueError(f"Unknown engine '{engine}'")
+
+    scheduler = scheduler or get_scheduler()
+    rng = np.random.default_rng(seed)
+    # WordSession shuffles with the random module
+    random.seed(seed)
+    start = start or date.today()
+    report = []
+
+    for day in range(days):
+        joined = state.join_day <= day
+        due = (state.next_review <= day) & joined[state.child_of]
+        due_per_child = np.bincount(state.child_of[due], minlength=state.num_children)
+
+        active = joined & (rng.random(state.num_children) < participation) & (due_per_child > 0)
+        practiced = np.flatnonzero(due & active[state.child_of])
+        if session_size:
+            practiced = _cap_per_child(practiced, state.child_of, state.successful_days, session_size, rng)
+
+        if engine == 'session':
+            attempts, queue_sizes, mastered = _run_session_engine(
+                state, practiced, p_base, p_gain, session_size, rng
+            )
+        else:
+            attempts, queue_sizes, mastered = _run_vectorized_engine(state, practiced, p_base, p_gain, rng)
+
+        # Each mastered word counts one successful day and is rescheduled
+        state.successful_days[mastered] += 1
+        state.next_review[mastered] = day + scheduler.interval_days_batch(state.successful_days[mastered])
+
+        sessions = int(len(queue_sizes))
+        successes = int(len(mastered))
+        queue_builds = int(joined.sum())
+        reads = sessions * READS_PER_SESSION_START + attempts * READS_PER_ATTEMPT + successes * READS_PER_SUCCESS
+        writes = attempts * WRITES_PER_ATTEMPT + successes * WRITES_PER_SUCCESS
+
+        report.append({
+            'day': day,
+            'date': (start + timedelta(days=day)).isoformat(),
+            'children': queue_builds,
+            'due_words': int(due.sum()),
+            'sessions': sessions,
+            'queue_mean': round(float(queue_sizes.mean()), 2) if sessions else 0.0,
+            'queue_p95': int(np.percentile(queue_sizes, 95)) if sessions else 0,
+            'queue_max': int(queue_sizes.max()) if sessions else 0,
+            'attempts': attempts,
+            'successes': successes,
+            'db_reads': reads,
+            'db_writes': writes,
+            'queue_build_writes': queue_builds * WRITES_PER_QUEUE_BUILD,
+            'peak_writes_per_sec': round(writes * peak_hour_share / 3600, 2),
+            'drawing_mb': round(attempts * drawing_kb / 1024, 1),
+        })
+
+    return {'days': report, 'summary': summarize(report)}
+
+
+def summarize(report):
+    """Peak and total figures across a per-day report"""
+    if not report:
+        return {}
+    busiest = max(report, key=lambda d: d['db_writes'])
+    return {
+        'days': len(report),
+        'peak_due_words': max(d['due_words'] for d in report),
+        'peak_sessions': max(d['sessions'] for d in report),
+        'peak_queue': max(d['queue_max'] for d in report),
+        'busiest_day': busiest['date'],
+        'peak_db_writes': busiest['db_writes'],
+        'peak_writes_per_sec': busiest['peak_writes_per_sec'],
+        'total_attempts': sum(d['attempts'] for d in report),
+        'total_drawing_mb': round(sum(d['drawing_mb'] for d in report), 1),
+    }
+
+
+def print_report(result):
+    """Print a per-day table and summary"""
+    print(f"{'date':<12}{'children':>9}{'due':>9}{'sessions':>9}{'queue':>7}"
+          f"{'p95':>5}{'attempts':>10}{'reads':>10}{'writes':>9}{'w/s@peak':>10}")
+    for d in result['days']:
+        print(f"{d['date']:<12}{d['children']:>9}{d['due_words']:>9}{d['sessions']:>9}"
+              f"{d['queue_mean']:>7}{d['queue_p95']:>5}{d['attempts']:>10}"
+              f"{d['db_reads']:>10}{d['db_writes']:>9}{d['peak_writes_per_sec']:>10}")
+    print("\nSummary:")
+    for key, value in result['summary'].items():
+        print(f"  {key}: {value}")
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Simulate daily review workload")
+    parser.add_argument("--children", type=int, default=1000)
+    parser.add_argument("--words", type=int, default=40, help="Words available per child")
+    parser.add_argument("--new-children-per-day", type=int, default=0)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--algorithm", default=None, help="fixed, sm2 or fsrs (default: live scheduler)")
+    parser.add_argument("--participation", type=float, default=0.7)
+    parser.add_argument("--p-base", type=float, default=None, help="Correct rate for new words")
+    parser.add_argument("--p-gain", type=float, default=0.1)
+    parser.add_argument("--session-size", type=int, default=None)
+    parser.add_argument("--engine", choices=['vectorized', 'session'], default='vectorized')
+    parser.add_argument("--from-db", default=None, help="Start from a spelling.db instead of new children")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args()
+
+    if args.from_db:
+        sim_state = recorded_state(args.from_db)
+        p_base = args.p_base if args.p_base is not None else recorded_accuracy(args.from_db)
+    else:
+        sim_state = synthetic_state(args.children, args.words, args.new_children_per_day, args.days)
+        p_base = args.p_base if args.p_base is not None else 0.6
+
+    started = time.perf_counter()
+    result = simulate(
+        sim_state, days=args.days,
+        scheduler=create_scheduler(args.algorithm) if args.algorithm else None,
+        participation=args.participation, p_base=p_base, p_gain=args.p_gain,
+        session_size=args.session_size, engine=args.engine, seed=args.seed
+    )
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_report(result)
+        print(f"\nSimulated {len(sim_state.child_of)} child/word pairs over {args.days} days in {elapsed:.2f}s")
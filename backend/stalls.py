@@ -0,0 +1,191 @@
+"""
+Phase 33: Event loop stall detector (debug mode, STALL_DETECTOR=1)
+Async handlers that call blocking code (sqlite, PBKDF2, file writes)
+hold the event loop and every other request waits. metrics.py shows that
+the loop lagged; this finds where.
+
+A heartbeat callback on the loop runs every STALL_INTERVAL_MS. A
+watchdog thread notices when it's overdue by more than
+STALL_THRESHOLD_MS. It then captures the loop thread's stack, which is
+the blocking code. It also notes which request (route template) or
+background task was running. When the loop gets back to the heartbeat
+the stall's length is known and it's added to a report grouped by
+endpoint and by blocking call site. See GET /api/admin/stalls.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+
+STALL_DETECTOR_ENABLED = os.getenv('STALL_DETECTOR', '0') == '1'
+STALL_THRESHOLD_MS = float(os.getenv('STALL_THRESHOLD_MS', '100'))
+STALL_INTERVAL_MS = 10
+
+# Stack frames kept per call site sample
+STACK_DEPTH = 12
+
+_BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+# Plumbing every query passes through - the interesting frame is the caller
+_SKIPPED_FILES = {os.path.join(_BACKEND_DIR, name) for name in ('stalls.py', 'profiler.py', 'queries.py')}
+
+# task -> ASGI scope of the request it is handling (see StallMiddleware)
+_task_scopes = {}
+
+
+class StallMiddleware:
+    """ASGI middleware remembering which request each task is handling"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        task = asyncio.current_task()
+        if scope['type'] != 'http' or task is None:
+            return await self.app(scope, receive, send)
+        _task_scopes[task] = scope
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _task_scopes.pop(task, None)
+
+
+def _describe(task) -> str:
+    """What a task is doing: 'METHOD /route/template', or the coroutine behind a background task"""
+    if task is None:
+        return '(loop callback)'
+    scope = _task_scopes.get(task)
+    if scope is not None:
+        route = scope.get('route')
+        return f"{scope['method']} {route.path if route is not None else scope['path']}"
+    coro = task.get_coro()
+    return f"task {getattr(coro, '__qualname__', task.get_name())}"
+
+
+def _call_site(stack) -> str:
+    """Innermost frame of our own code - the call that blocked (C code such as sqlite has no frame)"""
+    for frame in reversed(stack):
+        path = os.path.abspath(frame.filename)
+        if path.startswith(_BACKEND_DIR) and path not in _SKIPPED_FILES:
+            return f"{os.path.basename(path)}:{frame.lineno} {frame.name}"
+    last = stack[-1] if stack else None
+    return f"{os.path.basename(last.filename)}:{last.lineno} {last.name}" if last else '?'
+
+
+class StallDetector:
+    """Watches one event loop; start() on the loop, stop() when done"""
+
+    def __init__(self, threshold_ms: float = STALL_THRESHOLD_MS, interval_ms: float = STALL_INTERVAL_MS):
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self._lock = threading.Lock()
+        self._loop = None
+        self._loop_thread = None
+        self._last_beat = 0.0
+        self._pending = None
+        self._handle = None
+        self._running = threading.Event()
+        # endpoint -> {'stalls', 'total_ms', 'max_ms', 'sites': {site: {...}}}
+        self._endpoints = {}
+
+    def start(self, loop=None):
+        self._loop = loop or asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._handle = self._loop.call_later(self.interval, self._heartbeat)
+        self._running.set()
+        threading.Thread(target=self._watch, name='stall-watchdog', daemon=True).start()
+
+    def stop(self):
+        self._running.clear()
+        if self._handle is not None:
+            self._handle.cancel()
+
+    def _heartbeat(self):
+        now = time.perf_counter()
+        lag = now - self._last_beat - self.interval
+        self._last_beat = now
+        with self._lock:
+            pending, self._pending = self._pending, None
+        if pending is not None:
+            self._record(pending, lag * 1000)
+        if self._running.is_set():
+            self._handle = self._loop.call_later(self.interval, self._heartbeat)
+
+    def _watch(self):
+        while self._running.is_set():
+            time.sleep(self.interval / 2)
+            overdue = time.perf_counter() - self._last_beat - self.interval
+            if overdue < self.threshold or self._pending is not None:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+            stack = traceback.extract_stack(frame)[-STACK_DEPTH:]
+            pending = {
+                'endpoint': _describe(asyncio.current_task(self._loop)),
+                'site': _call_site(stack),
+                'stack': traceback.format_list(stack),
+            }
+            with self._lock:
+                if self._pending is None:
+                    self._pending = pending
+
+    def _record(self, stall, elapsed_ms: float):
+        with self._lock:
+            endpoint = self._endpoints.setdefault(
+                stall['endpoint'], {'stalls': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'sites': {}}
+            )
+            site = endpoint['sites'].setdefault(
+                stall['site'], {'stalls': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'stack': stall['stack']}
+            )
+            for entry in (endpoint, site):
+                entry['stalls'] += 1
+                entry['total_ms'] += elapsed_ms
+                entry['max_ms'] = max(entry['max_ms'], elapsed_ms)
+        print(f"Event loop stalled {elapsed_ms:.0f}ms in {stall['endpoint']} at {stall['site']}")
+
+    def report(self):
+        """Stalls per endpoint, worst total first, each with its blocking call sites"""
+        with self._lock:
+            endpoints = [
+                {
+                    'endpoint': name,
+                    'stalls': e['stalls'],
+                    'total_ms': round(e['total_ms'], 1),
+                    'max_ms': round(e['max_ms'], 1),
+                    'sites': sorted(
+                        ({'site': site, 'stalls': s['stalls'], 'total_ms': round(s['total_ms'], 1),
+                          'max_ms': round(s['max_ms'], 1), 'stack': list(s['stack'])}
+                         for site, s in e['sites'].items()),
+                        key=lambda s: s['total_ms'], reverse=True
+                    ),
+                }
+                for name, e in self._endpoints.items()
+            ]
+        return sorted(endpoints, key=lambda e: e['total_ms'], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+# The app's detector while STALL_DETECTOR=1 (started by the lifespan in main.py)
+detector = None
+
+
+def start(threshold_ms: float = STALL_THRESHOLD_MS) -> StallDetector:
+    """Start watching the running loop"""
+    global detector
+    detector = StallDetector(threshold_ms)
+    detector.start()
+    return detector
+
+
+def stop():
+    global detector
+    if detector is not None:
+        detector.stop()
+        detector = None
@@ -0,0 +1,90 @@
+"""
+Phase 25: Tests for the analytics snapshot replica
+"""
+
+import pytest
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import database
+from database import (
+    init_db, create_user, create_child, save_practice, get_practice_stats,
+    analytics_snapshot_path, analytics_snapshot_stamp
+)
+from analytics import refresh_snapshot, refresh_if_due
+
+DB_PATH = "../data/test_analytics.db"
+
+@pytest.fixture(autouse=True)
+def setup_test_db(monkeypatch):
+    """Setup test database (with analytics mode on) before each test"""
+    database.DB_PATH = DB_PATH
+    monkeypatch.setattr(database, 'ANALYTICS_MODE', True)
+    
+    for path in (DB_PATH, analytics_snapshot_path()):
+        if os.path.exists(path):
+            os.remove(path)
+    
+    init_db()
+    
+    yield
+    
+    for path in (DB_PATH, analytics_snapshot_path()):
+        if os.path.exists(path):
+            os.remove(path)
+
+@pytest.fixture
+def child_id():
+    return create_child(create_user("stats@example.com", "password"), "Stat")
+
+def test_dashboard_reads_snapshot(child_id):
+    """Test that stats come from the snapshot until it is refreshed"""
+    save_practice(1, child_id, "bee", True, None)
+    refresh_snapshot()
+    save_practice(1, child_id, "be", False, None)
+    
+    assert get_practice_stats()['total_practices'] == 1
+    
+    refresh_snapshot()
+    assert get_practice_stats()['total_practices'] == 2
+
+def test_falls_back_to_primary(child_id):
+    """Test fallback when the snapshot is missing, stale or analytics is off"""
+    save_practice(1, child_id, "bee", True, None)
+    assert analytics_snapshot_stamp() == ''
+    assert get_practice_stats()['total_practices'] == 1
+    
+    refresh_snapshot()
+    save_practice(1, child_id, "bee", True, None)
+    old = time.time() - (database.ANALYTICS_MAX_STALENESS_MINUTES * 60 + 5)
+    os.utime(analytics_snapshot_path(), (old, old))
+    assert analytics_snapshot_stamp() == ''
+    assert get_practice_stats()['total_practices'] == 2
+    
+    refresh_snapshot()
+    save_practice(1, child_id, "bee", True, None)
+    database.ANALYTICS_MODE = False
+    assert get_practice_stats()['total_practices'] == 3
+
+def test_refresh_if_due():
+    """Test that a fresh snapshot isn't copied again"""
+    assert refresh_if_due() is True
+    stamp = analytics_snapshot_stamp()
+    assert stamp.startswith('snapshot:')
+    assert refresh_if_due() is False
+    assert refresh_if_due(max_age_minutes=0) is True
+
+def test_snapshot_is_read_only():
+    """Test that dashboard connections can't write to the snapshot"""
+    import sqlite3
+    refresh_snapshot()
+    conn = database.get_analytics_db()
+    with pytest.raises(sqlite3.OperationalError):
+        conn.execute("DELETE FROM practices")
+    conn.close()
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,124 @@
+"""
+Phase 20: Tests for precompressed, fingerprinted static assets
+"""
+
+import gzip
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fastapi import Request
+from assets import AssetRegistry, IMMUTABLE_CACHE_CONTROL, _accepted_encodings
+
+SCRIPT = "function hello() { return 'hello'; }\n" * 40
+
+@pytest.fixture
+def registry(tmp_path):
+    """Registry over a small frontend directory"""
+    (tmp_path / "app.js").write_text(SCRIPT)
+    (tmp_path / "style.css").write_text("body { margin: 0; }\n")
+    (tmp_path / "index.html").write_text(
+        '<link rel="stylesheet" href="/static/style.css">\n'
+        '<script src="/static/app.js"></script>\n'
+        '<script src="/static/missing.js"></script>\n'
+    )
+    return AssetRegistry(str(tmp_path))
+
+def make_request(headers=None, method="GET"):
+    """Minimal ASGI request with the given headers"""
+    raw = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "method": method, "headers": raw, "path": "/", "query_string": b""})
+
+def test_html_references_fingerprinted_urls(registry):
+    """Test that HTML pages are rewritten to point at fingerprinted assets"""
+    html = registry.response(make_request(), "index.html").body.decode()
+
+    assert registry.url_for("app.js") in html
+    assert registry.url_for("style.css") in html
+    assert registry.url_for("app.js") != "/static/app.js"
+    # Unknown files are left alone
+    assert 'src="/static/missing.js"' in html
+
+def test_fingerprinted_url_is_immutable(registry):
+    """Test cache headers for fingerprinted vs plain URLs"""
+    fingerprinted = registry.url_for("app.js")[len("/static/"):]
+
+    immutable = registry.response(make_request(), fingerprinted)
+    assert immutable.status_code == 200
+    assert immutable.headers['cache-control'] == IMMUTABLE_CACHE_CONTROL
+
+    plain = registry.response(make_request(), "app.js")
+    assert plain.headers['cache-control'] == 'no-cache'
+    assert plain.body == SCRIPT.encode()
+
+def test_encoding_negotiation(registry):
+    """Test that the smallest accepted encoding is served"""
+    gz = registry.response(make_request({"Accept-Encoding": "gzip"}), "app.js")
+    assert gz.headers['content-encoding'] == 'gzip'
+    assert gz.headers['vary'] == 'Accept-Encoding'
+    assert gzip.decompress(gz.body) == SCRIPT.encode()
+
+    identity = registry.response(make_request({"Accept-Encoding": "gzip;q=0"}), "app.js")
+    assert 'content-encoding' not in identity.headers
+
+    # Tiny files aren't worth compressing
+    css = registry.response(make_request({"Accept-Encoding": "gzip"}), "style.css")
+    assert 'content-encoding' not in css.headers
+
+def test_brotli_preferred_when_available(registry):
+    """Test that brotli wins over gzip when both are accepted"""
+    brotli = pytest.importorskip("brotli")
+    response = registry.response(make_request({"Accept-Encoding": "gzip, deflate, br"}), "app.js")
+    assert response.headers['content-encoding'] == 'br'
+    assert brotli.decompress(response.body) == SCRIPT.encode()
+
+def test_etag_revalidation(registry):
+    """Test If-None-Match on an unchanged asset"""
+    etag = registry.response(make_request(), "index.html").headers['etag']
+    assert registry.response(make_request({"If-None-Match": etag}), "index.html").status_code == 304
+
+def test_unknown_asset_404(registry):
+    """Test that missing files return 404"""
+    assert registry.response(make_request(), "nope.js").status_code == 404
+
+def test_accepted_encodings():
+    """Test Accept-Encoding parsing"""
+    assert _accepted_encodings("gzip, br;q=0.5, deflate;q=0") == {"gzip", "br"}
+    assert _accepted_encodings(None) == set()
+
+def test_pages_served_through_pipeline():
+    """Test that the app serves pages and assets from the registry"""
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+    import main
+    client = TestClient(main.app)
+
+    page = client.get("/")
+    assert page.status_code == 200
+    url = main.static_assets.url_for("app.js")
+    assert url in page.text
+
+    asset = client.get(url)
+    assert asset.status_code == 200
+    assert asset.headers['cache-control'] == IMMUTABLE_CACHE_CONTROL
+
+def test_compressed_bodies_are_cached(tmp_path, registry):
+    """Test that a restart reuses compressed bodies from the cache directory"""
+    cache_dir = tmp_path / "cache"
+    first = AssetRegistry(registry.directory, cache_dir=str(cache_dir))
+    first.load()
+    cached = sorted(p.name for p in cache_dir.iterdir())
+    assert any(name.endswith(".gzip") for name in cached)
+
+    # Tamper with a cached body: a fresh registry must serve it unchanged
+    gzip_path = next(p for p in cache_dir.iterdir() if p.name.endswith(".gzip"))
+    marker = gzip.compress(SCRIPT.encode() + b"// cached\n", mtime=0)
+    gzip_path.write_bytes(marker)
+    second = AssetRegistry(registry.directory, cache_dir=str(cache_dir))
+    body = second.response(make_request({"Accept-Encoding": "gzip"}), "app.js").body
+    assert body == marker
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,202 @@
+"""
+Phase 14: Tests for batch practice submission
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from database import (
+    init_db, add_word, create_user, create_child, get_db,
+    save_practice_batch, get_submitted_practices
+)
+
+DB_PATH = "../data/test_batch_practice.db"
+
+@pytest.fixture(autouse=True)
+def setup_test_db():
+    """Setup test database before each test"""
+    import database
+    database.DB_PATH = DB_PATH
+    
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    
+    init_db()
+    
+    yield
+    
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+
+def make_record(key, word_id, child_id, is_correct=True):
+    return {
+        'idempotency_key': key,
+        'word_id': word_id,
+        'child_id': child_id,
+        'spelled_word': 'moth',
+        'is_correct': is_correct,
+        'drawing_filename': f"{key}.png"
+    }
+
+def count_rows(query, params=()):
+    conn = get_db()
+    count = conn.execute(query, params).fetchone()[0]
+    conn.close()
+    return count
+
+def test_batch_applies_all_records():
+    """Test that every record in a batch is saved"""
+    user_id = create_user("batch@test.com", "password")
+    child_id = create_child(user_id, "Child", 7)
+    word_id = add_word("moth", "insects")
+    
+    results = save_practice_batch(user_id, [
+        make_record("a", word_id, child_id, False),
+        make_record("b", word_id, child_id, True),
+    ])
+    
+    assert [r['status'] for r in results] == ['applied', 'applied']
+    assert count_rows("SELECT COUNT(*) FROM practices WHERE child_id = ?", (child_id,)) == 2
+    assert count_rows(
+        "SELECT successful_days FROM child_progress WHERE child_id = ? AND word_id = ?",
+        (child_id, word_id)
+    ) == 1
+
+def test_batch_retry_is_idempotent():
+    """Test that resubmitting the same keys does not duplicate practices"""
+    user_id = create_user("batch@test.com", "password")
+    child_id = create_child(user_id, "Child", 7)
+    word_id = add_word("moth", "insects")
+    batch = [make_record("a", word_id, child_id), make_record("b", word_id, child_id, False)]
+    
+    first = save_practice_batch(user_id, batch)
+    second = save_practice_batch(user_id, batch + [make_record("c", word_id, child_id, False)])
+    
+    assert [r['status'] for r in second] == ['duplicate', 'duplicate', 'applied']
+    assert second[0]['practice_id'] == first[0]['practice_id']
+    assert count_rows("SELECT COUNT(*) FROM practices") == 3
+    assert set(get_submitted_practices(user_id, ["a", "b", "c", "zzz"])) == {"a", "b", "c"}
+
+def test_batch_duplicate_key_within_batch():
+    """Test that a key repeated inside one batch is only applied once"""
+    user_id = create_user("batch@test.com", "password")
+    child_id = create_child(user_id, "Child", 7)
+    word_id = add_word("moth", "insects")
+    
+    results = save_practice_batch(user_id, [
+        make_record("a", word_id, child_id),
+        make_record("a", word_id, child_id),
+    ])
+    
+    assert [r['status'] for r in results] == ['applied', 'duplicate']
+    assert count_rows("SELECT COUNT(*) FROM practices") == 1
+
+def test_batch_is_all_or_nothing():
+    """Test that a bad record rolls back the whole batch"""
+    user_id = create_user("batch@test.com", "password")
+    child_id = create_child(user_id, "Child", 7)
+    word_id = add_word("moth", "insects")
+    
+    with pytest.raises(ValueError, match="not found"):
+        save_practice_batch(user_id, [
+            make_record("a", word_id, child_id),
+            make_record("b", 9999, child_id),
+        ])
+    
+    assert count_rows("SELECT COUNT(*) FROM practices") == 0
+    assert count_rows("SELECT COUNT(*) FROM practice_submissions") == 0
+    assert count_rows("SELECT COUNT(*) FROM child_progress") == 0
+
+def test_keys_are_scoped_per_user():
+    """Test that two users can reuse the same idempotency key"""
+    user1_id = create_user("one@test.com", "password")
+    user2_id = create_user("two@test.com", "password")
+    child1_id = create_child(user1_id, "Child 1", 7)
+    child2_id = create_child(user2_id, "Child 2", 7)
+    word_id = add_word("moth", "insects")
+    
+    save_practice_batch(user1_id, [make_record("a", word_id, child1_id)])
+    results = save_practice_batch(user2_id, [make_record("a", word_id, child2_id)])
+    
+    assert results[0]['status'] == 'applied'
+    assert count_rows("SELECT COUNT(*) FROM practices") == 2
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 10
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    """TestClient, auth headers and a child for POST /api/practice/batch, drawings in tmp_path"""
+    from fastapi.testclient import TestClient
+    from auth import create_access_token
+    import main
+    
+    monkeypatch.setattr(main, 'drawings_dir', str(tmp_path))
+    user_id = create_user("batch-api@test.com", "password")
+    child_id = create_child(user_id, "Child", 7)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+    return TestClient(main.app), headers, child_id, tmp_path
+
+def post_batch(client, headers, records, drawings=()):
+    import json
+    files = [("drawings", (name, PNG, "image/png")) for name in drawings]
+    return client.post("/api/practice/batch", headers=headers,
+                       data={"records": json.dumps(records)}, files=files or None)
+
+def api_record(key, word_id, child_id, drawing=None):
+    return {'idempotency_key': key, 'word_id': word_id, 'child_id': child_id,
+            'spelled_word': 'bee', 'drawing': drawing}
+
+def test_batch_endpoint_retry_returns_earlier_results(api):
+    """Test that retrying the same keys returns the first results and writes no new drawings"""
+    client, headers, child_id, drawings = api
+    records = [api_record("a", 1, child_id, "a.png"), api_record("b", 1, child_id, "b.png")]
+    
+    first = post_batch(client, headers, records, ["a.png", "b.png"])
+    assert first.status_code == 200
+    assert first.json()['applied'] == 2
+    assert len(os.listdir(drawings)) == 2
+    
+    retry = post_batch(client, headers, records, ["a.png", "b.png"])
+    assert retry.status_code == 200
+    assert (retry.json()['applied'], retry.json()['duplicates']) == (0, 2)
+    assert [r['practice_id'] for r in retry.json()['results']] == [r['practice_id'] for r in first.json()['results']]
+    assert len(os.listdir(drawings)) == 2
+    assert count_rows("SELECT COUNT(*) FROM practices") == 2
+
+def test_batch_endpoint_rejects_bad_requests(api):
+    """Test the 403 / 404 / 400 paths, none of which write anything"""
+    import main
+    client, headers, child_id, drawings = api
+    other_child = create_child(create_user("other@test.com", "password"), "Other", 7)
+    
+    assert post_batch(client, headers, [api_record("a", 1, other_child)]).status_code == 403
+    assert post_batch(client, headers, [api_record("a", 9999, child_id)]).status_code == 404
+    missing = post_batch(client, headers, [api_record("a", 1, child_id, "a.png")])
+    assert missing.status_code == 400
+    assert "Missing drawing upload" in missing.json()['detail']
+    too_many = [api_record(str(i), 1, child_id) for i in range(main.MAX_PRACTICE_BATCH_SIZE + 1)]
+    assert post_batch(client, headers, too_many).status_code == 400
+    assert post_batch(client, headers, []).status_code == 400
+    
+    assert count_rows("SELECT COUNT(*) FROM practices") == 0
+    assert os.listdir(drawings) == []
+
+def test_batch_endpoint_removes_drawings_when_write_fails(api, monkeypatch):
+    """Test that drawings written for a batch are deleted if the transaction fails"""
+    import main
+    client, headers, child_id, drawings = api
+    
+    def fail(user_id, records):
+        assert all(os.path.exists(os.path.join(drawings, r['drawing_filename'])) for r in records)
+        raise ValueError("Word 1 not found")
+    monkeypatch.setattr(main, 'save_practice_batch', fail)
+    
+    response = post_batch(client, headers, [api_record("a", 1, child_id, "a.png")], ["a.png"])
+    assert response.status_code == 400
+    assert os.listdir(drawings) == []
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
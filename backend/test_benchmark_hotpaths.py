@@ -0,0 +1,42 @@
+"""
+Phase 35: Tests for the hot path microbenchmark suite
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import database
+from benchmark_hotpaths import DATABASE_BENCHMARKS, run_suite, compare, save_baseline, load_baseline
+
+def test_suite_runs_every_database_benchmark_per_size():
+    """Test a quick run over two tiny datasets"""
+    original_path = database.DB_PATH
+    report = run_suite(sizes=('tiny', 'tiny2'), only=[name for name, _ in DATABASE_BENCHMARKS],
+                       samples=2, min_time=0.001, size_table={'tiny': (20, 100), 'tiny2': (40, 200)})
+
+    assert database.DB_PATH == original_path
+    expected = {f'{name}[{size}]' for name, _ in DATABASE_BENCHMARKS for size in ('tiny', 'tiny2')}
+    assert set(report['results']) == expected
+    for result in report['results'].values():
+        assert 0 < result['min_us'] <= result['median_us']
+        assert result['samples'] == 2
+    assert report['meta']['sizes'] == {'tiny': (20, 100), 'tiny2': (40, 200)}
+
+def test_compare_against_saved_baseline(tmp_path):
+    """Test the round trip through a baseline file and the change classification"""
+    def report(**medians):
+        return {'meta': {}, 'results': {k: {'median_us': v} for k, v in medians.items()}}
+
+    path = save_baseline(report(a=100.0, b=100.0, c=100.0, gone=5.0), str(tmp_path / 'before.json'))
+    rows = compare(load_baseline(path), report(a=150.0, b=80.0, c=105.0, added=1.0), threshold=0.10)
+
+    assert [(r['benchmark'], r['status']) for r in rows] == [
+        ('a', 'slower'), ('b', 'faster'), ('c', 'same'), ('added', 'new')
+    ]
+    assert rows[0]['ratio'] == 1.5
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,128 @@
+"""
+Phase 24: Tests for columnar analytics export
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+np = pytest.importorskip("numpy")
+
+from database import init_db, add_word, create_user, create_child, save_practice, get_db
+from columnar_export import export_columnar, iter_column_chunks
+
+DB_PATH = "../data/test_columnar_export.db"
+
+@pytest.fixture(autouse=True)
+def setup_test_db():
+    """Setup test database before each test"""
+    import database
+    database.DB_PATH = DB_PATH
+    
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    
+    init_db()
+    
+    yield
+    
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+
+@pytest.fixture
+def practices():
+    """Seven practices over two words for one child"""
+    child_id = create_child(create_user("cols@example.com", "password"), "Cole")
+    ant = add_word("ant", "insects")
+    cat = add_word("cat", "pets")
+    for i in range(7):
+        word_id = ant if i % 2 else cat
+        save_practice(word_id, child_id, "x", i % 3 == 0, None)
+    return {'child_id': child_id, 'ant': ant, 'cat': cat}
+
+def test_chunks_cover_all_rows(practices):
+    """Test keyset chunking and dictionary codes"""
+    chunks = list(iter_column_chunks('practices', chunk_rows=3))
+    
+    assert [len(c['id']) for c in chunks] == [3, 3, 1]
+    ids = np.concatenate([c['id'] for c in chunks])
+    assert list(ids) == sorted(ids)
+    assert all(c['word'].dtype == np.int32 for c in chunks)
+
+def test_npz_export(practices, tmp_path):
+    """Test the NumPy fallback format round trip"""
+    result = export_columnar(str(tmp_path), fmt='npz', chunk_rows=2)
+    
+    assert result['practices']['rows'] == 7
+    data = np.load(result['practices']['path'])
+    words = data['word_dictionary'][data['word']]
+    categories = data['category_dictionary'][data['category']]
+    
+    assert list(words) == ['cat', 'ant', 'cat', 'ant', 'cat', 'ant', 'cat']
+    assert set(categories) == {'insects', 'pets'}
+    assert list(data['is_correct']) == [i % 3 == 0 for i in range(7)]
+    assert data['practiced_date'].dtype.kind == 'M'
+    
+    # Core words have no owner
+    assert list(np.load(result['words']['path'])['user_id'][:3]) == [-1, -1, -1]
+
+def test_parquet_and_arrow_export(practices, tmp_path):
+    """Test Parquet / Arrow output with dictionary-encoded columns"""
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+    
+    parquet = export_columnar(str(tmp_path), ['practices', 'words'], fmt='parquet', chunk_rows=3)
+    table = pq.read_table(parquet['practices']['path'])
+    assert table.num_rows == 7
+    assert pa.types.is_dictionary(table.schema.field('word').type)
+    assert table.column('word').to_pylist()[:2] == ['cat', 'ant']
+    
+    arrow = export_columnar(str(tmp_path), ['child_progress'], fmt='arrow')
+    with pa.ipc.open_file(arrow['child_progress']['path']) as reader:
+        assert reader.read_all().num_rows == 0
+
+def test_deleted_word_is_null_code(practices, tmp_path):
+    """Test rows whose word no longer exists get code -1"""
+    conn = get_db()
+    conn.execute("DELETE FROM words WHERE id = ?", (practices['ant'],))
+    conn.commit()
+    conn.close()
+    
+    data = np.load(export_columnar(str(tmp_path), ['practices'], fmt='npz')['practices']['path'])
+    assert list(data['word']).count(-1) == 3
+
+def test_sharded_export(tmp_path, monkeypatch):
+    """Test family words on shards, whose ids start at (shard + 1) << 40"""
+    import io
+    import sharding
+    from word_import import import_words
+    monkeypatch.setattr(sharding, 'SHARD_COUNT', 2)
+    monkeypatch.setattr(sharding, 'SHARD_DIR', str(tmp_path / "shards"))
+    init_db()
+    
+    user_id = create_user("shard-cols@example.com", "password")
+    child_id = create_child(user_id, "Sol")
+    import_words(io.StringIO("word,category\nwombat,animals\n"), 'csv', user_id=user_id)
+    conn = get_db(user_id=user_id)
+    wombat = conn.execute("SELECT id FROM words WHERE word = 'wombat'").fetchone()[0]
+    conn.close()
+    assert wombat >= 1 << 40
+    save_practice(wombat, child_id, "wombat", True, None)
+    save_practice(1, child_id, "bee", True, None)
+    
+    result = export_columnar(str(tmp_path / "out"), ['practices', 'words'], fmt='npz')
+    data = np.load(result['practices']['path'])
+    assert list(data['word_dictionary'][data['word']]) == ['wombat', 'bee']
+    assert 'wombat' in list(np.load(result['words']['path'])['word_dictionary'])
+
+def test_invalid_arguments(tmp_path):
+    """Test unknown formats and datasets"""
+    with pytest.raises(ValueError):
+        export_columnar(str(tmp_path), fmt='csv')
+    with pytest.raises(ValueError):
+        export_columnar(str(tmp_path), ['users'], fmt='npz')
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,93 @@
+"""
+Phase 36: Tests for the synthetic dataset generator
+"""
+
+import pytest
+import sys
+import os
+import sqlite3
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import database
+from datagen import generate, misspell
+
+END = date(2026, 3, 1)
+
+def _dump(path):
+    conn = sqlite3.connect(path)
+    rows = conn.execute("SELECT * FROM practices ORDER BY id").fetchall()
+    conn.close()
+    return rows
+
+def test_generated_database_is_consistent(tmp_path):
+    """Test row counts, references and the derived child_progress"""
+    path = str(tmp_path / "gen.db")
+    result = generate(path, users=10, children_per_user=(1, 2), core_words=30, custom_words_per_user=(2, 4),
+                      practices_per_child=50, months=2, end_date=END)
+
+    conn = sqlite3.connect(path)
+    count = lambda sql: conn.execute(sql).fetchone()[0]
+    assert count("SELECT COUNT(*) FROM users") == 10
+    assert 10 <= count("SELECT COUNT(*) FROM children") == result['children'] <= 20
+    assert count("SELECT COUNT(*) FROM practices") == result['practices'] > 0
+    assert count("SELECT COUNT(*) FROM words WHERE user_id IS NULL") == 33
+    # Every practice is on a core word or one of the child's family's words
+    assert count("""
+        SELECT COUNT(*) FROM practices p JOIN children c ON c.id = p.child_id JOIN words w ON w.id = p.word_id
+        WHERE w.user_id IS NOT NULL AND w.user_id != c.user_id
+    """) == 0
+    assert count(f"SELECT MIN(DATE(practiced_date)) FROM practices") >= (END - timedelta(days=59)).isoformat()
+    assert count(f"SELECT MAX(DATE(practiced_date)) FROM practices") <= END.isoformat()
+    # successful_days counts the distinct days with a correct answer
+    assert conn.execute("""
+        SELECT COUNT(*) FROM child_progress cp WHERE successful_days != (
+            SELECT COUNT(DISTINCT DATE(practiced_date)) FROM practices p
+            WHERE p.child_id = cp.child_id AND p.word_id = cp.word_id AND p.is_correct = 1)
+    """).fetchone()[0] == 0
+    assert count("SELECT COUNT(*) FROM child_progress") == result['child_progress']
+    assert count("""
+        SELECT COUNT(*) FROM practices p JOIN words w ON w.id = p.word_id
+        WHERE p.is_correct = 0 AND p.spelled_word = w.word
+    """) == 0
+    conn.close()
+
+def test_same_seed_same_data(tmp_path):
+    """Test that generation is deterministic for a seed"""
+    paths = [str(tmp_path / f"{name}.db") for name in ("a", "b", "c")]
+    for path, seed in zip(paths, (1, 1, 2)):
+        generate(path, users=5, core_words=10, practices_per_child=20, seed=seed, end_date=END)
+    assert _dump(paths[0]) == _dump(paths[1])
+    assert _dump(paths[0]) != _dump(paths[2])
+
+def test_app_works_on_generated_data(tmp_path):
+    """Test login and the hot paths against a generated database, with drawings"""
+    path = str(tmp_path / "app.db")
+    drawings = tmp_path / "drawings"
+    result = generate(path, users=3, core_words=10, practices_per_child=10, drawing_rate=0.5,
+                      drawings_dir=str(drawings))
+    assert result['drawings'] == len(os.listdir(drawings)) > 0
+
+    original_path = database.DB_PATH
+    database.DB_PATH = path
+    try:
+        user = database.get_user_by_email("user2@example.com")
+        assert database.verify_password("password", user['password_hash'])
+        child = database.get_user_children(user['id'])[0]
+        assert database.get_words_for_child(child['id'])
+        assert database.get_practice_stats()['total_practices'] == result['practices']
+    finally:
+        database.close_pool()
+        database.DB_PATH = original_path
+
+def test_misspell_changes_the_word():
+    """Test that a generated misspelling never equals the word"""
+    import numpy as np
+    rng = np.random.default_rng(0)
+    for word in ("bee", "spider", "butterfly", "ox"):
+        for _ in range(20):
+            assert misspell(word, rng) != word
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
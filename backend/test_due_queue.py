@@ -0,0 +1,112 @@
+"""
+Phase 16: Tests for the precomputed daily due queue
+"""
+
+import pytest
+import sys
+import os
+import io
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from database import (
+    init_db, add_word, delete_word, create_user, create_child, get_db,
+    get_words_for_child, update_word_on_success_for_child, build_due_queues
+)
+
+DB_PATH = "../data/test_due_queue.db"
+
+@pytest.fixture(autouse=True)
+def setup_test_db():
+    """Setup test database before each test"""
+    import database
+    database.DB_PATH = DB_PATH
+    
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    
+    init_db()
+    
+    yield
+    
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+
+def queue_size(child_id):
+    conn = get_db()
+    count = conn.execute("SELECT COUNT(*) FROM due_queue WHERE child_id = ?", (child_id,)).fetchone()[0]
+    conn.close()
+    return count
+
+def test_first_read_builds_queue():
+    """Test that the first read builds the queue with every due word"""
+    user_id = create_user("parent@test.com", "password")
+    child_id = create_child(user_id, "Child", 7)
+    
+    words = get_words_for_child(child_id)
+    
+    assert [w['word'] for w in words] == ['bee', 'butterfly', 'spider']
+    assert all(w['successful_days'] == 0 for w in words)
+    assert queue_size(child_id) == 3
+
+def test_success_removes_word_from_queue():
+    """Test that a correct answer patches the queue"""
+    user_id = create_user("parent@test.com", "password")
+    child_id = create_child(user_id, "Child", 7)
+    words = get_words_for_child(child_id)
+    
+    update_word_on_success_for_child(words[0]['id'], child_id)
+    
+    remaining = get_words_for_child(child_id)
+    assert words[0]['id'] not in [w['id'] for w in remaining]
+    assert len(remaining) == 2
+
+def test_add_and_delete_word_patch_built_queues():
+    """Test that new words join built queues and deleted words leave them"""
+    user_id = create_user("parent@test.com", "password")
+    child_id = create_child(user_id, "Child", 7)
+    get_words_for_child(child_id)
+    
+    word_id = add_word("wasp", "insects")
+    assert word_id in [w['id'] for w in get_words_for_child(child_id)]
+    
+    delete_word(word_id)
+    assert word_id not in [w['id'] for w in get_words_for_child(child_id)]
+
+def test_queues_are_isolated_per_family():
+    """Test that family custom words only reach that family's children"""
+    user1_id = create_user("one@test.com", "password")
+    user2_id = create_user("two@test.com", "password")
+    child1_id = create_child(user1_id, "Child 1", 7)
+    child2_id = create_child(user2_id, "Child 2", 7)
+    
+    from word_import import import_words
+    import_words(io.StringIO("word,category\nkoala,animals\n"), 'csv', user_id=user1_id)
+    
+    assert 'koala' in [w['word'] for w in get_words_for_child(child1_id)]
+    assert 'koala' not in [w['word'] for w in get_words_for_child(child2_id)]
+
+def test_nightly_build_uses_progress_and_drops_old_days():
+    """Test building every child's queue for a future day"""
+    user_id = create_user("parent@test.com", "password")
+    child_id = create_child(user_id, "Child", 7)
+    words = get_words_for_child(child_id)
+    update_word_on_success_for_child(words[0]['id'], child_id)
+    
+    # Word comes back once its next_review (today + 2 days) is reached
+    in_two_days = (date.today() + timedelta(days=2)).isoformat()
+    assert build_due_queues(in_two_days) == 1
+    
+    conn = get_db()
+    rows = conn.execute(
+        "SELECT queue_date, word_id, successful_days FROM due_queue WHERE child_id = ?",
+        (child_id,)
+    ).fetchall()
+    conn.close()
+    
+    assert {r[0] for r in rows} == {in_two_days}
+    assert (in_two_days, words[0]['id'], 1) in [tuple(r) for r in rows]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,128 @@
+"""
+Phase 23: Tests for streaming NDJSON / CSV export
+"""
+
+import csv
+import io
+import json
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from database import (
+    init_db, get_db, create_user, create_child,
+    save_practice, update_word_on_success_for_child
+)
+from export import stream_export, iter_export_rows
+
+DB_PATH = "../data/test_export.db"
+
+@pytest.fixture(autouse=True)
+def setup_test_db():
+    """Setup test database before each test"""
+    import database
+    database.DB_PATH = DB_PATH
+    
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    
+    init_db()
+    
+    yield
+    
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+
+@pytest.fixture
+def family():
+    """Two families, each with a child, a custom word and some practices"""
+    ids = {}
+    for name in ('smith', 'jones'):
+        user_id = create_user(f"{name}@example.com", "password")
+        child_id = create_child(user_id, name.title())
+        conn = get_db()
+        word_id = conn.execute(
+            "INSERT INTO words (word, category, user_id) VALUES (?, 'custom', ?)", (f"{name}word", user_id)
+        ).lastrowid
+        conn.commit()
+        conn.close()
+        for i in range(5):
+            save_practice(word_id, child_id, f"try{i}", i == 4, None)
+        update_word_on_success_for_child(word_id, child_id)
+        ids[name] = user_id
+    return ids
+
+def test_ndjson_export_is_scoped_to_family(family):
+    """Test that one family never sees another family's rows"""
+    body = b''.join(stream_export('practices', family['smith'], 'ndjson'))
+    rows = [json.loads(line) for line in body.splitlines()]
+    
+    assert len(rows) == 5
+    assert {r['child_name'] for r in rows} == {'Smith'}
+    assert [r['spelled_word'] for r in rows] == [f"try{i}" for i in range(5)]
+    
+    words = [json.loads(l) for l in b''.join(stream_export('words', family['jones'])).splitlines()]
+    assert [w['word'] for w in words] == ['jonesword']
+
+def test_csv_export_has_single_header(family):
+    """Test CSV output across several chunks"""
+    body = b''.join(stream_export('practices', family['smith'], 'csv', chunk_rows=2)).decode()
+    rows = list(csv.reader(io.StringIO(body)))
+    
+    assert rows[0][:3] == ['id', 'child_id', 'child_name']
+    assert len(rows) == 6
+    
+    progress = list(csv.reader(io.StringIO(b''.join(stream_export('child_progress', family['jones'], 'csv')).decode())))
+    assert len(progress) == 2
+    assert progress[1][progress[0].index('successful_days')] == '1'
+
+def test_empty_csv_export_has_header():
+    """Test that an export with no rows is still a valid CSV"""
+    user_id = create_user("empty@example.com", "password")
+    body = b''.join(stream_export('practices', user_id, 'csv')).decode()
+    assert body.startswith('id,child_id,child_name')
+    assert len(body.splitlines()) == 1
+
+def test_chunks_do_not_block_writers(family):
+    """Test that a paused export holds no lock, so writes still commit"""
+    chunks = iter_export_rows('practices', family['smith'], chunk_rows=2)
+    next(chunks)
+    
+    conn = get_db()
+    conn.execute("PRAGMA busy_timeout = 0")
+    conn.execute("INSERT INTO words (word, category) VALUES ('lockfree', 'test')")
+    conn.commit()
+    conn.close()
+    
+    assert sum(len(rows) for _, rows in chunks) == 3
+
+def test_unknown_dataset_and_format():
+    """Test validation of dataset and format names"""
+    with pytest.raises(ValueError):
+        list(stream_export('users', 1))
+    with pytest.raises(ValueError):
+        list(stream_export('words', 1, 'xml'))
+
+def test_export_endpoint(family):
+    """Test the streaming endpoint with auth"""
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+    from auth import create_access_token
+    import main
+    client = TestClient(main.app)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(family['smith'])})}"}
+    
+    response = client.get("/api/export/practices", params={"format": "csv"}, headers=headers)
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/csv')
+    assert 'attachment' in response.headers['content-disposition']
+    assert len(response.text.splitlines()) == 6
+    
+    assert client.get("/api/export/users", headers=headers).status_code == 404
+    assert client.get("/api/export/words", params={"format": "xml"}, headers=headers).status_code == 400
+    assert client.get("/api/export/words").status_code == 401
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
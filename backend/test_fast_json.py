@@ -0,0 +1,93 @@
+"""
+Phase 21: Tests for the fast JSON response path
+"""
+
+import json
+import pytest
+import sys
+import os
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from pydantic import BaseModel
+from database import init_db, get_db, get_all_words, fetch_dicts
+from fast_json import render_json, FastJSONResponse
+
+DB_PATH = "../data/test_fast_json.db"
+
+@pytest.fixture(autouse=True)
+def setup_test_db():
+    """Setup test database before each test"""
+    import database
+    database.DB_PATH = DB_PATH
+    
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    
+    init_db()
+    
+    yield
+    
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+
+class Point(BaseModel):
+    x: int
+    y: int
+
+def test_render_json_matches_default_encoding():
+    """Test that render_json produces the same JSON as FastAPI's default path"""
+    data = {
+        'word': 'café',
+        'day': date(2024, 3, 1),
+        'at': datetime(2024, 3, 1, 9, 30),
+        'ok': True,
+        'score': 87.5,
+        'missing': None,
+        'point': Point(x=1, y=2),
+    }
+    decoded = json.loads(render_json(data))
+    assert decoded == {
+        'word': 'café',
+        'day': '2024-03-01',
+        'at': '2024-03-01T09:30:00',
+        'ok': True,
+        'score': 87.5,
+        'missing': None,
+        'point': {'x': 1, 'y': 2},
+    }
+    assert b' ' not in render_json([1, 2, 3])
+
+def test_render_json_non_string_keys():
+    """Test that integer keys serialize like json.dumps would"""
+    assert json.loads(render_json({1: 'a'})) == {'1': 'a'}
+
+def test_fetch_dicts_matches_row_copies():
+    """Test that fetch_dicts returns the same data as dict(row)"""
+    conn = get_db()
+    rows = [dict(r) for r in conn.execute("SELECT * FROM words ORDER BY id").fetchall()]
+    fast = fetch_dicts(conn.execute("SELECT * FROM words ORDER BY id"))
+    conn.close()
+    
+    assert fast == rows
+    assert all(type(r) is dict for r in fast)
+    assert get_all_words() == [{k: r[k] for k in ('id', 'word', 'category')} for r in rows]
+
+def test_fast_json_response_body():
+    """Test the default response class"""
+    response = FastJSONResponse({"words": [{"id": 1, "word": "bee"}]})
+    assert response.media_type == 'application/json'
+    assert json.loads(response.body) == {"words": [{"id": 1, "word": "bee"}]}
+
+def test_benchmark_runs():
+    """Test that the serialization benchmark runs and agrees on output"""
+    from benchmark_json import run_benchmark
+    results = run_benchmark(num_words=50, num_practices=200, repeat=1)
+    assert [r['endpoint'] for r in results][:4] == [
+        '/api/words', '/api/words?limit=100', '/api/admin/words', '/api/admin/words?limit=100'
+    ]
+    assert all(r['bytes'] > 0 for r in results)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
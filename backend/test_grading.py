@@ -0,0 +1,101 @@
+"""
+Phase 37: Tests for server-side grading
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import database
+from grading import grade, normalize, regrade_practices
+from database import init_db, add_word, create_user, create_child, save_practice, get_db
+
+DB_PATH = "../data/test_grading.db"
+
+@pytest.fixture(autouse=True)
+def setup_test_db():
+    """Setup test database before each test"""
+    database.DB_PATH = DB_PATH
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    init_db()
+    yield
+    database.close_pool()
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+
+def _errors(word, spelled):
+    return [(e['type'], e['position'], e['expected'], e['spelled']) for e in grade(word, spelled)['errors']]
+
+def test_error_types_are_classified():
+    """Test each error type and its position in the word"""
+    assert _errors("field", "feild") == [('transposition', 1, 'ie', 'ei')]
+    assert _errors("butterfly", "buterfly") == [('omission', 3, 't', '')]
+    assert _errors("bee", "beee") == [('insertion', 3, '', 'e')]
+    assert _errors("spider", "spidar") == [('substitution', 4, 'e', 'a')]
+    assert _errors("bee", "") == [('omission', 0, 'b', ''), ('omission', 1, 'e', ''), ('omission', 2, 'e', '')]
+    result = grade("moth", "mtoh")
+    assert result['distance'] == 1 and not result['is_correct']
+
+def test_normalization():
+    """Test that case, spacing, Unicode forms and curly apostrophes don't count as errors"""
+    assert normalize("  Ice   Cream ") == "ice cream"
+    assert grade("Bee", " bEE ")['is_correct']
+    assert grade("café", "café")['is_correct']
+    assert grade("don't", "don’t")['is_correct']
+    assert grade("ＢＥＥ", "bee")['is_correct']
+
+def test_practice_is_graded_by_the_server():
+    """Test that the API ignores the client's is_correct"""
+    from fastapi.testclient import TestClient
+    from auth import create_access_token
+    import main
+
+    user_id = create_user("grade@example.com", "password")
+    child_id = create_child(user_id, "Ada")
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+    client = TestClient(main.app)
+    png = b"\x89PNG\r\n\x1a\n" + b"\x00" * 10
+
+    def submit(spelled, claimed):
+        response = client.post("/api/practice", headers=headers, files={"drawing": ("d.png", png, "image/png")},
+                               data={"word_id": 1, "spelled_word": spelled, "is_correct": claimed, "child_id": child_id})
+        assert response.status_code == 200
+        os.remove(os.path.join(main.drawings_dir, response.json()['drawing_filename']))
+        return response.json()
+
+    wrong = submit("bea", "true")
+    assert wrong['is_correct'] is False
+    assert wrong['errors'] == [{'type': 'substitution', 'position': 2, 'expected': 'e', 'spelled': 'a'}]
+    assert submit("BEE", "false")['is_correct'] is True
+
+    conn = get_db()
+    stored = [row[0] for row in conn.execute("SELECT is_correct FROM practices ORDER BY id")]
+    progress = conn.execute("SELECT COUNT(*) FROM child_progress WHERE child_id = ?", (child_id,)).fetchone()[0]
+    conn.close()
+    assert stored == [0, 1]
+    assert progress == 1
+
+def test_regrade_fixes_history():
+    """Test the batch regrade, its dry run and the chunking"""
+    user_id = create_user("regrade@example.com", "password")
+    child_id = create_child(user_id, "Ben")
+    word_id = add_word("field", "nature")
+    save_practice(word_id, child_id, "feild", True, None)
+    save_practice(word_id, child_id, "Field", False, None)
+    save_practice(word_id, child_id, "field", True, None)
+
+    dry = regrade_practices(dry_run=True, chunk_size=2)
+    assert (dry['checked'], dry['changed'], dry['now_correct'], dry['now_incorrect']) == (3, 2, 1, 1)
+    assert dry['errors']['transposition'] == 1
+
+    assert regrade_practices(chunk_size=2)['changed'] == 2
+    assert regrade_practices()['changed'] == 0
+    conn = get_db()
+    assert [row[0] for row in conn.execute("SELECT is_correct FROM practices ORDER BY id")] == [0, 1, 1]
+    conn.close()
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,45 @@
+"""
+Phase 34: Tests for the end-to-end load test harness
+"""
+
+import pytest
+import sys
+import os
+import socket
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import database
+from loadtest import STEPS, run_loadtest, check_thresholds
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def test_short_run_covers_every_step_without_errors():
+    """Test a small run against a server on a throwaway database"""
+    original_path = database.DB_PATH
+    summary = run_loadtest(families=3, duration=3, num_words=3, port=_free_port(), core_words=10)
+
+    assert database.DB_PATH == original_path
+    assert summary['errors'] == 0, summary['error_samples']
+    assert summary['sessions'] >= 3
+    assert set(summary['steps']) == set(STEPS)
+    assert summary['steps']['practice']['requests'] >= summary['sessions']
+    for step in summary['steps'].values():
+        assert 0 < step['p50_ms'] <= step['p95_ms'] <= step['p99_ms'] <= step['max_ms']
+    assert check_thresholds(summary, max_error_rate=0) == []
+
+def test_thresholds_report_violations():
+    """Test that slow steps and errors are reported as failures"""
+    summary = {
+        'error_rate': 0.05,
+        'steps': {'practice': {'p95_ms': 300.0}, 'next_word': {'p95_ms': 40.0}},
+    }
+    failures = check_thresholds(summary, max_p95_ms=250, max_error_rate=0.01)
+    assert failures == ["error rate 5.00% > 1.00%", "practice p95 300.0ms > 250ms"]
+    assert check_thresholds(summary) == []
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,109 @@
+"""
+Phase 32: Tests for the Prometheus /metrics endpoint
+"""
+
+import pytest
+import sys
+import os
+import re
+import time
+import asyncio
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import database
+import metrics
+from database import init_db, create_user, create_child
+
+DB_PATH = "../data/test_metrics.db"
+SAMPLE_LINE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{.*\})? [0-9.e+-]+$')
+
+@pytest.fixture(autouse=True)
+def setup_test_db():
+    """Setup test database before each test"""
+    database.DB_PATH = DB_PATH
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    init_db()
+    yield
+    database.close_pool()
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+    import main
+    return TestClient(main.app)
+
+@pytest.fixture
+def auth():
+    from auth import create_access_token
+    user_id = create_user("metrics@example.com", "password")
+    child_id = create_child(user_id, "Ada")
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}, child_id
+
+def _samples(text):
+    """{(name, labels): value} for every sample line; fails on a malformed line"""
+    samples = {}
+    for line in text.splitlines():
+        if line.startswith('#'):
+            continue
+        assert SAMPLE_LINE.match(line), line
+        series, value = line.rsplit(' ', 1)
+        samples[series] = float(value)
+    return samples
+
+def test_latency_is_labelled_by_route_template(client, auth):
+    """Test that requests are grouped by route template, not by the filled-in path"""
+    headers, child_id = auth
+    for age in (6, 7):
+        assert client.put(f"/api/children/{child_id}", headers=headers, json={"age": age}).status_code == 200
+    client.put("/api/children/999999", headers=headers, json={"age": 7})
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith("text/plain; version=0.0.4")
+    samples = _samples(response.text)
+    pid = os.getpid()
+    route = f'method="PUT",route="/api/children/{{child_id}}",pid="{pid}"'
+    assert samples[f'http_request_duration_seconds_count{{{route}}}'] >= 3
+    assert samples[f'http_request_duration_seconds_bucket{{{route},le="+Inf"}}'] >= 3
+    assert samples[f'http_requests_total{{method="PUT",route="/api/children/{{child_id}}",status="200",pid="{pid}"}}'] >= 2
+    assert not any(f"/api/children/{child_id}" in series for series in samples)
+    # Only the /metrics request itself is running
+    assert samples[f'http_requests_in_flight{{pid="{pid}"}}'] == 1
+
+def test_drawing_bytes_pool_and_sessions(client, auth):
+    """Test the drawing byte counter, pool gauges and session count"""
+    import main
+    headers, child_id = auth
+    before = _samples(client.get("/metrics").text)
+    key = f'drawing_bytes_written_total{{pid="{os.getpid()}"}}'
+
+    png = b"\x89PNG\r\n\x1a\n" + b"\x00" * 100
+    response = client.post("/api/practice", headers=headers, files={"drawing": ("d.png", png, "image/png")},
+                           data={"word_id": 1, "spelled_word": "bee", "is_correct": "true", "child_id": child_id})
+    assert response.status_code == 200
+    os.remove(os.path.join(main.drawings_dir, response.json()['drawing_filename']))
+
+    after = _samples(client.get("/metrics").text)
+    assert after[key] - before[key] == len(png)
+    assert f'db_pool_connections{{state="in_use",pid="{os.getpid()}"}}' in after
+    assert after['practice_sessions'] == 0
+
+def test_event_loop_lag_is_measured():
+    """Test that blocking the event loop shows up as lag"""
+    async def block_loop():
+        monitor = asyncio.create_task(metrics.monitor_event_loop_lag(interval=0.01))
+        await asyncio.sleep(0)
+        time.sleep(0.1)
+        await asyncio.sleep(0.05)
+        monitor.cancel()
+
+    asyncio.run(block_loop())
+    assert metrics._event_loop_lag.max >= 0.05
+    assert 'event_loop_lag_seconds_bucket' in metrics.render()
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,147 @@
+"""
+Phase 29: Tests for the versioned migration engine
+"""
+
+import pytest
+import sys
+import os
+import shutil
+import sqlite3
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import database
+import migrate
+from database import init_db, create_user, create_child
+from migrate import (
+    MigrationError, latest_version, get_version, get_pending_migrations,
+    load_migrations, migrate_database, MigrationContext
+)
+
+DB_PATH = "../data/test_migrate.db"
+
+@pytest.fixture(autouse=True)
+def setup_test_db():
+    """Start each test without a database"""
+    database.DB_PATH = DB_PATH
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    yield
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    migrate._migrations = None
+
+def test_new_database_gets_every_migration():
+    """Test that init_db creates the full schema and sets user_version"""
+    assert init_db() == latest_version()
+    assert get_version() == latest_version()
+    assert get_pending_migrations() == []
+
+    conn = database.get_db()
+    tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    words = conn.execute("SELECT COUNT(*) FROM words").fetchone()[0]
+    conn.close()
+    assert {'users', 'children', 'words', 'practices', 'child_progress', 'due_queue',
+            'table_versions', 'practice_sessions', 'user_shards'} <= tables
+    assert words == 3
+
+def test_current_database_is_a_no_op(monkeypatch):
+    """Test that an up-to-date database only has its user_version read"""
+    init_db()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("migrations should not be checked")
+    monkeypatch.setattr(migrate, 'create_migrations_table', fail)
+
+    assert init_db() == 0
+
+def test_seed_runs_once():
+    """Test that deleting every word doesn't re-seed them on the next start"""
+    init_db()
+    conn = database.get_db()
+    conn.execute("DELETE FROM words")
+    conn.commit()
+    conn.close()
+
+    init_db()
+    conn = database.get_db()
+    assert conn.execute("SELECT COUNT(*) FROM words").fetchone()[0] == 0
+    conn.close()
+
+def test_edited_migration_is_rejected(tmp_path, monkeypatch):
+    """Test that a migration changed after being applied raises MigrationError"""
+    migrations_dir = tmp_path / "migrations"
+    shutil.copytree(migrate.MIGRATIONS_DIR, migrations_dir)
+    monkeypatch.setattr(migrate, 'MIGRATIONS_DIR', str(migrations_dir))
+    migrate._migrations = None
+    init_db()
+
+    first = sorted(migrations_dir.glob("0001_*.sql"))[0]
+    first.write_text(first.read_text() + "\n-- edited\n")
+    migrate._migrations = None
+
+    # The fast path still trusts user_version; an older database gets checked
+    conn = database.get_db()
+    conn.execute("PRAGMA user_version = 1")
+    conn.commit()
+    conn.close()
+    with pytest.raises(MigrationError):
+        init_db()
+
+def test_pre_engine_database_is_adopted():
+    """Test upgrading a database created by the old init_db / migrate.py"""
+    conn = sqlite3.connect(DB_PATH)
+    conn.executescript(load_migrations()[0].source.decode())
+    conn.executescript("""
+        CREATE TABLE schema_migrations (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE,
+            description TEXT,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        INSERT INTO schema_migrations (id, name, description) VALUES (1, 'initial_schema', 'old');
+        INSERT INTO words (word, category) VALUES ('owl', 'birds');
+    """)
+    conn.commit()
+    conn.close()
+
+    assert init_db() == latest_version() - 1
+    conn = database.get_db()
+    checksums = [r[0] for r in conn.execute("SELECT checksum FROM schema_migrations ORDER BY id")]
+    words = [r[0] for r in conn.execute("SELECT word FROM words")]
+    conn.close()
+    assert checksums[0] == load_migrations()[0].checksum
+    assert all(checksums)
+    # Existing words mean the core words aren't seeded
+    assert words == ['owl']
+
+def test_backfill_child_progress_in_batches():
+    """Test the batched child_progress backfill, including resuming after a stop"""
+    init_db()
+    child_id = create_child(create_user("legacy@example.com", "password"), "Old")
+    conn = database.get_db()
+    conn.execute("UPDATE words SET successful_days = 2, last_practiced = '2024-01-01', next_review = '2024-01-04'")
+    conn.executemany(
+        "INSERT INTO practices (word_id, child_id, spelled_word, is_correct) VALUES (?, ?, 'x', ?)",
+        [(word_id, child_id, is_correct) for word_id in (1, 2, 3) for is_correct in (0, 1)]
+    )
+    conn.commit()
+
+    backfill = next(m for m in load_migrations() if m.name == 'backfill_child_progress')
+    ctx = MigrationContext(conn, backfill, None, batch_size=2)
+
+    # Pretend an earlier run stopped after the first two practices
+    conn.execute("INSERT INTO migration_progress (version, last_key) VALUES (?, 2)", (backfill.version,))
+    conn.commit()
+    migrate._load_module(backfill).up(conn, ctx)
+    conn.commit()
+
+    rows = conn.execute("SELECT word_id, successful_days FROM child_progress ORDER BY word_id").fetchall()
+    progress = conn.execute("SELECT last_key FROM migration_progress WHERE version = ?", (backfill.version,)).fetchone()
+    conn.close()
+    # Word 1's correct practice (id 2) was in the skipped range
+    assert [tuple(r) for r in rows] == [(2, 2), (3, 2)]
+    assert progress[0] == 6
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,184 @@
+"""
+Phase 38: Tests for the misspelling index and letter confusion counters
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import database
+import misspellings
+from database import (init_db, add_word, create_user, create_child, save_practice, save_practice_batch,
+                      delete_child, delete_word, get_db)
+
+DB_PATH = "../data/test_misspellings.db"
+
+@pytest.fixture(autouse=True)
+def setup_test_db():
+    """Setup test database before each test"""
+    database.DB_PATH = DB_PATH
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    init_db()
+    yield
+    database.close_pool()
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+
+def _snapshot():
+    conn = get_db()
+    words = conn.execute("SELECT word_id, spelled_word, count FROM word_misspellings ORDER BY 1, 2").fetchall()
+    children = conn.execute("SELECT child_id, misspelled, counts FROM child_confusions ORDER BY 1").fetchall()
+    conn.close()
+    return words, children
+
+def test_confusion_matrix():
+    """Test counting, taking back and reading the array-backed counters"""
+    matrix = misspellings.ConfusionMatrix()
+    assert len(matrix.to_bytes()) == 2 * misspellings.SIZE * misspellings.SIZE * 4
+    ops = (('transposition', 1, 'ie', 'ei'), ('omission', 3, 't', ''), ('substitution', 4, 'e', 'a'))
+    matrix.add(ops)
+    matrix.add(ops[:1])
+    assert matrix.top(2) == [
+        {'type': 'transposition', 'expected': 'ie', 'spelled': 'ei', 'count': 2},
+        {'type': 'substitution', 'expected': 'e', 'spelled': 'a', 'count': 1},
+    ]
+    copy = misspellings.ConfusionMatrix(matrix.to_bytes())
+    copy.add((('insertion', 3, '', 'e'), ('omission', 0, 'é', '')))
+    copy.add(ops, -1)
+    assert {(c['type'], c['expected'], c['spelled'], c['count']) for c in copy.top()} == {
+        ('transposition', 'ie', 'ei', 1), ('insertion', '', 'e', 1), ('omission', '?', '', 1)
+    }
+    assert copy.matrices()['swaps'][9][5] == 1
+
+def test_index_follows_inserts_and_deletes():
+    """Test that saves count misspellings, deletes take them back and rebuild agrees"""
+    user_id = create_user("index@example.com", "password")
+    ada = create_child(user_id, "Ada")
+    ben = create_child(user_id, "Ben")
+    field = add_word("field", "nature")
+    spider = add_word("spider", "animals")
+    save_practice(field, ada, "feild", False, None)
+    save_practice(field, ada, "Feild ", False, None)
+    save_practice(field, ada, "field", True, None)
+    save_practice(spider, ben, "spidar", False, None)
+    save_practice_batch(user_id, [
+        {'idempotency_key': 'k1', 'word_id': field, 'child_id': ben, 'spelled_word': 'fild',
+         'is_correct': False, 'drawing_filename': None},
+    ])
+
+    confusions = misspellings.child_confusions(ada)
+    assert confusions['misspelled'] == 2
+    assert confusions['top'] == [{'type': 'transposition', 'expected': 'ie', 'spelled': 'ei', 'count': 2}]
+    top = misspellings.common_misspellings()
+    assert [(w['word'], w['misspelled']) for w in top] == [('field', 3), ('spider', 1)]
+    assert top[0]['misspellings'] == [{'spelled': 'feild', 'count': 2}, {'spelled': 'fild', 'count': 1}]
+
+    incremental = _snapshot()
+    conn = get_db()
+    assert misspellings.rebuild(conn) == 4
+    conn.close()
+    assert _snapshot() == incremental
+
+    delete_child(ada)
+    assert [(w['word'], w['misspelled']) for w in misspellings.common_misspellings()] == [('field', 1), ('spider', 1)]
+    assert misspellings.child_confusions(ada)['misspelled'] == 0
+    delete_word(spider)
+    assert misspellings.child_confusions(ben)['top'] == [
+        {'type': 'omission', 'expected': 'e', 'spelled': '', 'count': 1}
+    ]
+
+def test_rename_regrades_practices():
+    """Test that renaming a word re-grades its practices, so a later delete takes back exactly them"""
+    user_id = create_user("rename@example.com", "password")
+    ada = create_child(user_id, "Ada")
+    word_id = add_word("house", "home")
+    table = add_word("table", "home")
+    save_practice(word_id, ada, "hosue", False, None)
+    save_practice(table, ada, "tabel", False, None)
+
+    database.update_word(word_id, word="horse")
+    assert [(w['word'], w['misspellings']) for w in misspellings.common_misspellings()] == [
+        ('horse', [{'spelled': 'hosue', 'count': 1}]), ('table', [{'spelled': 'tabel', 'count': 1}])
+    ]
+    renamed = _snapshot()
+    conn = get_db()
+    misspellings.rebuild(conn)
+    conn.close()
+    assert _snapshot() == renamed
+
+    delete_word(word_id)
+    deleted = _snapshot()
+    conn = get_db()
+    misspellings.rebuild(conn)
+    conn.close()
+    assert _snapshot() == deleted
+    assert misspellings.child_confusions(ada)['top'] == [
+        {'type': 'transposition', 'expected': 'le', 'spelled': 'el', 'count': 1}
+    ]
+
+def test_rebuild_and_backfill_in_batches(monkeypatch):
+    """Test that chunked rebuilds and the batched migration 0012 add up to the incremental counts"""
+    import migrate
+
+    user_id = create_user("batches@example.com", "password")
+    ada = create_child(user_id, "Ada")
+    ben = create_child(user_id, "Ben")
+    field = add_word("field", "nature")
+    for child_id, spelled in ((ada, "feild"), (ben, "fild"), (ada, "field"), (ada, "feeld"), (ben, "feild")):
+        save_practice(field, child_id, spelled, spelled == "field", None)
+    incremental = _snapshot()
+
+    monkeypatch.setattr(misspellings, 'REBUILD_CHUNK_SIZE', 2)
+    conn = get_db()
+    assert misspellings.rebuild(conn) == 4
+    conn.close()
+    assert _snapshot() == incremental
+
+    conn = get_db()
+    conn.execute("DELETE FROM word_misspellings")
+    conn.execute("DELETE FROM child_confusions")
+    conn.commit()
+    backfill = next(m for m in migrate.load_migrations() if m.name == 'backfill_misspellings')
+    migrate._load_module(backfill).up(conn, migrate.MigrationContext(conn, backfill, None, batch_size=2))
+    conn.commit()
+    conn.close()
+    assert _snapshot() == incremental
+
+def test_dashboard_and_child_endpoints():
+    """Test the endpoints reading the precomputed structures"""
+    from fastapi.testclient import TestClient
+    from auth import create_access_token
+    import main
+
+    user_id = create_user("misspell@example.com", "password")
+    child_id = create_child(user_id, "Ada")
+    other_child = create_child(create_user("other@example.com", "password"), "Cy")
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+    client = TestClient(main.app)
+    png = b"\x89PNG\r\n\x1a\n" + b"\x00" * 10
+
+    for spelled in ("bea", "bea", "be"):
+        response = client.post("/api/practice", headers=headers, files={"drawing": ("d.png", png, "image/png")},
+                               data={"word_id": 1, "spelled_word": spelled, "child_id": child_id})
+        assert response.status_code == 200
+        os.remove(os.path.join(main.drawings_dir, response.json()['drawing_filename']))
+
+    response = client.get("/api/dashboard/misspellings?per_word=1")
+    assert response.status_code == 200
+    assert response.json()['words'] == [
+        {'word_id': 1, 'word': 'bee', 'misspelled': 3, 'misspellings': [{'spelled': 'bea', 'count': 2}]}
+    ]
+
+    response = client.get(f"/api/children/{child_id}/confusions?limit=1", headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body['misspelled'] == 3
+    assert body['top'] == [{'type': 'substitution', 'expected': 'e', 'spelled': 'a', 'count': 2}]
+    assert body['matrix']['edits'][5][1] == 2
+    assert client.get(f"/api/children/{other_child}/confusions", headers=headers).status_code in (403, 404)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
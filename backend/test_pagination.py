@@ -0,0 +1,128 @@
+"""
+Phase 22: Tests for keyset pagination
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from database import (
+    init_db, get_db, add_word, save_practice, create_user, create_child,
+    get_all_words, get_all_words_admin, get_practices_for_word,
+    get_words_page, get_admin_words_page, get_practices_page,
+    encode_page_cursor, decode_page_cursor
+)
+
+DB_PATH = "../data/test_pagination.db"
+
+@pytest.fixture(autouse=True)
+def setup_test_db():
+    """Setup test database before each test"""
+    import database
+    database.DB_PATH = DB_PATH
+    
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    
+    init_db()
+    
+    yield
+    
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+
+def collect_pages(fetch_page, page_size):
+    """Follow next_cursor until the last page; returns (rows, page count)"""
+    rows, after, pages = [], None, 0
+    while True:
+        page, next_cursor = fetch_page(page_size, after)
+        rows.extend(page)
+        pages += 1
+        if next_cursor is None:
+            return rows, pages
+        after = decode_page_cursor(next_cursor)
+
+def test_word_pages_cover_every_word_once():
+    """Test that paging visits each word exactly once, even with equal timestamps"""
+    for i in range(10):
+        add_word(f"word{i}", "test")
+    
+    rows, pages = collect_pages(get_words_page, 4)
+    
+    assert pages == 4  # 13 words in pages of 4
+    assert [r['id'] for r in rows] == [w['id'] for w in get_all_words()]
+
+def test_admin_pages_newest_first():
+    """Test admin paging order and that an exact multiple has no empty page"""
+    conn = get_db()
+    conn.execute("UPDATE words SET created_date = '2024-01-01 00:00:00'")
+    conn.commit()
+    conn.close()
+    add_word("newest", "test")
+    
+    rows, pages = collect_pages(get_admin_words_page, 2)
+    
+    assert pages == 2
+    assert rows[0]['word'] == 'newest'
+    assert sorted(r['id'] for r in rows) == sorted(w['id'] for w in get_all_words_admin())
+
+def test_practice_history_pages():
+    """Test practice history paging for one word"""
+    child_id = create_child(create_user("pager@example.com", "password"), "Pat")
+    word_id = add_word("pager", "test")
+    for i in range(5):
+        save_practice(word_id, child_id, f"pagr{i}", False, None)
+    save_practice(1, child_id, "bee", True, None)
+    
+    rows, pages = collect_pages(lambda limit, after: get_practices_page(word_id, limit, after), 2)
+    
+    assert pages == 3
+    assert len(rows) == 5
+    assert {r['id'] for r in rows} == {p['id'] for p in get_practices_for_word(word_id)}
+    assert rows == sorted(rows, key=lambda r: (r['practiced_date'], r['id']), reverse=True)
+
+def test_cursor_round_trip_and_validation():
+    """Test cursor encoding and rejection of garbage"""
+    cursor = encode_page_cursor('2024-01-01 10:00:00', 42)
+    assert decode_page_cursor(cursor) == ('2024-01-01 10:00:00', 42)
+    
+    for bad in ('not-a-cursor', encode_page_cursor('x', 'y')):
+        with pytest.raises(ValueError):
+            decode_page_cursor(bad)
+
+def test_endpoint_pagination():
+    """Test next_cursor through the API and 400 on a bad cursor"""
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+    import main
+    client = TestClient(main.app)
+    
+    first = client.get("/api/admin/words", params={"limit": 2}).json()
+    assert len(first['words']) == 2
+    second = client.get("/api/admin/words", params={"limit": 2, "cursor": first['next_cursor']}).json()
+    assert len(second['words']) == 1
+    assert second['next_cursor'] is None
+    
+    assert client.get("/api/admin/words", params={"cursor": "garbage"}).status_code == 400
+    assert client.get("/api/words", params={"limit": 0}).status_code == 422
+
+def test_endpoints_return_everything_without_paging_params():
+    """Test that /api/words and /api/admin/words still return the full list by default"""
+    from fastapi.testclient import TestClient
+    import main
+    client = TestClient(main.app)
+    for i in range(main.DEFAULT_PAGE_SIZE + 5):
+        add_word(f"word{i}", "test")
+    
+    for path in ("/api/words", "/api/admin/words"):
+        body = client.get(path).json()
+        assert len(body['words']) == main.DEFAULT_PAGE_SIZE + 8
+        assert 'next_cursor' not in body
+        page = client.get(path, params={"limit": 5}).json()
+        assert len(page['words']) == 5 and page['next_cursor']
+        assert len(client.get(path, params={"cursor": page['next_cursor']}).json()['words']) == main.DEFAULT_PAGE_SIZE
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,113 @@
+"""
+Phase 31: Tests for the SQL query profiler
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import database
+import profiler
+from profiler import Histogram
+from database import init_db, connect_db, create_user, create_child, get_child_by_id, get_user_children
+
+DB_PATH = "../data/test_profiler.db"
+
+@pytest.fixture(autouse=True)
+def setup_test_db():
+    """Setup test database before each test"""
+    database.DB_PATH = DB_PATH
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    init_db()
+    profiler.reset_query_stats()
+    yield
+    database.close_pool()
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+
+def _stats():
+    return {s['name']: s for s in profiler.query_stats()}
+
+def test_rows_and_callers_are_recorded():
+    """Test fetched rows, changed rows and the calling function per statement"""
+    user_id = create_user("rows@example.com", "password")
+    for name in ("Ada", "Ben", "Cy"):
+        create_child(user_id, name)
+    assert len(get_user_children(user_id)) == 3
+
+    stats = _stats()
+    assert stats['children.for_user']['rows'] == 3
+    assert stats['children.for_user']['callers'] == {'database.get_user_children': 1}
+    assert stats['children.insert']['count'] == 3
+    assert stats['children.insert']['rows'] == 3
+    assert stats['children.insert']['histogram_ms']['+Inf'] == 3
+
+def test_unregistered_sql_is_named_by_first_line():
+    """Test that raw SQL on a pooled connection is profiled too"""
+    conn = connect_db(DB_PATH)
+    rows = list(conn.execute("""
+        SELECT word FROM words
+        ORDER BY word
+    """))
+    conn.close()
+
+    stats = _stats()['sql: SELECT word FROM words']
+    assert stats['count'] == 1
+    assert stats['rows'] == len(rows) == 3
+    assert stats['callers'] == {'test_profiler.test_unregistered_sql_is_named_by_first_line': 1}
+
+def test_slow_query_is_logged_with_plan(monkeypatch, capsys):
+    """Test that a statement over the threshold is kept with its EXPLAIN QUERY PLAN"""
+    monkeypatch.setattr(profiler, 'SLOW_QUERY_MS', 0)
+    get_child_by_id(1)
+
+    slow = profiler.slow_queries()[0]
+    assert slow['name'] == 'children.by_id'
+    assert slow['caller'] == 'database.get_child_by_id'
+    assert any('INTEGER PRIMARY KEY' in step for step in slow['plan'])
+    assert "Slow query children.by_id" in capsys.readouterr().out
+
+def test_histogram_quantiles():
+    """Test bucket placement and quantile estimates"""
+    histogram = Histogram((1, 10, 100))
+    for value in [0.5] * 90 + [5] * 9 + [500]:
+        histogram.observe(value)
+
+    assert histogram.quantile(0.5) == 1
+    assert histogram.quantile(0.95) == 10
+    assert histogram.quantile(1.0) == 500
+    assert histogram.cumulative() == [(1, 90), (10, 99), (100, 99), ('+Inf', 100)]
+
+def test_query_counter_counts_a_request(query_counter):
+    """Test the conftest fixture against an API request"""
+    from fastapi.testclient import TestClient
+    from auth import create_access_token
+    import main
+
+    user_id = create_user("counter@example.com", "password")
+    create_child(user_id, "Ada")
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+    client = TestClient(main.app)
+
+    query_counter.reset()
+    response = client.get("/api/children", headers=headers)
+    assert response.status_code == 200
+    assert query_counter.counts()['children.for_user'] == 1
+    assert query_counter.count <= 2
+
+def test_slow_queries_endpoint(monkeypatch):
+    """Test the admin endpoint that lists slow queries"""
+    from fastapi.testclient import TestClient
+    import main
+
+    monkeypatch.setattr(profiler, 'SLOW_QUERY_MS', 0)
+    get_child_by_id(1)
+    response = TestClient(main.app).get("/api/admin/slow-queries")
+    assert response.status_code == 200
+    assert response.json()['queries'][0]['name'] == 'children.by_id'
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,131 @@
+"""
+Phase 30: Tests for the query registry and pooled connections
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import database
+import queries
+import profiler
+from database import (
+    init_db, connect_db, create_user, create_child, get_child_by_id, update_child,
+    add_word, update_word, get_word_by_id, save_practice, get_practice_trend,
+    get_submitted_practices, save_practice_batch
+)
+
+DB_PATH = "../data/test_queries.db"
+
+@pytest.fixture(autouse=True)
+def setup_test_db():
+    """Setup test database before each test"""
+    database.DB_PATH = DB_PATH
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    init_db()
+    profiler.reset_query_stats()
+    yield
+    database.close_pool()
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+
+def test_every_registered_statement_prepares():
+    """Test that each registry entry is valid SQL against the current schema"""
+    conn = connect_db(DB_PATH)
+    conn.execute("ATTACH DATABASE ? AS catalog", (DB_PATH,))
+    try:
+        for name, sql in queries.QUERIES.items():
+            bindings = 1 if '?1' in sql else sql.count('?')
+            conn.execute("EXPLAIN " + sql, [None] * bindings)
+    finally:
+        conn.execute("DETACH DATABASE catalog")
+        conn.close()
+
+def test_connection_is_reused_and_returned_clean():
+    """Test that close() pools the connection without its transaction or row factory"""
+    conn = connect_db(DB_PATH)
+    conn.row_factory = None
+    conn.execute("DELETE FROM words")
+    assert conn.in_transaction
+    conn.close()
+
+    again = connect_db(DB_PATH)
+    assert again is conn
+    assert not again.in_transaction
+    assert again.row_factory is database.sqlite3.Row
+    assert again.execute("SELECT COUNT(*) FROM words").fetchone()[0] == 3
+    again.close()
+
+def test_replaced_file_gets_a_new_connection():
+    """Test that a pooled connection to a deleted file is not handed out"""
+    conn = connect_db(DB_PATH)
+    conn.close()
+    os.remove(DB_PATH)
+    init_db()
+
+    fresh = connect_db(DB_PATH)
+    assert fresh is not conn
+    assert fresh.execute("SELECT COUNT(*) FROM words").fetchone()[0] == 3
+    fresh.close()
+
+def test_partial_updates_keep_other_fields():
+    """Test update_word / update_child with the fixed COALESCE statements"""
+    word_id = add_word("owl", "birds", "owl.png")
+    assert update_word(word_id, category="night birds")
+    assert tuple(get_word_by_id(word_id)) == ("owl", "night birds")
+    assert not update_word(word_id)
+
+    child_id = create_child(create_user("queries@example.com", "password"), "Ada", 6)
+    assert update_child(child_id, age=7)
+    child = get_child_by_id(child_id)
+    assert (child['name'], child['age']) == ("Ada", 7)
+    assert not update_child(child_id, name="")
+
+def test_practice_trend_binds_days():
+    """Test that days is a bound parameter and non-integers are rejected"""
+    child_id = create_child(create_user("trend@example.com", "password"), "Ben")
+    save_practice(1, child_id, "bee", True, None)
+
+    trend = get_practice_trend(days=3)
+    assert len(trend) == 1 and trend[0]['total'] == 1
+    with pytest.raises(ValueError):
+        get_practice_trend(days="7 days'); DROP TABLE practices; --")
+
+def test_submitted_keys_lookup_uses_one_statement():
+    """Test the JSON key list lookup for any number of keys"""
+    user_id = create_user("batch@example.com", "password")
+    child_id = create_child(user_id, "Cy")
+    records = [
+        {'idempotency_key': f"k{i}", 'word_id': 1, 'child_id': child_id,
+         'spelled_word': 'bee', 'is_correct': False}
+        for i in range(3)
+    ]
+    applied = save_practice_batch(user_id, records)
+
+    found = get_submitted_practices(user_id, ["k0", "k2", "missing"])
+    assert found == {"k0": applied[0]['practice_id'], "k2": applied[2]['practice_id']}
+    assert get_submitted_practices(user_id, ["k1"]) == {"k1": applied[1]['practice_id']}
+
+def test_stats_count_and_time_each_statement():
+    """Test per-statement counts and the admin endpoint"""
+    from fastapi.testclient import TestClient
+    import main
+
+    get_child_by_id(1)
+    get_child_by_id(2)
+    stats = {s['name']: s for s in profiler.query_stats()}
+    assert stats['children.by_id']['count'] == 2
+    assert stats['children.by_id']['max_ms'] >= stats['children.by_id']['avg_ms'] > 0
+
+    client = TestClient(main.app)
+    response = client.get("/api/admin/query-stats", params={"reset": "true"})
+    assert response.status_code == 200
+    names = [s['name'] for s in response.json()['statements']]
+    assert 'children.by_id' in names
+    assert profiler.query_stats() == []
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,83 @@
+"""
+Phase 19: Tests for ETag response caching
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from database import (
+    init_db, add_word, save_practice, create_user, create_child, get_table_versions
+)
+from cache import ResponseCache
+
+DB_PATH = "../data/test_response_cache.db"
+
+@pytest.fixture(autouse=True)
+def setup_test_db():
+    """Setup test database before each test"""
+    import database
+    database.DB_PATH = DB_PATH
+    
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    
+    init_db()
+    
+    yield
+    
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+
+def test_writes_bump_table_versions():
+    """Test that writes bump only the tables they change"""
+    before = get_table_versions()
+    
+    word_id = add_word("wasp", "insects")
+    after_word = get_table_versions()
+    assert after_word['words'] == before['words'] + 1
+    assert after_word['practices'] == before['practices']
+    
+    user_id = create_user("parent@test.com", "password")
+    child_id = create_child(user_id, "Child", 7)
+    save_practice(word_id, child_id, "wasp", True, "d1.png")
+    after_practice = get_table_versions()
+    assert after_practice['practices'] == before['practices'] + 1
+    assert after_practice['words'] == after_word['words']
+
+def test_response_cache_is_bounded_lru():
+    """Test that the least recently used entry is evicted"""
+    cache = ResponseCache(maxsize=2)
+    cache.set('"a"', b'1')
+    cache.set('"b"', b'2')
+    cache.get('"a"')
+    cache.set('"c"', b'3')
+    
+    assert cache.get('"b"') is None
+    assert cache.get('"a"') == b'1'
+    assert len(cache) == 2
+
+def test_endpoint_etag_and_304():
+    """Test If-None-Match handling on a cached endpoint"""
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+    import main
+    client = TestClient(main.app)
+    
+    first = client.get("/api/words")
+    etag = first.headers['etag']
+    assert first.status_code == 200
+    assert len(first.json()['words']) == 3
+    
+    assert client.get("/api/words", headers={"If-None-Match": etag}).status_code == 304
+    
+    add_word("moth", "insects")
+    changed = client.get("/api/words", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers['etag'] != etag
+    assert len(changed.json()['words']) == 4
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
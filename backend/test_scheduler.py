@@ -0,0 +1,127 @@
+"""
+Phase 17: Tests for the spaced-repetition scheduler engine
+"""
+
+import pytest
+import sys
+import os
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from scheduler import (
+    SchedulingAlgorithm, FixedIntervalScheduler, SM2Scheduler, FSRSScheduler,
+    create_scheduler, get_scheduler, set_scheduler
+)
+
+DB_PATH = "../data/test_scheduler.db"
+
+@pytest.fixture
+def test_db():
+    """Fresh database for re-plan tests"""
+    import database
+    database.DB_PATH = DB_PATH
+    
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    
+    database.init_db()
+    
+    yield database
+    
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+
+def test_fixed_matches_phase4_rule():
+    """Test the default rule: +2 days after 1st success, +3 after 2+"""
+    scheduler = FixedIntervalScheduler()
+    today = date(2024, 1, 10)
+    
+    assert scheduler.next_review(1, today) == "2024-01-12"
+    assert scheduler.next_review(2, today) == "2024-01-13"
+    assert scheduler.next_review(7, today) == "2024-01-13"
+
+def test_default_scheduler_is_fixed():
+    """Test that the live scheduler defaults to the fixed rule"""
+    assert get_scheduler().name == 'fixed'
+
+def test_sm2_intervals_grow_and_cap():
+    """Test SM-2 interval growth and the max interval"""
+    scheduler = SM2Scheduler(max_interval_days=100)
+    
+    assert [scheduler.interval_days(n) for n in range(1, 5)] == [1, 6, 15, 38]
+    assert scheduler.interval_days(50) == 100
+
+def test_fsrs_intervals_follow_retention():
+    """Test FSRS-style intervals: longer for lower desired retention"""
+    strict = FSRSScheduler(desired_retention=0.95)
+    default = FSRSScheduler()
+    
+    assert default.interval_days(1) == 2  # interval == stability at 90% retention
+    assert strict.interval_days(3) < default.interval_days(3)
+    assert default.interval_days(2) < default.interval_days(3)
+
+def test_unknown_algorithm():
+    """Test that unknown algorithm names are rejected"""
+    with pytest.raises(ValueError, match="Unknown scheduling algorithm"):
+        create_scheduler("leitner")
+
+def test_incomplete_algorithm_fails_on_creation():
+    """Test that an algorithm without interval_days can't be instantiated"""
+    class Incomplete(SchedulingAlgorithm):
+        name = 'incomplete'
+    
+    with pytest.raises(TypeError):
+        Incomplete()
+
+@pytest.mark.parametrize("name", ['fixed', 'sm2', 'fsrs'])
+def test_batch_matches_scalar(name):
+    """Test that the vectorized path gives the same dates as the scalar one"""
+    np = pytest.importorskip("numpy")
+    scheduler = create_scheduler(name)
+    successful_days = np.arange(0, 40)
+    last_practiced = np.array(["2024-03-01"] * 40, dtype='datetime64[D]')
+    
+    batch = scheduler.next_review_batch(successful_days, last_practiced).astype(str).tolist()
+    scalar = [scheduler.next_review(int(n), date(2024, 3, 1)) for n in successful_days]
+    
+    assert batch == scalar
+
+def test_replan_child_progress(test_db):
+    """Test re-planning every child_progress row with another algorithm"""
+    pytest.importorskip("numpy")
+    from scheduler import replan_child_progress
+    
+    user_id = test_db.create_user("parent@test.com", "password")
+    child_id = test_db.create_child(user_id, "Child", 7)
+    words = test_db.get_words_for_child(child_id)
+    for w in words:
+        test_db.update_word_on_success_for_child(w['id'], child_id)
+    
+    updated = replan_child_progress(SM2Scheduler(first_interval=5), chunk_size=2)
+    
+    conn = test_db.get_db()
+    reviews = {r[0] for r in conn.execute("SELECT next_review FROM child_progress").fetchall()}
+    conn.close()
+    assert updated == len(words)
+    assert reviews == {(date.today() + timedelta(days=5)).isoformat()}
+
+def test_set_scheduler_changes_live_rule(test_db):
+    """Test that database writes use the live scheduler"""
+    user_id = test_db.create_user("parent@test.com", "password")
+    child_id = test_db.create_child(user_id, "Child", 7)
+    word_id = test_db.get_words_for_child(child_id)[0]['id']
+    
+    set_scheduler(FixedIntervalScheduler(first_interval=4))
+    try:
+        test_db.update_word_on_success_for_child(word_id, child_id)
+    finally:
+        set_scheduler('fixed')
+    
+    conn = test_db.get_db()
+    next_review = conn.execute("SELECT next_review FROM child_progress").fetchone()[0]
+    conn.close()
+    assert next_review == (date.today() + timedelta(days=4)).isoformat()
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,138 @@
+"""
+Phase 26: Tests for per-family database sharding
+"""
+
+import pytest
+import sys
+import os
+import shutil
+import io
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import database
+import sharding
+from database import (
+    init_db, create_user, create_child, save_practice, get_child_by_id,
+    get_user_children, get_words_for_child, get_all_words, add_word, delete_word,
+    get_practice_stats, get_table_versions, all_db_paths, connect_db, get_word_by_id
+)
+from word_import import import_words
+
+DB_PATH = "../data/test_sharding.db"
+SHARD_DIR = "../data/test_sharding_shards"
+
+@pytest.fixture(autouse=True)
+def setup_test_db(monkeypatch):
+    """Setup a catalog plus three shards before each test"""
+    database.DB_PATH = DB_PATH
+    monkeypatch.setattr(sharding, 'SHARD_COUNT', 3)
+    monkeypatch.setattr(sharding, 'SHARD_DIR', SHARD_DIR)
+
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    shutil.rmtree(SHARD_DIR, ignore_errors=True)
+
+    init_db()
+
+    yield
+
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    shutil.rmtree(SHARD_DIR, ignore_errors=True)
+
+def _count(path, query, params=()):
+    conn = connect_db(path)
+    value = conn.execute(query, params).fetchone()[0]
+    conn.close()
+    return value
+
+def test_hash_ring_is_stable_and_spread():
+    """Test that the ring is deterministic and uses every shard"""
+    ring = sharding.HashRing(3)
+    placements = [ring.shard_for(user_id) for user_id in range(300)]
+    assert placements == [sharding.HashRing(3).shard_for(u) for u in range(300)]
+    assert set(placements) == {0, 1, 2}
+
+    # Adding a shard only moves keys onto the new shard
+    grown = sharding.HashRing(4)
+    moved = [u for u in range(300) if grown.shard_for(u) != placements[u]]
+    assert all(grown.shard_for(u) == 3 for u in moved)
+
+def test_family_rows_live_on_their_shard():
+    """Test that children and practices are written to the family's shard only"""
+    user_id = create_user("shard@example.com", "password")
+    shard = sharding.ring_shard_for_user(user_id)
+    child_id = create_child(user_id, "Ada")
+
+    assert sharding.shard_for_id(child_id) == shard
+    assert get_child_by_id(child_id)['name'] == "Ada"
+    assert [c['id'] for c in get_user_children(user_id)] == [child_id]
+
+    save_practice(1, child_id, "bee", True, None)
+    shard_path = sharding.shard_path(DB_PATH, shard)
+    assert _count(shard_path, "SELECT COUNT(*) FROM practices") == 1
+    assert _count(DB_PATH, "SELECT COUNT(*) FROM practices") == 0
+    assert _count(DB_PATH, "SELECT COUNT(*) FROM children") == 0
+
+def test_core_words_replicated_to_every_shard():
+    """Test that core word adds and deletes reach every shard"""
+    core_count = _count(DB_PATH, "SELECT COUNT(*) FROM words")
+    for path in all_db_paths():
+        assert _count(path, "SELECT COUNT(*) FROM words") == core_count
+
+    word_id = add_word("zebra", "animals")
+    assert sharding.shard_for_id(word_id) is None
+    for path in all_db_paths():
+        assert _count(path, "SELECT COUNT(*) FROM words WHERE id = ?", (word_id,)) == 1
+
+    child_id = create_child(create_user("zebra@example.com", "password"), "Zed")
+    assert word_id in {w['id'] for w in get_words_for_child(child_id)}
+
+    assert delete_word(word_id)
+    for path in all_db_paths():
+        assert _count(path, "SELECT COUNT(*) FROM words WHERE id = ?", (word_id,)) == 0
+
+def test_custom_words_stay_on_family_shard():
+    """Test that a family's imported words get shard ids and aren't shared"""
+    owner = create_user("owner@example.com", "password")
+    report = import_words(io.StringIO("word,category\nquokka,animals\n"), 'csv', user_id=owner)
+    assert report['inserted'] == 1
+
+    custom = [w for w in get_all_words() if w['word'] == 'quokka']
+    assert len(custom) == 1
+    assert sharding.shard_for_id(custom[0]['id']) == sharding.ring_shard_for_user(owner)
+    assert get_word_by_id(custom[0]['id'])[0] == 'quokka'
+
+def test_dashboards_span_all_shards():
+    """Test that stats and table versions cover every family"""
+    versions_before = get_table_versions()
+
+    children = [create_child(create_user(f"family{i}@example.com", "password"), f"Kid{i}")
+                for i in range(6)]
+    for child_id in children:
+        save_practice(1, child_id, "bee", True, None)
+
+    assert len({sharding.shard_for_id(c) for c in children}) > 1
+    assert get_practice_stats()['total_practices'] == len(children)
+    assert get_table_versions()['practices'] == versions_before['practices'] + len(children)
+    # Core words are counted once, not once per shard
+    assert len(get_all_words()) == _count(DB_PATH, "SELECT COUNT(*) FROM words")
+
+def test_pre_sharding_users_stay_in_catalog(monkeypatch):
+    """Test that families created before sharding keep using the catalog"""
+    monkeypatch.setattr(sharding, 'SHARD_COUNT', 0)
+    user_id = create_user("legacy@example.com", "password")
+    child_id = create_child(user_id, "Old")
+
+    monkeypatch.setattr(sharding, 'SHARD_COUNT', 3)
+    assert sharding.shard_for_id(child_id) is None
+    save_practice(1, child_id, "bee", True, None)
+    assert _count(DB_PATH, "SELECT COUNT(*) FROM practices") == 1
+    assert [c['id'] for c in get_user_children(user_id)] == [child_id]
+
+def test_shard_count_limit(monkeypatch):
+    """Test that more shards than can be attached are rejected"""
+    monkeypatch.setattr(sharding, 'SHARD_COUNT', sharding.MAX_SHARDS + 1)
+    with pytest.raises(ValueError):
+        init_db()
@@ -0,0 +1,85 @@
+"""
+Phase 18: Tests for the offline schedule simulator
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+np = pytest.importorskip("numpy")
+
+from scheduler import FixedIntervalScheduler, SM2Scheduler
+from simulator import synthetic_state, recorded_state, simulate
+
+def test_first_day_everything_due():
+    """Test that new children see every word on day 0"""
+    state = synthetic_state(num_children=50, words_per_child=10)
+    
+    result = simulate(state, days=1, participation=1.0, scheduler=FixedIntervalScheduler())
+    
+    day0 = result['days'][0]
+    assert day0['due_words'] == 500
+    assert day0['sessions'] == 50
+    assert day0['successes'] == 500
+    assert day0['attempts'] >= 500
+    assert day0['db_writes'] >= day0['attempts']
+
+def test_fixed_rule_brings_words_back_after_two_days():
+    """Test that words practiced on day 0 are due again on day 2"""
+    state = synthetic_state(num_children=20, words_per_child=5)
+    
+    result = simulate(state, days=3, participation=1.0, scheduler=FixedIntervalScheduler())
+    
+    assert [d['due_words'] for d in result['days']] == [100, 0, 100]
+
+def test_session_size_caps_queue():
+    """Test that session_size limits words per session"""
+    state = synthetic_state(num_children=30, words_per_child=12)
+    
+    result = simulate(state, days=1, participation=1.0, session_size=5)
+    
+    assert result['days'][0]['queue_max'] == 5
+    assert result['days'][0]['successes'] == 150
+
+def test_session_engine_matches_vectorized_shape():
+    """Test that the WordSession engine reports the same due and success counts"""
+    vectorized = simulate(synthetic_state(20, 8), days=4, participation=1.0, seed=3)
+    sessions = simulate(synthetic_state(20, 8), days=4, participation=1.0, seed=3, engine='session')
+    
+    assert [d['due_words'] for d in sessions['days']] == [d['due_words'] for d in vectorized['days']]
+    assert [d['successes'] for d in sessions['days']] == [d['successes'] for d in vectorized['days']]
+
+def test_new_children_join_over_time():
+    """Test user-base growth adds due words on later days"""
+    state = synthetic_state(num_children=10, words_per_child=4, new_children_per_day=5, days=3)
+    
+    result = simulate(state, days=3, participation=1.0, scheduler=SM2Scheduler())
+    
+    assert [d['children'] for d in result['days']] == [10, 15, 20]
+    assert result['days'][1]['due_words'] == 20 + 40  # SM-2 brings day-0 words back after 1 day
+
+def test_recorded_state_from_db():
+    """Test starting the simulation from a real database"""
+    import database
+    db_path = "../data/test_simulator.db"
+    database.DB_PATH = db_path
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    database.init_db()
+    try:
+        user_id = database.create_user("parent@test.com", "password")
+        child_id = database.create_child(user_id, "Child", 7)
+        word_id = database.get_words_for_child(child_id)[0]['id']
+        database.update_word_on_success_for_child(word_id, child_id)
+        
+        state = recorded_state(db_path)
+        
+        assert len(state.child_of) == 3
+        assert sorted(state.next_review.tolist()) == [0, 0, 2]
+    finally:
+        os.remove(db_path)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
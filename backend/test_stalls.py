@@ -0,0 +1,88 @@
+"""
+Phase 33: Tests for the event loop stall detector
+"""
+
+import pytest
+import sys
+import os
+import time
+import asyncio
+from contextlib import asynccontextmanager
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import stalls
+from stalls import StallDetector, StallMiddleware
+
+def blocking_work(seconds):
+    time.sleep(seconds)
+
+def test_stall_in_background_task_is_reported():
+    """Test that a blocking call is attributed to its task and call site"""
+    async def nightly_job():
+        blocking_work(0.2)
+
+    async def main():
+        detector = StallDetector(threshold_ms=50)
+        detector.start()
+        await asyncio.sleep(0.02)
+        await asyncio.create_task(nightly_job())
+        await asyncio.sleep(0.05)
+        detector.stop()
+        return detector.report()
+
+    report = asyncio.run(main())
+    assert len(report) == 1
+    endpoint = report[0]
+    assert endpoint['endpoint'].endswith('nightly_job')
+    assert endpoint['stalls'] == 1
+    assert endpoint['max_ms'] >= 150
+    site = endpoint['sites'][0]
+    assert site['site'].startswith('test_stalls.py:') and site['site'].endswith('blocking_work')
+    assert any('nightly_job' in line for line in site['stack'])
+
+def test_short_pauses_are_ignored():
+    """Test that pauses under the threshold aren't recorded"""
+    async def main():
+        detector = StallDetector(threshold_ms=200)
+        detector.start()
+        for _ in range(3):
+            blocking_work(0.03)
+            await asyncio.sleep(0.02)
+        detector.stop()
+        return detector.report()
+
+    assert asyncio.run(main()) == []
+
+def test_stalls_grouped_by_route_template():
+    """Test attribution to the request's route template through the middleware"""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    @asynccontextmanager
+    async def lifespan(app):
+        stalls.start(threshold_ms=50)
+        yield
+        stalls.stop()
+
+    app = FastAPI(lifespan=lifespan)
+    app.add_middleware(StallMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def slow_item(item_id: int):
+        blocking_work(0.15)
+        return {"id": item_id}
+
+    with TestClient(app) as client:
+        for item_id in (1, 2):
+            assert client.get(f"/items/{item_id}").status_code == 200
+            time.sleep(0.05)
+        report = stalls.detector.report()
+
+    assert [e['endpoint'] for e in report] == ["GET /items/{item_id}"]
+    assert report[0]['stalls'] == 2
+    assert report[0]['sites'][0]['site'].endswith('blocking_work')
+    assert stalls._task_scopes == {}
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,37 @@
+"""
+Phase 28: Startup time budget
+Cold-starts the app in fresh interpreters (see benchmark_startup.py)
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from benchmark_startup import (
+    run_benchmark, IMPORT_BUDGET_SECONDS, LIFESPAN_BUDGET_SECONDS, FIRST_REQUEST_BUDGET_SECONDS
+)
+
+@pytest.fixture(scope="module")
+def report():
+    return run_benchmark(runs=2)
+
+def test_heavy_modules_are_deferred(report):
+    """Test that importing main doesn't load Pillow, jose, numpy or pyarrow"""
+    assert report['first_boot']['loaded_early'] == []
+
+def test_first_request_succeeds(report):
+    """Test that the app serves requests after its lifespan startup"""
+    assert report['first_boot']['status'] == 200
+    assert all(r['status'] == 200 for r in report['restarts'])
+
+def test_restart_within_budget(report):
+    """Test that a restart against an existing database stays within budget"""
+    median = report['median']
+    assert median['import_seconds'] < IMPORT_BUDGET_SECONDS
+    assert median['lifespan_seconds'] < LIFESPAN_BUDGET_SECONDS
+    assert median['first_request_seconds'] < FIRST_REQUEST_BUDGET_SECONDS
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,145 @@
+"""
+Phase 15: Tests for bulk word import
+"""
+
+import pytest
+import sys
+import os
+import io
+import json
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from database import init_db, add_word, create_user, get_db
+from word_import import import_words, detect_format, iter_json_list
+
+DB_PATH = "../data/test_word_import.db"
+
+@pytest.fixture(autouse=True)
+def setup_test_db():
+    """Setup test database before each test"""
+    import database
+    database.DB_PATH = DB_PATH
+    
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    
+    init_db()
+    
+    yield
+    
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+
+def word_count(user_id=None):
+    conn = get_db()
+    count = conn.execute("SELECT COUNT(*) FROM words WHERE user_id IS ?", (user_id,)).fetchone()[0]
+    conn.close()
+    return count
+
+def test_import_csv():
+    """Test importing a CSV word list"""
+    csv_text = "word,category\nAnt,Insects\nmoth,insects\nzebra,animals\n"
+    
+    report = import_words(io.StringIO(csv_text), 'csv')
+    
+    assert report['total_rows'] == 3
+    assert report['inserted'] == 3
+    assert report['errors'] == []
+    assert word_count() == 6  # 3 seed words + 3 imported
+
+def test_import_reports_row_errors():
+    """Test that invalid rows are reported and valid ones still imported"""
+    csv_text = "word,category\nant,insects\n,insects\nc4t,animals\ndog,\n"
+    
+    report = import_words(io.StringIO(csv_text), 'csv')
+    
+    assert report['inserted'] == 1
+    assert [e['row'] for e in report['errors']] == [2, 3, 4]
+
+def test_import_skips_existing_and_repeated_words():
+    """Test deduplication against the database and within the file"""
+    add_word("wasp", "insects")
+    csv_text = "word,category\nwasp,insects\nbee,insects\nowl,birds\nowl,birds\n"
+    
+    report = import_words(io.StringIO(csv_text), 'csv')
+    
+    assert report['inserted'] == 1
+    assert report['duplicates'] == 3
+    assert word_count() == 5
+
+def test_import_json_and_jsonl():
+    """Test both JSON list and JSON Lines inputs"""
+    json_text = json.dumps([{"word": "lion", "category": "animals"}])
+    jsonl_text = '{"word": "tiger", "category": "animals"}\nnot json\n'
+    
+    assert import_words(io.StringIO(json_text), 'json')['inserted'] == 1
+    report = import_words(io.StringIO(jsonl_text), 'jsonl')
+    
+    assert report['inserted'] == 1
+    assert report['errors'][0]['row'] == 2
+
+def test_import_reports_non_text_fields():
+    """Test that numbers or objects in JSON fields are row errors, not a failed import"""
+    json_text = json.dumps([
+        {"word": 123, "category": "animals"},
+        {"word": "lion", "category": ["animals"]},
+        {"word": "tiger", "category": "animals", "reference_image": 7},
+        {"word": "bear", "category": "animals", "reference_image": None},
+    ])
+    
+    report = import_words(io.StringIO(json_text), 'json')
+    
+    assert report['inserted'] == 1
+    assert [(e['row'], e['error']) for e in report['errors']] == [
+        (1, "word must be text"), (2, "category must be text"), (3, "reference_image must be text")
+    ]
+
+def test_json_list_is_read_incrementally():
+    """Test element-by-element parsing across read boundaries"""
+    rows = [{"word": f"w{'a' * i}", "category": "Test", "n": i * 1000} for i in range(20)]
+    
+    class CountingStream(io.StringIO):
+        reads = 0
+        def read(self, size=-1):
+            CountingStream.reads += 1
+            assert size > 0
+            return super().read(size)
+    
+    text = " \n" + json.dumps(rows, indent=2)
+    assert list(iter_json_list(CountingStream(text), read_size=7)) == rows
+    assert CountingStream.reads > len(text) // 7
+    assert list(iter_json_list(io.StringIO('{"words": [{"word": "ox"}]}'))) == [{"word": "ox"}]
+    assert list(iter_json_list(io.StringIO('[]'))) == []
+    for bad in ('[{"word": "ox"}', '[{"word": "ox"} {"word": "yak"}]', '[{"word": }]'):
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_json_list(io.StringIO(bad), read_size=4))
+
+def test_import_keeps_category_case():
+    """Test that imported categories are stored as given, like add_word"""
+    import_words(io.StringIO("word,category\nowl,Night Birds\n"), 'csv')
+    add_word("bat", "Night Birds")
+    
+    conn = get_db()
+    categories = {r[0] for r in conn.execute("SELECT category FROM words WHERE word IN ('owl', 'bat')")}
+    conn.close()
+    assert categories == {"Night Birds"}
+
+def test_import_family_words_with_small_chunks():
+    """Test chunked import of custom words for one family"""
+    user_id = create_user("teacher@test.com", "password")
+    rows = "\n".join(f"word{chr(97 + i // 26)}{chr(97 + i % 26)},list" for i in range(120))
+    
+    report = import_words(io.StringIO("word,category\n" + rows), 'csv', user_id=user_id, chunk_size=50)
+    
+    assert report['inserted'] == 120
+    assert word_count(user_id) == 120
+
+def test_detect_format():
+    """Test format detection from filename"""
+    assert detect_format("list.csv") == 'csv'
+    assert detect_format("list.JSON") == 'json'
+    assert detect_format("list.ndjson") == 'jsonl'
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,179 @@
+"""
+Phase 27: Tests for multi-worker support (file locks, shared session state)
+"""
+
+import pytest
+import sys
+import os
+import subprocess
+import textwrap
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import database
+import workers
+from migrate import latest_version
+from database import init_db, create_user, create_child, get_session_state, delete_child
+from session import begin_session, advance_session, record_session_results, load_session
+
+DB_PATH = "../data/test_workers.db"
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+@pytest.fixture(autouse=True)
+def setup_test_db():
+    """Setup test database before each test"""
+    database.DB_PATH = DB_PATH
+    _cleanup()
+    init_db()
+    yield
+    _cleanup()
+
+def _cleanup():
+    for path in (DB_PATH, f"{DB_PATH}-wal", f"{DB_PATH}-shm", workers.lock_path('migrate'), workers.lock_path('jobs')):
+        if os.path.exists(path):
+            os.remove(path)
+
+@pytest.fixture
+def child_id():
+    return create_child(create_user("workers@example.com", "password"), "Ada")
+
+def _run_worker(code: str):
+    """Run code in a fresh interpreter with the test database (like another worker)"""
+    script = f"import database\ndatabase.DB_PATH = {os.path.abspath(DB_PATH)!r}\n" + textwrap.dedent(code)
+    return subprocess.run([sys.executable, "-c", script], cwd=BACKEND_DIR,
+                          capture_output=True, text=True, timeout=60)
+
+def test_session_survives_across_processes(child_id):
+    """Test that a session started here is continued by another process"""
+    session, first_word = begin_session(child_id)
+    assert first_word is not None
+    total = session.initial_word_count
+
+    result = _run_worker(f"""
+        from session import advance_session, record_session_results
+        session, word_id = advance_session({child_id})
+        record_session_results({child_id}, [(word_id, True)])
+        print(word_id)
+    """)
+    assert result.returncode == 0, result.stderr
+    mastered_word = int(result.stdout.strip())
+
+    session = load_session(child_id)
+    assert session.mastered_words == {mastered_word}
+    assert session.get_session_stats()['queue_size'] == total - 1
+
+def test_sessions_are_per_child(child_id):
+    """Test that one child's session doesn't advance another's"""
+    other_child = create_child(create_user("other@example.com", "password"), "Ben")
+    begin_session(child_id)
+
+    session, word_id = advance_session(other_child)
+    assert session is None and word_id is None
+
+    record_session_results(other_child, [(1, True)])
+    assert get_session_state(other_child) is None
+    assert load_session(child_id).mastered_words == set()
+
+def test_incorrect_answer_keeps_word_queued(child_id):
+    """Test that results are saved: wrong answers stay, right answers leave"""
+    session, word_id = begin_session(child_id)
+    record_session_results(child_id, [(word_id, False)])
+    assert word_id in load_session(child_id).available_words
+
+    record_session_results(child_id, [(word_id, True)])
+    assert word_id not in load_session(child_id).available_words
+
+def test_deleting_child_drops_session(child_id):
+    """Test that a deleted child's session state is removed"""
+    begin_session(child_id)
+    delete_child(child_id)
+    assert get_session_state(child_id) is None
+
+def test_only_one_process_claims_background_jobs():
+    """Test that the jobs lock is exclusive while held, and reusable after exit"""
+    assert workers.claim_background_jobs()
+    try:
+        result = _run_worker("""
+            import workers
+            print(workers.claim_background_jobs())
+        """)
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "False"
+    finally:
+        os.close(workers._jobs_lock_fd)
+        workers._jobs_lock_fd = None
+
+    result = _run_worker("""
+        import workers
+        print(workers.claim_background_jobs())
+    """)
+    assert result.stdout.strip() == "True"
+
+def test_concurrent_writers_with_open_reader(child_id):
+    """Test that worker processes write at once while a reader holds a snapshot (WAL)"""
+    conn = database.get_db()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == int(database.BUSY_TIMEOUT_SECONDS * 1000)
+    user_id = conn.execute("SELECT user_id FROM children WHERE id = ?", (child_id,)).fetchone()[0]
+
+    # A long read, like an export; in rollback-journal mode it would block every commit
+    conn.execute("BEGIN")
+    before = conn.execute("SELECT COUNT(*) FROM practices").fetchone()[0]
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-c", textwrap.dedent(f"""
+                import database
+                database.DB_PATH = {os.path.abspath(DB_PATH)!r}
+                for i in range(25):
+                    database.save_practice(1, {child_id}, "bee", True, None)
+                    database.save_practice_batch({user_id}, [{{
+                        'idempotency_key': f'{{worker}}-{{i}}', 'word_id': 2, 'child_id': {child_id},
+                        'spelled_word': 'spidr', 'is_correct': False, 'drawing_filename': None
+                    }}])
+            """).replace("{worker}", str(worker))],
+            cwd=BACKEND_DIR, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+        )
+        for worker in range(4)
+    ]
+    try:
+        for proc in procs:
+            _, stderr = proc.communicate(timeout=60)
+            assert proc.returncode == 0, stderr
+        # The reader still sees its snapshot
+        assert conn.execute("SELECT COUNT(*) FROM practices").fetchone()[0] == before
+    finally:
+        conn.rollback()
+        conn.close()
+
+    conn = database.get_db()
+    practices = conn.execute("SELECT COUNT(*) FROM practices").fetchone()[0]
+    submissions = conn.execute("SELECT COUNT(*) FROM practice_submissions").fetchone()[0]
+    conn.close()
+    assert practices == before + 4 * 50
+    assert submissions == 4 * 25
+
+def test_concurrent_prepare_database():
+    """Test that workers starting together all initialize without errors"""
+    os.remove(DB_PATH)
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-c", textwrap.dedent(f"""
+                import database
+                database.DB_PATH = {os.path.abspath(DB_PATH)!r}
+                import workers
+                workers.prepare_database()
+            """)],
+            cwd=BACKEND_DIR, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+        )
+        for _ in range(4)
+    ]
+    for proc in procs:
+        _, stderr = proc.communicate(timeout=60)
+        assert proc.returncode == 0, stderr
+
+    conn = database.get_db()
+    words = conn.execute("SELECT COUNT(*) FROM words").fetchone()[0]
+    migrations = conn.execute("SELECT COUNT(*) FROM schema_migrations").fetchone()[0]
+    conn.close()
+    assert words == 3
+    assert migrations == latest_version()
@@ -0,0 +1,292 @@
+"""
+Phase 15: Bulk word import
+Streams CSV / JSON word lists, validates each row, skips words that already
+exist and inserts the rest with executemany in chunked transactions.
+
+CSV files need a header row with 'word' and 'category' columns
+('reference_image' is optional). JSON files are either a list of objects
+or JSON Lines (one object per line) with the same keys. A JSON list is
+parsed one element at a time; the {"words": [...]} form is read whole,
+so use a list or JSON Lines for large curricula.
+
+Usage:
+    python word_import.py words.csv
+    python word_import.py words.jsonl --user-id 3 --default-category animals
+"""
+
+import csv
+import io
+import json
+import os
+import re
+from datetime import date
+
+from database import get_db, init_db, invalidate_due_queues, bump_table_versions, sync_core_words
+import queries
+
+# Rows per transaction; keeps each write lock short on large curricula
+IMPORT_CHUNK_SIZE = 500
+# Characters read at a time from a JSON list
+JSON_READ_SIZE = 64 * 1024
+MAX_WORD_LENGTH = 50
+
+# Letters plus the apostrophes/hyphens found in real spelling lists
+WORD_PATTERN = re.compile(r"^[a-z]+(?:['\-][a-z]+)*$")
+
+
+def detect_format(filename: str) -> str:
+    """Guess import format from a filename extension ('csv', 'json' or 'jsonl')"""
+    ext = os.path.splitext(filename or '')[1].lower()
+    if ext in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    if ext == '.json':
+        return 'json'
+    return 'csv'
+
+
+def iter_json_list(text_stream, read_size: int = JSON_READ_SIZE):
+    """
+    Yield the elements of a top-level JSON list, reading read_size characters at a time
+    A top-level object is read whole and its 'words' list yielded
+    Raises json.JSONDecodeError on malformed input
+    """
+    decoder = json.JSONDecoder()
+    buffer = text_stream.read(read_size)
+    pos = 0
+    exhausted = not buffer
+
+    def skip_whitespace():
+        nonlocal pos
+        while pos < len(buffer) and buffer[pos].isspace():
+            pos += 1
+
+    skip_whitespace()
+    if buffer[pos:pos + 1] != '[':
+        data = json.loads(buffer + text_stream.read())
+        yield from (data.get('words', []) if isinstance(data, dict) else data)
+        return
+    pos += 1
+    expect_comma = False
+
+    while True:
+        skip_whitespace()
+        if pos < len(buffer):
+            char = buffer[pos]
+            if char == ']':
+                return
+            if expect_comma:
+                if char != ',':
+                    raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+                pos += 1
+                expect_comma = False
+                continue
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                value, end = None, None
+            # A value that reaches the end of the buffer may continue in the next read
+            if end is not None and (end < len(buffer) or exhausted):
+                yield value
+                pos, expect_comma = end, True
+                continue
+            if exhausted:
+                raise json.JSONDecodeError("Invalid JSON list element", buffer, pos)
+        elif exhausted:
+            raise json.JSONDecodeError("Unterminated JSON list", buffer, pos)
+
+        # Drop what was consumed and read more
+        more = text_stream.read(read_size)
+        exhausted = not more
+        buffer, pos = buffer[pos:] + more, 0
+
+
+def iter_rows(text_stream, fmt: str):
+    """
+    Yield (row_number, dict) from a text stream without loading it all
+    row_number is 1-based and counts data rows (CSV header excluded)
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(text_stream)
+        for i, row in enumerate(reader, start=1):
+            yield i, row
+    elif fmt == 'jsonl':
+        row_number = 0
+        for line in text_stream:
+            line = line.strip()
+            if not line:
+                continue
+            row_number += 1
+            try:
+                yield row_number, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield row_number, {'_error': f"Invalid JSON: {e.msg}"}
+    elif fmt == 'json':
+        for i, row in enumerate(iter_json_list(text_stream), start=1):
+            yield i, row
+    else:
+        raise ValueError(f"Unsupported import format '{fmt}'")
+
+
+def _text(row, field: str) -> str:
+    """A row's field as stripped text ('' if missing); raises ValueError if it isn't a string"""
+    value = row.get(field)
+    if value is None:
+        return ''
+    if not isinstance(value, str):
+        raise ValueError(f"{field} must be text")
+    return value.strip()
+
+
+def validate_row(row, default_category: str = None):
+    """
+    Validate and normalize one input row
+    Returns (word, category, reference_image); raises ValueError with a reason
+    """
+    if not isinstance(row, dict):
+        raise ValueError("Row must be an object")
+    if '_error' in row:
+        raise ValueError(row['_error'])
+
+    word = _text(row, 'word').lower()
+    # Category case is kept, as add_word does
+    category = _text(row, 'category') or (default_category or '').strip()
+    reference_image = _text(row, 'reference_image') or None
+
+    if not word:
+        raise ValueError("Missing word")
+    if len(word) > MAX_WORD_LENGTH:
+        raise ValueError(f"Word longer than {MAX_WORD_LENGTH} characters")
+    if not WORD_PATTERN.match(word):
+        raise ValueError("Word may only contain letters, apostrophes and hyphens")
+    if not category:
+        raise ValueError("Missing category")
+
+    return word, category, reference_image
+
+
+def _insert_chunk(chunk, user_id, report):
+    """Insert one chunk of validated rows in a single transaction"""
+    conn = get_db(user_id=user_id)
+    cursor = conn.cursor()
+    today = date.today().isoformat()
+
+    try:
+        # UNIQUE(word, user_id) doesn't catch duplicates when user_id IS NULL,
+        # so check the scope explicitly
+        words = [w for _, w, _, _ in chunk]
+        queries.execute(cursor, 'words.existing_in_scope', (user_id, json.dumps(words)))
+        existing = {r[0] for r in cursor.fetchall()}
+
+        to_insert = []
+        for row_number, word, category, reference_image in chunk:
+            if word in existing:
+                report['duplicates'] += 1
+                report['errors'].append({'row': row_number, 'word': word, 'error': 'Word already exists'})
+                continue
+            to_insert.append((word, category, today, reference_image, user_id))
+
+        queries.executemany(cursor, 'words.import', to_insert)
+        bump_table_versions(cursor, 'words')
+        conn.commit()
+        report['inserted'] += cursor.rowcount
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def import_words(text_stream, fmt: str = 'csv', user_id: int = None,
+                 default_category: str = None, chunk_size: int = IMPORT_CHUNK_SIZE):
+    """
+    Import a word list from a text stream
+
+    Args:
+        text_stream: file-like object yielding text
+        fmt: 'csv', 'json' or 'jsonl'
+        user_id: family owning the words (None = core/global words)
+        default_category: category for rows that don't provide one
+        chunk_size: rows inserted per transaction
+
+    Returns:
+        dict: {
+            'total_rows': rows read,
+            'inserted': new words added,
+            'duplicates': rows skipped because the word already exists,
+            'errors': [{'row', 'word', 'error'}] for every rejected row
+        }
+    """
+    report = {'total_rows': 0, 'inserted': 0, 'duplicates': 0, 'errors': []}
+    seen = set()
+    chunk = []
+
+    for row_number, row in iter_rows(text_stream, fmt):
+        report['total_rows'] += 1
+        try:
+            word, category, reference_image = validate_row(row, default_category)
+        except ValueError as e:
+            raw_word = row.get('word') if isinstance(row, dict) else None
+            report['errors'].append({'row': row_number, 'word': raw_word, 'error': str(e)})
+            continue
+
+        # Duplicates inside the file itself
+        if word in seen:
+            report['duplicates'] += 1
+            report['errors'].append({'row': row_number, 'word': word, 'error': 'Duplicate word in file'})
+            continue
+        seen.add(word)
+
+        chunk.append((row_number, word, category, reference_image))
+        if len(chunk) >= chunk_size:
+            _insert_chunk(chunk, user_id, report)
+            chunk = []
+
+    if chunk:
+        _insert_chunk(chunk, user_id, report)
+
+    # New words are due today - have affected children rebuild their queues
+    if report['inserted']:
+        # Phase 26: core words are copied into every shard
+        if user_id is None:
+            sync_core_words()
+        invalidate_due_queues(user_id)
+
+    report['errors'].sort(key=lambda e: e['row'])
+    return report
+
+
+def import_words_from_file(path: str, fmt: str = None, **kwargs):
+    """Import a word list from a file path (format guessed from extension)"""
+    fmt = fmt or detect_format(path)
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        return import_words(f, fmt, **kwargs)
+
+
+def open_binary_as_text(binary_stream):
+    """Wrap an uploaded binary file so it can be streamed as UTF-8 text"""
+    return io.TextIOWrapper(binary_stream, encoding='utf-8-sig', newline='')
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Bulk import words from CSV / JSON")
+    parser.add_argument("path", help="CSV, JSON or JSON Lines file")
+    parser.add_argument("--format", choices=['csv', 'json', 'jsonl'], help="Override format detection")
+    parser.add_argument("--user-id", type=int, default=None, help="Import as family custom words")
+    parser.add_argument("--default-category", default=None, help="Category for rows without one")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    init_db()
+    result = import_words_from_file(
+        args.path, args.format,
+        user_id=args.user_id,
+        default_category=args.default_category,
+        chunk_size=args.chunk_size
+    )
+
+    print(f"Read {result['total_rows']} rows: {result['inserted']} inserted, "
+          f"{result['duplicates']} duplicates, {len(result['errors'])} not imported")
+    for err in result['errors']:
+        print(f"  row {err['row']}: {err['word']!r} - {err['error']}")
@@ -0,0 +1,80 @@
+"""
+Phase 27: Multi-worker deployment
+Lets several gunicorn/uvicorn worker processes share one data directory.
+
+- prepare_database() runs init_db() (and so the migrations) under an exclusive
+  file lock, so workers starting together apply them once, one after
+  another, instead of racing on CREATE TABLE / schema_migrations
+- claim_background_jobs() is true in exactly one worker (it holds a
+  non-blocking lock for its lifetime), so the nightly due-queue build and
+  the analytics refresh don't run once per worker
+
+Locks are fcntl.flock locks on files next to the database; they are
+released by the OS when the holding process exits, even if it crashes.
+Without fcntl (Windows) locking is skipped - run a single worker there.
+
+Practice sessions are stored per child in the database (see session.py),
+so no request depends on which worker served the previous one.
+"""
+
+import contextlib
+import os
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+import database
+
+# Lock file held by the worker that runs background jobs (None = not us)
+_jobs_lock_fd = None
+
+
+def lock_path(name: str) -> str:
+    """Lock file for name, next to the database"""
+    return f"{database.DB_PATH}.{name}.lock"
+
+
+@contextlib.contextmanager
+def file_lock(path: str):
+    """Hold an exclusive lock on path (blocks until it is free)"""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        # Closing the descriptor releases the lock
+        os.close(fd)
+
+
+def prepare_database():
+    """Create tables and apply pending migrations, one process at a time"""
+    with file_lock(lock_path('migrate')):
+        database.init_db()
+
+
+def claim_background_jobs() -> bool:
+    """
+    True if this process should run the background jobs
+    The first worker to ask keeps the lock until it exits; a replacement
+    worker started after that can claim it again.
+    """
+    global _jobs_lock_fd
+    if _jobs_lock_fd is not None or fcntl is None:
+        return True
+
+    fd = os.open(lock_path('jobs'), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return False
+    _jobs_lock_fd = fd
+    return True
+
+
+def worker_count() -> int:
+    """Configured worker processes: WEB_CONCURRENCY, default one per CPU core"""
+    return max(1, int(os.getenv('WEB_CONCURRENCY') or os.cpu_count() or 1))
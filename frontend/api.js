@@ -292,13 +292,13 @@ class API {
         }
     }
 
-    static async submitPractice(wordId, spelledWord, drawingBlob, isCorrect) {
+    // Phase 37: the server grades spelled_word; the response carries is_correct and errors
+    static async submitPractice(wordId, spelledWord, drawingBlob) {
         try {
             const formData = new FormData();
             formData.append('word_id', wordId);
             formData.append('spelled_word', spelledWord);
             formData.append('drawing', drawingBlob, 'drawing.png');
-            formData.append('is_correct', isCorrect.toString());
             
             // Add child_id from localStorage
             const childId = localStorage.getItem('selectedChildId');
@@ -324,4 +324,51 @@ class API {
             return { success: false };
         }
     }
+
+    // ===== BATCH PRACTICE (Phase 14) =====
+
+    /**
+     * Submit queued practices in one request.
+     * Each record: { idempotencyKey, wordId, childId, spelledWord, drawingBlob } (graded on the server)
+     * Reuse the same idempotencyKey when retrying - already-saved records come back as 'duplicate'.
+     */
+    static async submitPracticeBatch(records) {
+        try {
+            const formData = new FormData();
+            const payload = records.map(r => {
+                const drawingName = r.drawingBlob ? `${r.idempotencyKey}.png` : null;
+                if (r.drawingBlob) {
+                    formData.append('drawings', r.drawingBlob, drawingName);
+                }
+                return {
+                    idempotency_key: r.idempotencyKey,
+                    word_id: r.wordId,
+                    child_id: r.childId,
+                    spelled_word: r.spelledWord,
+                    drawing: drawingName
+                };
+            });
+            formData.append('records', JSON.stringify(payload));
+
+            const response = await fetch(`${API_BASE}/practice/batch`, {
+                method: 'POST',
+                headers: getAuthHeaders(),
+                body: formData
+            });
+
+            if (response.status === 401) {
+                handleUnauthorized();
+                return { success: false };
+            }
+
+            if (!response.ok) {
+                const data = await response.json();
+                throw new Error(data.detail || 'Failed to submit practice batch');
+            }
+            return await response.json();
+        } catch (e) {
+            console.error('Error submitting practice batch:', e);
+            return { success: false };
+        }
+    }
 }
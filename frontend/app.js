@@ -403,59 +403,56 @@ class SpellingApp {
 
         this.isSubmitting = true;
         const spelledWord = this.spelledLetters.join('').toLowerCase();
-        const isCorrect = spelledWord === this.currentWord.toLowerCase();
         this.attemptCount++;
 
         // Haptic feedback
         this.hapticFeedback();
 
-        // Show immediate feedback with animation
-        if (isCorrect) {
-            this.playSound('correct');
-            this.showFeedback(true, 'Correct! Well done! 🎉');
-        } else {
-            this.playSound('incorrect');
-            if (this.attemptCount >= 2 && this.attemptCount < 3) {
-                // Transitioning to Recall Mode
-                this.showFeedback(false, `Not quite. Try again! (Will be Recall Mode next attempt)`);
-            } else if (this.attemptCount >= 3) {
-                this.showFeedback(false, `The word is: ${this.currentWord}`);
-            } else {
-                this.showFeedback(false, 'Not quite right. Try again!');
-            }
-        }
-
         // Get drawing as blob
         const drawingBlob = await canvas.getImageData();
 
-        // Submit to backend
+        // Submit to backend - the server grades the answer (Phase 37)
         const result = await API.submitPractice(
             this.currentWordId,
             spelledWord,
-            drawingBlob,
-            isCorrect
+            drawingBlob
         );
 
-        if (result.success) {
-            // If correct, load next word after delay
-            if (isCorrect) {
-                setTimeout(() => this.loadNextWord(), 2000);
-            } else {
-                // If incorrect, prepare for next attempt
-                setTimeout(() => {
-                    this.isSubmitting = false;
-                    this.spelledLetters = [];
-                    this.updateSpelledDisplay();
-                    this.renderLetters();
-                    this.updateModeIndicator();
-                    this.clearFeedback();
-                    canvas.clear();
-                }, 2000);
-            }
-        } else {
+        if (!result.success) {
             this.isSubmitting = false;
             this.showFeedback(false, 'Error saving. Please try again.');
+            return;
         }
+
+        // Show feedback with animation
+        if (result.is_correct) {
+            this.playSound('correct');
+            this.showFeedback(true, 'Correct! Well done! 🎉');
+            // Load next word after delay
+            setTimeout(() => this.loadNextWord(), 2000);
+            return;
+        }
+
+        this.playSound('incorrect');
+        if (this.attemptCount >= 2 && this.attemptCount < 3) {
+            // Transitioning to Recall Mode
+            this.showFeedback(false, `Not quite. Try again! (Will be Recall Mode next attempt)`);
+        } else if (this.attemptCount >= 3) {
+            this.showFeedback(false, `The word is: ${this.currentWord}`);
+        } else {
+            this.showFeedback(false, 'Not quite right. Try again!');
+        }
+
+        // Prepare for next attempt
+        setTimeout(() => {
+            this.isSubmitting = false;
+            this.spelledLetters = [];
+            this.updateSpelledDisplay();
+            this.renderLetters();
+            this.updateModeIndicator();
+            this.clearFeedback();
+            canvas.clear();
+        }, 2000);
     }
 }
 